@@ -5,11 +5,12 @@ This module provides a command-line tool for merging French charging station dat
 It utilizes the ChargingStationMergeTools class to process the specified configuration file.
 
 Usage:
-    python script_name.py -c config_file
+    python script_name.py -c config_file [--verify]
 
 Arguments:
     -c, --config_file: The path to the configuration file that contains the necessary settings
                         for merging charging station data sources. This argument is required.
+    --verify: Hash the input files even when their size, modification time and inode did not change.
 
 Example:
     python script_name.py -c /path/to/config.json
@@ -45,8 +46,9 @@ from src.chargingstationmergetool import ChargingStationMergeTools
 if __name__ == '__main__':
     parser = ArgumentParser(prog="", description="A tool for merged French charging stations datasources")
     parser.add_argument('-c', '--config_file', required=True)
+    parser.add_argument('--verify', action='store_true', help="hash the input files even when their size, modification time and inode did not change")
 
     args = parser.parse_args()
 
-    chargingStationMergeTools = ChargingStationMergeTools(args.config_file)
+    chargingStationMergeTools = ChargingStationMergeTools(args.config_file, args.verify)
     chargingStationMergeTools.process()
@@ -0,0 +1,300 @@
+"""
+Module: Cache
+
+This module provides the StageCache class, a content-addressed cache of the outputs of the
+processing stages (parsed sources, combined datasource, merged charging stations and sockets).
+
+Each input file is hashed once with BLAKE2b. The digests are recorded with the size,
+modification time and inode of the file, so an unchanged input only costs a stat() call on
+the next executions. Stage outputs are stored under a key derived from the digests of their inputs
+and from the configuration fingerprint, and are reused while these do not change.
+
+Only the most recently used outputs of each stage are kept, and only the records of the most
+recently used input files, so the cache does not grow with every new input file.
+
+Imports:
+    - hashlib
+    - json
+    - os
+    - re
+    - shutil
+    - threading
+    - geopandas as gpd
+    - chargingstationmergedtool.utils
+
+License:
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+
+import geopandas as gpd
+
+from src.utils import (
+    PATH_CACHE_DIRECTORY,
+    create_file_record,
+    is_file_record_up_to_date,
+)
+
+# Bump to invalidate the stage outputs cached by previous versions
+CACHE_VERSION = "3"
+# Number of outputs kept by stage, the older ones are removed when a new one is stored
+DEFAULT_RETENTION = 2
+# Number of file records kept, the least recently used ones are dropped
+MAX_RECORDS = 100
+
+
+class StageCache:
+    """
+    A content-addressed cache of the stage outputs.
+
+    Attributes:
+        _cache_directory (str): The directory where the file records and the stage outputs are stored.
+        _config_fingerprint (str): The fingerprint of the configuration settings the stages depend on.
+        _verify (bool): Whether to hash the input files even when their records are up to date.
+        _retention (int): The number of outputs kept by stage.
+        _records (dict): The file records (size, modification time, inode and digest), by absolute file path,
+            from the least to the most recently used.
+    """
+
+    _records_file_name: str = "records.json"
+
+    def __init__(self, cache_directory: str = PATH_CACHE_DIRECTORY, config_fingerprint: str = "", verify: bool = False, retention: int = DEFAULT_RETENTION):
+        """
+        Initializes the StageCache and loads the file records, without the records of the removed files.
+
+        Parameters:
+            cache_directory (str): The directory where the file records and the stage outputs are stored.
+            config_fingerprint (str): The fingerprint of the configuration settings the stages depend on.
+            verify (bool): Whether to hash the input files even when their records are up to date.
+            retention (int): The number of outputs kept by stage.
+        """
+        self._cache_directory = cache_directory
+        self._config_fingerprint = config_fingerprint
+        self._verify = verify
+        self._retention = retention
+        self._lock = threading.Lock()
+        os.makedirs(self._cache_directory, exist_ok=True)
+
+        self._records = {}
+        if os.path.exists(self._path_records_file()):
+            with open(self._path_records_file(), 'r') as f:
+                self._records = {path_file: record for path_file, record in json.load(f).items() if os.path.exists(path_file)}
+
+    def record(self, path_file: str) -> dict:
+        """
+        Returns the record of a file, hashing it only if its size, modification time or inode
+        changed since it was last hashed, or if the verification is forced.
+
+        The record becomes the most recently used one, the least recently used records beyond
+        MAX_RECORDS are dropped.
+
+        Parameters:
+            path_file (str): The path to the file.
+
+        Returns:
+            dict: The record of the file, with its size, modification time, inode and digest.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+        """
+        if not os.path.exists(path_file):
+            raise FileNotFoundError(path_file)
+
+        path_file = os.path.abspath(path_file)
+        record = self._records.get(path_file)
+
+        if self._verify or not is_file_record_up_to_date(record, path_file):
+            record = create_file_record(path_file)
+
+        # The sources can be processed in parallel threads
+        with self._lock:
+            if self._records.get(path_file) is not record or next(reversed(self._records)) != path_file:
+                self._records.pop(path_file, None)
+                self._records[path_file] = record
+                for path_record in list(self._records)[:-MAX_RECORDS]:
+                    del self._records[path_record]
+                self._write_records_file()
+
+        return record
+
+    def digest(self, path_file: str) -> str:
+        """
+        Returns the digest of a file, see record.
+
+        Parameters:
+            path_file (str): The path to the file.
+
+        Returns:
+            str: The hexadecimal digest of the file.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+        """
+        return self.record(path_file)["digest"]
+
+    def key(self, stage: str, *digests: str) -> str:
+        """
+        Computes the cache key of a stage output.
+
+        Parameters:
+            stage (str): The name of the stage.
+            digests (str): The digests of the inputs of the stage.
+
+        Returns:
+            str: The cache key of the stage output.
+        """
+        blake2b = hashlib.blake2b(digest_size=32)
+        blake2b.update("|".join([CACHE_VERSION, stage, self._config_fingerprint, *digests]).encode())
+
+        return blake2b.hexdigest()
+
+    def path(self, stage: str, key: str) -> str:
+        """
+        Returns the path under which a stage output is stored.
+
+        Parameters:
+            stage (str): The name of the stage.
+            key (str): The cache key of the stage output.
+
+        Returns:
+            str: The path of the stage output.
+        """
+        return f"{self._cache_directory}{stage}_{key}"
+
+    def load(self, stage: str, key: str) -> gpd.GeoDataFrame:
+        """
+        Loads a GeoDataFrame stage output, and marks it as recently used.
+
+        Parameters:
+            stage (str): The name of the stage.
+            key (str): The cache key of the stage output.
+
+        Returns:
+            gpd.GeoDataFrame: The cached stage output, or None if it is not in the cache.
+        """
+        path_file = f"{self.path(stage, key)}.parquet"
+
+        if not os.path.exists(path_file):
+            return None
+
+        os.utime(path_file)
+        return gpd.read_parquet(path_file)
+
+    def store(self, stage: str, key: str, data: gpd.GeoDataFrame):
+        """
+        Stores a GeoDataFrame stage output.
+
+        The output is written to a temporary file first, then renamed, so an interrupted
+        execution never leaves a partial output in the cache. The older outputs of the stage
+        are then pruned.
+
+        Parameters:
+            stage (str): The name of the stage.
+            key (str): The cache key of the stage output.
+            data (gpd.GeoDataFrame): The stage output.
+        """
+        path_file = f"{self.path(stage, key)}.parquet"
+
+        data.to_parquet(f"{path_file}.tmp")
+        os.replace(f"{path_file}.tmp", path_file)
+        self.prune(stage)
+
+    def load_directory(self, stage: str, key: str) -> str:
+        """
+        Returns the directory of a stage output made of several files, and marks it as recently used.
+
+        Parameters:
+            stage (str): The name of the stage.
+            key (str): The cache key of the stage output.
+
+        Returns:
+            str: The directory of the cached stage output, or None if it is not in the cache.
+        """
+        path_directory = f"{self.path(stage, key)}{os.sep}"
+
+        if not os.path.isdir(path_directory):
+            return None
+
+        os.utime(path_directory)
+        return path_directory
+
+    def store_directory(self, stage: str, key: str, writer):
+        """
+        Stores a stage output made of several files.
+
+        The writer fills a temporary directory, which is then renamed. The older outputs of the
+        stage are then pruned.
+
+        Parameters:
+            stage (str): The name of the stage.
+            key (str): The cache key of the stage output.
+            writer (callable): A function writing the stage output files into the directory it receives.
+        """
+        path_directory = self.path(stage, key)
+        path_tmp_directory = f"{path_directory}.tmp"
+
+        shutil.rmtree(path_tmp_directory, ignore_errors=True)
+        os.makedirs(path_tmp_directory)
+        writer(f"{path_tmp_directory}{os.sep}")
+        shutil.rmtree(path_directory, ignore_errors=True)
+        os.replace(path_tmp_directory, path_directory)
+        self.prune(stage)
+
+    def prune(self, stage: str):
+        """
+        Removes the outputs of a stage beyond the retention, from the least recently used one.
+
+        The outputs are ordered by modification time, which is updated when an output is loaded.
+        Only the names made of the stage and a hexadecimal key are considered, so the outputs of
+        a stage whose name starts with the name of another one, or the temporary files, are kept.
+
+        Parameters:
+            stage (str): The name of the stage.
+        """
+        pattern = re.compile(rf"{re.escape(stage)}_[0-9a-f]{{64,}}(\.parquet)?")
+        paths = [
+            f"{self._cache_directory}{name}"
+            for name in os.listdir(self._cache_directory)
+            if pattern.fullmatch(name)
+        ]
+        paths.sort(key=os.path.getmtime, reverse=True)
+
+        for path in paths[self._retention:]:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def _path_records_file(self) -> str:
+        """
+        Returns the path of the file holding the file records.
+
+        Returns:
+            str: The path of the records index.
+        """
+        return f"{self._cache_directory}{self._records_file_name}"
+
+    def _write_records_file(self):
+        """
+        Writes the file records, through a temporary file.
+        """
+        with open(f"{self._path_records_file()}.tmp", 'w') as f:
+            json.dump(self._records, f, indent=2)
+        os.replace(f"{self._path_records_file()}.tmp", self._path_records_file())
@@ -30,10 +30,15 @@ License:
     along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
 import geopandas as gpd
 
+from src.cache import StageCache
 from src.config import Config
 from src.exporter import (
     MongoExporter,
@@ -42,11 +47,11 @@ from src.exporter import (
     SqlFileExporter,
 )
 from src.parser import DataGouvParser, OsmParser
-from src.transform import Transform
+from src.transform import Transform, rename_legacy_columns
 from src.utils import (
-    compare_hash,
     extract_path_last_execution,
-    write_hash_file,
+    read_file_record,
+    write_file_record,
     write_path_last_execution,
 )
 
@@ -62,27 +67,37 @@ class ChargingStationMergeTools:
     osm_parser_geo_data_frame: gpd.GeoDataFrame
     data_gouv_parser_geo_data_frame: gpd.GeoDataFrame
 
-    def __init__(self, path_config_file: str):
+    def __init__(self, path_config_file: str, verify: bool = False):
         """
         Initializes the ChargingStationMergeTools with the given configuration file.
 
         Args:
             path_config_file (str): The path to the configuration file.
+            verify (bool): Whether to hash the input files even when their size, modification time and inode did not change.
         """
         self._config = Config(path_config_file)
         self._osm_file_no_change = False
         self._data_gouv_file_no_change = False
         os.makedirs(self._config.export_directory_name, exist_ok=True)
+        self._cache = StageCache(config_fingerprint=self._config.fingerprint(), verify=verify)
+        self._digests = {}
+        self._timings = {}
 
     def process(self):
         """
         Main processing method that orchestrates the downloading, parsing, transforming, and exporting of data.
+
+        When the parallel mode is enabled, the two sources are processed concurrently and joined before the transformation.
         """
         self.path_last_execution = extract_path_last_execution()
-        self.process_osm()
-        self.process_data_gouv()
+        if self._config.parallel:
+            self._process_sources_in_parallel()
+        else:
+            self.process_osm()
+            self.process_data_gouv()
         if not (self._osm_file_no_change and self._data_gouv_file_no_change):
             self.process_transform()
+            self._export_timings()
             write_path_last_execution(self._config.export_directory_name)
         else:
             print("Files not changed")
@@ -91,26 +106,41 @@ class ChargingStationMergeTools:
     def process_osm(self):
         """
         Processes the OSM data by downloading, filtering, parsing, and exporting it to a GeoDataFrame.
+
+        The charging station nodes are filtered in process by quackosm and cached by input file digest.
+        Osmosis is only used as a pre-filter when enabled in the configuration and the cache is missing.
         """
         osm_parser = OsmParser()
         if self._config.osm_config["need_to_download"]:
-            print("[ ] - Download OSM file")
-            osm_parser.download_datasource(self._config)
-            print("[x] - Download OSM file")
-
-        # Filter initial pbf
-        print("[ ] - Filter with osmosis")
-        osm_parser.filtering_with_osmosis(self._config.osm_config["path_file"], f"{self._config.export_directory_name}filtered_charging_stations.osm.pbf")
-        self._config.osm_config["path_file"] = f"{self._config.export_directory_name}filtered_charging_stations.osm.pbf"
-        print("[x] - Filter with osmosis")
-
-        if self.path_last_execution is None or not compare_hash(f"{self.path_last_execution}osm.hash", self._config.osm_config["path_file"]):
-            print("[ ] - Parse OSM file")
-            osm_parser.load_pbf(self._config.osm_config["path_file"])
-            print("[x] - Parse OSM file")
-            osm_parser.export_to_geoparquet(f"{self._config.export_directory_name}osm.parquet")
-            self.osm_parser_geo_data_frame = osm_parser.convert_to_geoDataFrame()
-            write_hash_file(f"{self._config.export_directory_name}osm.hash", self._config.osm_config["path_file"])
+            with self._stage("Download OSM file"):
+                osm_parser.download_datasource(self._config)
+
+        # Each input file is hashed once, the digest is reused for the comparison and the cache keys
+        path_input_file = self._config.osm_config["path_file"]
+        osm_record = self._cache.record(path_input_file)
+        osm_digest = osm_record["digest"]
+        self._digests["osm"] = osm_digest
+        path_pbf = path_input_file
+        path_cache_file = f"{self._cache.path('osm_nodes', osm_digest)}.parquet"
+
+        if self._config.osm_config["use_osmosis"] and not os.path.exists(path_cache_file):
+            with self._stage("Filter with osmosis"):
+                path_pbf = f"{self._config.export_directory_name}filtered_charging_stations.osm.pbf"
+                osm_parser.filtering_with_osmosis(path_input_file, path_pbf)
+
+        if self.path_last_execution is None or not self._has_same_digest(f"{self.path_last_execution}osm.record", osm_digest):
+            key = self._cache.key("osm", osm_digest)
+            self.osm_parser_geo_data_frame = self._cache.load("osm", key)
+            if self.osm_parser_geo_data_frame is None:
+                with self._stage("Parse OSM file"):
+                    osm_parser.load_pbf(path_pbf, path_cache_file)
+                    self._cache.prune("osm_nodes")
+                self.osm_parser_geo_data_frame = osm_parser.convert_to_geoDataFrame()
+                self._cache.store("osm", key, self.osm_parser_geo_data_frame)
+            else:
+                print("OSM file already parsed")
+            self.osm_parser_geo_data_frame.to_parquet(f"{self._config.export_directory_name}osm.parquet")
+            write_file_record(f"{self._config.export_directory_name}osm.record", osm_record)
         else:
             print("OSM file no change since last process")
             self._osm_file_no_change = True
@@ -124,21 +154,30 @@ class ChargingStationMergeTools:
         data_gouv_parser = DataGouvParser()
 
         if self._config.data_gouv_config["need_to_download"]:
-            print("[ ] - Download Data gouv file")
-            data_gouv_parser.download_datasource(self._config)
-            print("[x] - Download Data gouv file")
-
-        if self.path_last_execution is None or not compare_hash(f"{self.path_last_execution}data_gouv.hash", self._config.osm_config["path_file"]):
-            print("[ ] - Parse Data gouv file")
-            data_gouv_parser.parse_file(self._config.data_gouv_config["path_file"])
-            print("[x] - Parse Data gouv file")
-            data_gouv_parser.export_to_geoparquet(f"{self._config.export_directory_name}data_gouv.parquet")
-            self.data_gouv_geo_data_frame = data_gouv_parser.convert_to_geoDataFrame()
-            write_hash_file(f"{self._config.export_directory_name}data_gouv.hash", self._config.osm_config["path_file"])
+            with self._stage("Download Data gouv file"):
+                data_gouv_parser.download_datasource(self._config)
+
+        path_input_file = self._config.data_gouv_config["path_file"]
+        data_gouv_record = self._cache.record(path_input_file)
+        data_gouv_digest = data_gouv_record["digest"]
+        self._digests["data_gouv"] = data_gouv_digest
+
+        if self.path_last_execution is None or not self._has_same_digest(f"{self.path_last_execution}data_gouv.record", data_gouv_digest):
+            key = self._cache.key("data_gouv", data_gouv_digest)
+            self.data_gouv_geo_data_frame = self._cache.load("data_gouv", key)
+            if self.data_gouv_geo_data_frame is None:
+                with self._stage("Parse Data gouv file"):
+                    data_gouv_parser.parse_file(path_input_file, self._config.data_gouv_config["chunk_size"])
+                self.data_gouv_geo_data_frame = data_gouv_parser.convert_to_geoDataFrame()
+                self._cache.store("data_gouv", key, self.data_gouv_geo_data_frame)
+            else:
+                print("Data gouv file already parsed")
+            self.data_gouv_geo_data_frame.to_parquet(f"{self._config.export_directory_name}data_gouv.parquet")
+            write_file_record(f"{self._config.export_directory_name}data_gouv.record", data_gouv_record)
         else:
             print("Data gouv file no change since last process")
             self._data_gouv_file_no_change = True
-            self.osm_parser_geo_data_frame = data_gouv_parser.import_from_geoparquet(f"{self.path_last_execution}data_gouv.parquet")
+            self.data_gouv_geo_data_frame = data_gouv_parser.import_from_geoparquet(f"{self.path_last_execution}data_gouv.parquet")
 
 
     def process_transform(self):
@@ -147,27 +186,80 @@ class ChargingStationMergeTools:
 
         This method merges the two GeoDataFrames (osm_parser_geo_data_frame and data_gouv_geo_data_frame),
         groups neighboring charging stations, and transforms the data for further processing.
+        The combined datasource and the transformed data are cached by input digests and configuration,
+        so these stages are skipped when they were already computed.
+        In incremental mode, only the charging stations changed since the last execution are regrouped.
         The transformed data is then exported using the process_export method.
 
         Raises:
             Exception: If there is an error during the transformation process.
         """
         transformer = Transform()
-        print("[ ] - Merge datasources")
-        combined_datasource = transformer.merge_datasources(self.osm_parser_geo_data_frame, self.data_gouv_geo_data_frame)
+        digests = (self._digests["osm"], self._digests["data_gouv"])
+
+        combined_key = self._cache.key("combined", *digests)
+        combined_datasource = self._cache.load("combined", combined_key)
+        if combined_datasource is None:
+            with self._stage("Merge datasources"):
+                combined_datasource = transformer.merge_datasources(self.osm_parser_geo_data_frame, self.data_gouv_geo_data_frame)
+                self._cache.store("combined", combined_key, combined_datasource)
         combined_datasource.to_parquet(f"{self._config.export_directory_name}combined.parquet")
-        print("[x] - Merge datasources")
 
-        print("[ ] - Group neighbors")
-        merge_dict = transformer.group_neighbouring(combined_datasource, self._config.distance)
-        print("[x] - Group neighbors")
+        merged_key = self._cache.key("merged", *digests)
+        path_merged_directory = self._cache.load_directory("merged", merged_key)
+        path_previous_groups = None
+        if self.path_last_execution is not None:
+            path_previous_groups = f"{self.path_last_execution}groups_{self._config.fingerprint()}.parquet"
+
+        if self._config.incremental and path_previous_groups is not None and os.path.exists(path_previous_groups):
+            previous_transformer = Transform()
+            previous_transformer.import_from_parquet_files(self.path_last_execution)
+            previous_transformer.import_groups(path_previous_groups)
+
+            with self._stage("Transform data incrementally"):
+                regrouped = transformer.transform_data_incrementally(combined_datasource, previous_transformer, self._config.distance, self._config.workers, self._config.grouping_mode)
+            print(f"{regrouped} rows regrouped out of {len(combined_datasource)}")
+        elif path_merged_directory is None:
+            with self._stage("Group neighbors"):
+                merge_dict = transformer.group_neighbouring(combined_datasource, self._config.distance, self._config.workers, self._config.grouping_mode)
+
+            with self._stage("Transform data"):
+                transformer.transform_data(combined_datasource, merge_dict)
+
+            def write_merged(path_directory: str):
+                transformer.export_to_parquet_files(path_directory)
+                transformer.export_deduplication_report(path_directory)
+                transformer.export_groups(f"{path_directory}groups.parquet")
+
+            self._cache.store_directory("merged", merged_key, write_merged)
+        else:
+            print("Data already transformed")
+            transformer.import_from_parquet_files(path_merged_directory)
+            transformer.import_groups(f"{path_merged_directory}groups.parquet")
 
-        print("[ ] - Transform data")
-        transformer.transform_data(combined_datasource, merge_dict)
-        print("[x] - Transform data")
+        deduplication_report = transformer.get_deduplication_report()
+        print(f"{deduplication_report['duplicates']} duplicated sockets removed out of {deduplication_report['sockets']} ({deduplication_report['duplicates_without_power_rated']} without power rated)")
+        transformer.export_deduplication_report(self._config.export_directory_name)
+        # Kept for the incremental transformation of the next execution
+        transformer.export_groups(f"{self._config.export_directory_name}groups_{self._config.fingerprint()}.parquet")
 
         self.process_export(transformer)
 
+    def _has_same_digest(self, path_record_file: str, digest: str) -> bool:
+        """
+        Checks whether a file record of a previous execution has the given digest.
+
+        Args:
+            path_record_file (str): The path to the record file of the previous execution.
+            digest (str): The digest of the input file.
+
+        Returns:
+            bool: True if the record exists and has the same digest, False otherwise.
+        """
+        record = read_file_record(path_record_file)
+
+        return record is not None and record["digest"] == digest
+
     def process_export(self, transformer: Transform):
         """
         Exports the transformed data to the specified format.
@@ -181,23 +273,79 @@ class ChargingStationMergeTools:
         Raises:
             NotImplementedError: If the specified export type is not implemented.
         """
-        print("[ ] - Export files to parquet")
-        transformer.export_to_parquet_files(self._config.export_directory_name)
-        print("[x] - Export files to parquet")
+        with self._stage("Export files to parquet"):
+            transformer.export_to_parquet_files(self._config.export_directory_name,
+                                                self._config.output_config["parquet_compression"],
+                                                self._config.output_config["parquet_row_group_size"])
 
         match self._config.type_export:
             case "sql":
-                exporter = SqlExporter(self._config.sql_config, transformer.get_charging_stations(), transformer.get_sockets())
+                previous_charging_stations, previous_sockets = self._import_previous_export()
+                exporter = SqlExporter(self._config.sql_config, transformer.get_charging_stations(), transformer.get_sockets(), previous_charging_stations, previous_sockets)
             case "sql_files":
-                exporter = SqlFileExporter(transformer.get_charging_stations(), transformer.get_sockets(), self._config.export_directory_name)
+                exporter = SqlFileExporter(transformer.get_charging_stations(), transformer.get_sockets(), self._config.export_directory_name, output_config=self._config.output_config)
             case "mongo":
                 exporter = MongoExporter(self._config.mongo_config, transformer.get_charging_stations(), transformer.get_sockets())
             case "mongo_files":
-                exporter = MongoFileExporter(transformer.get_charging_stations(), transformer.get_sockets(), self._config.export_directory_name)
+                exporter = MongoFileExporter(transformer.get_charging_stations(), transformer.get_sockets(), self._config.export_directory_name, self._config.mongo_files_config, self._config.output_config)
             case "parquet" | "":
                 # already done
-                pass
+                return
             case _:
                 raise NotImplementedError(f"{self._config.type_export} is not implemented, allowed value : sql, sql_files, mongo, mongo_files")
-            
-        exporter.export()
\ No newline at end of file
+
+        with self._stage(f"Export to {self._config.type_export}"):
+            exporter.export()
+
+    def _import_previous_export(self) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+        """
+        Imports the charging stations and sockets exported by the last execution, to export the changes only.
+
+        Returns:
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: The previous charging stations and sockets, or None if they are not needed or not found.
+        """
+        if self._config.sql_config.get("mode") != "delta" or self.path_last_execution is None:
+            return None, None
+
+        path_charging_stations = f"{self.path_last_execution}charging_stations.parquet"
+        path_sockets = f"{self.path_last_execution}sockets.parquet"
+        if not os.path.exists(path_charging_stations) or not os.path.exists(path_sockets):
+            return None, None
+
+        return gpd.read_parquet(path_charging_stations), rename_legacy_columns(gpd.read_parquet(path_sockets))
+
+    @contextmanager
+    def _stage(self, name: str):
+        """
+        Prints the start and the end of a processing stage and records its duration.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        print(f"[ ] - {name}")
+        start = time.perf_counter()
+        yield
+        self._timings[name] = time.perf_counter() - start
+        print(f"[x] - {name} ({self._timings[name]:.2f} s)")
+
+    def _process_sources_in_parallel(self):
+        """
+        Processes the OSM and Data Gouv sources in two threads, and waits for both of them.
+
+        The sources share no data until the transformation, so their download, filtering and
+        parsing overlap. The first error raised by one of the sources is raised again here.
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="source") as executor:
+            futures = [executor.submit(self.process_osm), executor.submit(self.process_data_gouv)]
+            for future in as_completed(futures):
+                future.result()
+
+    def _export_timings(self):
+        """
+        Prints the duration of each stage and exports them to a JSON file in the export directory.
+        """
+        for name, duration in self._timings.items():
+            print(f"{name}: {duration:.2f} s")
+
+        with open(f"{self._config.export_directory_name}timings.json", "w") as f:
+            json.dump(self._timings, f, indent=4)
\ No newline at end of file
@@ -5,10 +5,14 @@ This module provides the Config class, which is responsible for loading and pars
 configuration settings from a JSON file.
 
 Imports:
+    - hashlib
     - json
     - os
     - datetime
     - chargingstationmergedtool.exception.ConfigParsingException
+    - chargingstationmergedtool.grouping
+    - chargingstationmergedtool.exporter.mongofileexporter
+    - chargingstationmergedtool.output
 
 License:
     This program is free software: you can redistribute it and/or modify
@@ -25,11 +29,15 @@ License:
     along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import hashlib
 import json
 import os
 from datetime import datetime
 
 from src.exception import ConfigParsingException
+from src.exporter.mongofileexporter import LAYOUTS, NDJSON_LAYOUT
+from src.grouping import GREEDY_MODE, GROUPING_MODES
+from src.output import COMPRESSIONS, DEFAULT_PARQUET_COMPRESSION, PARQUET_COMPRESSIONS
 
 
 class Config:
@@ -39,21 +47,34 @@ class Config:
     Attributes:
         distance (int): The distance setting from the configuration.
         type_export (str): The type of export setting from the configuration.
+        parallel (bool): Whether the OSM and Data Gouv sources are processed concurrently.
+        workers (int): The number of worker processes used to group the neighbouring charging points.
+        grouping_mode (str): The grouping mode of the neighbouring charging points, greedy or connected_components.
+        incremental (bool): Whether only the charging stations changed since the last execution are regrouped.
         osm_config (dict): Configuration settings related to OSM.
         data_gouv_config (dict): Configuration settings related to data from the government.
         sql_config (dict): Configuration settings for SQL database.
         mongo_config (dict): Configuration settings for MongoDB.
+        mongo_files_config (dict): Settings of the mongo_files export, optional in the configuration file.
+        output_config (dict): Compression and sharding settings of the output files, optional in the configuration file.
         export_directory_name (str): The directory name for export results, timestamped.
     """
 
     distance: int
     type_export: str
+    parallel: bool
+    workers: int
+    grouping_mode: str
+    incremental: bool
     osm_config: dict
     data_gouv_config: dict
     sql_config: dict
     mongo_config: dict
+    mongo_files_config: dict
+    output_config: dict
 
     _key_path_file: str = "path_file"
+    _default_chunk_size: int = 50000
 
     def __init__(self, path_config_file: str):
         """
@@ -71,6 +92,20 @@ class Config:
         self._parse_config_file(path_config_file)
         self.export_directory_name = f"results{os.sep}{datetime.now().strftime('%d_%m_%Y_%H_%M_%S')}{os.sep}"
 
+    def fingerprint(self) -> str:
+        """
+        Computes the fingerprint of the settings the processing results depend on.
+
+        Returns:
+            str: The hexadecimal fingerprint of the settings.
+        """
+        settings = {
+            "distance": self.distance,
+            "grouping_mode": self.grouping_mode
+        }
+
+        return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode(), digest_size=16).hexdigest()
+
     def _parse_config_file(self, path_config_file: str):
         """
         Parses the configuration file and extracts relevant settings.
@@ -83,9 +118,13 @@ class Config:
 
             self._parse_common_block(config_data)
             self.osm_config = self._extract_default_block(config_data, "osm")
+            self.osm_config["use_osmosis"] = self._extract_optional_key_in_block(config_data["osm"], "use_osmosis", False)
             self.data_gouv_config = self._extract_default_block(config_data, "data_gouv")
+            self.data_gouv_config["chunk_size"] = self._extract_optional_key_in_block(config_data["data_gouv"], "chunk_size", self._default_chunk_size)
             self.sql_config = self._extract_block(config_data, "sql")
             self.mongo_config = self._extract_block(config_data, "mongo")
+            self._parse_mongo_files_block(config_data)
+            self._parse_output_block(config_data)
 
     def _parse_common_block(self, config_data: dict):
         """
@@ -98,6 +137,56 @@ class Config:
         common_block = self._extract_block(config_data, block_name)
         self.distance = self._extract_key_in_block(common_block, "distance", block_name)
         self.type_export = self._extract_key_in_block(common_block, "type_export", block_name)
+        self.parallel = self._extract_optional_key_in_block(common_block, "parallel", True)
+        self.workers = self._extract_optional_key_in_block(common_block, "workers", 1)
+        self.grouping_mode = self._extract_optional_key_in_block(common_block, "grouping_mode", GREEDY_MODE)
+        if self.grouping_mode not in GROUPING_MODES:
+            raise ConfigParsingException(f"grouping_mode must be one of {', '.join(GROUPING_MODES)}")
+        self.incremental = self._extract_optional_key_in_block(common_block, "incremental", False)
+
+    def _parse_mongo_files_block(self, config_data: dict):
+        """
+        Parses the optional mongo_files block of the configuration data.
+
+        Parameters:
+            config_data (dict): The entire configuration data loaded from the JSON file.
+
+        Raises:
+            ConfigParsingException: If the layout is not supported.
+        """
+        block = self._extract_optional_key_in_block(config_data, "mongo_files", {})
+        self.mongo_files_config = {
+            "layout": self._extract_optional_key_in_block(block, "layout", NDJSON_LAYOUT)
+        }
+
+        if self.mongo_files_config["layout"] not in LAYOUTS:
+            raise ConfigParsingException(f"layout must be one of {', '.join(LAYOUTS)}")
+
+    def _parse_output_block(self, config_data: dict):
+        """
+        Parses the optional output block of the configuration data.
+
+        The maximum file size is given in megabytes in the configuration file, and stored in characters.
+
+        Parameters:
+            config_data (dict): The entire configuration data loaded from the JSON file.
+
+        Raises:
+            ConfigParsingException: If a compression is not supported.
+        """
+        block = self._extract_optional_key_in_block(config_data, "output", {})
+        max_file_size_mb = self._extract_optional_key_in_block(block, "max_file_size_mb", None)
+        self.output_config = {
+            "compression": self._extract_optional_key_in_block(block, "compression", None),
+            "max_file_size": None if max_file_size_mb is None else int(max_file_size_mb * 1024 * 1024),
+            "parquet_compression": self._extract_optional_key_in_block(block, "parquet_compression", DEFAULT_PARQUET_COMPRESSION),
+            "parquet_row_group_size": self._extract_optional_key_in_block(block, "parquet_row_group_size", None)
+        }
+
+        if self.output_config["compression"] not in [None, *COMPRESSIONS]:
+            raise ConfigParsingException(f"compression must be one of {', '.join(COMPRESSIONS)}")
+        if self.output_config["parquet_compression"] not in PARQUET_COMPRESSIONS:
+            raise ConfigParsingException(f"parquet_compression must be one of {', '.join(PARQUET_COMPRESSIONS)}")
 
     def _extract_default_block(self, config_data: dict, block_name: str) -> dict:
         """
@@ -147,6 +236,20 @@ class Config:
         
         return block[key]
 
+    def _extract_optional_key_in_block(self, block: dict, key: str, default: object) -> object:
+        """
+        Extracts an optional key from a given block of configuration data.
+
+        Parameters:
+            block (dict): The block of configuration data.
+            key (str): The key to extract from the block.
+            default (object): The value returned when the key is not in the block.
+
+        Returns:
+            (object) The value associated with the specified key, or the default value.
+        """
+        return block.get(key, default)
+
     def _extract_block(self, config_data: dict, block_name: str) -> dict:
         """
         Extracts a specific block from the configuration data.
@@ -36,13 +36,36 @@ License:
     along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+from collections.abc import Iterator
+
+import numpy as np
 import pandas as pd
+import shapely
+
+# Fields of the socket documents, in order
+SOCKET_FIELDS = [
+    "id",
+    "latitude",
+    "longitude",
+    "power_rated",
+    "number_of_sockets",
+    "socket_type_ef",
+    "socket_type_2",
+    "socket_type_combo_ccs",
+    "socket_type_chademo",
+    "socket_type_autre",
+    "id_itinerance",
+    "retrieve_from"
+]
 
 
 class AbstractNoSqlExporter:
     """
     A class to handle the transformation of charging station and socket data for NoSQL export.
 
+    The sockets are sorted by charging station once, so the sockets of a charging station are a slice
+    of the socket documents, found by binary search.
+
     Attributes:
         __charging_stations (pd.DataFrame): DataFrame containing charging station data.
         __sockets (pd.DataFrame): DataFrame containing socket data.
@@ -58,6 +81,8 @@ class AbstractNoSqlExporter:
         """
         self._charging_stations = charging_stations
         self._sockets = sockets
+        self._socket_documents = None
+        self._socket_charging_station_ids = None
 
     def transform_data_to_dict(self) -> list[dict]:
         """
@@ -68,18 +93,31 @@ class AbstractNoSqlExporter:
         Returns:
             list[dict]: A list of dictionaries representing the charging stations and their sockets.
         """
-        results = list()
+        return list(self.iter_documents())
 
-        for _, row in self._charging_stations.iterrows():
-            charging_station_id = row['id']
-            results.append({
-                "id": charging_station_id,
-                "latitude": row['geometry'].y,
-                "longitude": row['geometry'].x,
-                "sockets": self.extract_sockets(charging_station_id)
-            })
+    def iter_documents(self) -> Iterator[dict]:
+        """
+        Generates the charging station dictionaries one by one, so they do not all have to be kept in memory.
 
-        return results
+        Yields:
+            dict: A dictionary representing a charging station and its sockets.
+        """
+        self._index_sockets()
+
+        charging_station_ids = self._charging_stations['id'].to_numpy()
+        geometry = np.asarray(self._charging_stations['geometry'].array)
+        starts = np.searchsorted(self._socket_charging_station_ids, charging_station_ids, side='left')
+        ends = np.searchsorted(self._socket_charging_station_ids, charging_station_ids, side='right')
+
+        for charging_station_id, latitude, longitude, start, end in zip(
+                charging_station_ids.tolist(), shapely.get_y(geometry).tolist(), shapely.get_x(geometry).tolist(),
+                starts.tolist(), ends.tolist()):
+            yield {
+                "id": charging_station_id,
+                "latitude": latitude,
+                "longitude": longitude,
+                "sockets": self._socket_documents[start:end]
+            }
     
     def extract_sockets(self, charging_station_id: int) -> list[dict]:
         """
@@ -94,22 +132,32 @@ class AbstractNoSqlExporter:
         Returns:
             list[dict]: A list of dictionaries representing the sockets associated with the charging station.
         """
-        results = list()
-
-        for _, row in self._sockets[self._sockets['charging_station_id'] == charging_station_id].iterrows():
-            results.append({
-                "id": row['id'],
-                "latitude": row['geometry'].y,
-                "longitude": row['geometry'].x,
-                "power_rated": row['power_rated'],
-                "number_of_sockets": row['number_of_sockets'],
-                "socket_type_ef": row['socket_type_ef'],
-                "socket_type_2": row['socket_type_2'],
-                "socket_type_combo_ccs": row['socket_type_combo_ccs'],
-                "socket_type_chademo": row['socket_type_chademo'],
-                "socket_type_autre": row['socket_type_autre'],
-                "id_itinerance": row['id_itinerance'],
-                "retrieve_from": row['retrieve_from']
-            })
-
-        return results
+        self._index_sockets()
+
+        start = np.searchsorted(self._socket_charging_station_ids, charging_station_id, side='left')
+        end = np.searchsorted(self._socket_charging_station_ids, charging_station_id, side='right')
+
+        return self._socket_documents[start:end]
+
+    def _index_sockets(self):
+        """
+        Builds the socket documents from the columns, sorted by charging station, if not already built.
+
+        The sort is stable, so the sockets of a charging station keep their order. Missing values,
+        NaN or pd.NA, are written as None.
+        """
+        if self._socket_documents is not None:
+            return
+
+        order = np.argsort(self._sockets['charging_station_id'].to_numpy(), kind='stable')
+        sockets = self._sockets.iloc[order]
+        geometry = np.asarray(sockets['geometry'].array)
+
+        documents = sockets.drop(columns=['geometry', 'charging_station_id']).assign(
+            latitude=shapely.get_y(geometry),
+            longitude=shapely.get_x(geometry)
+        )
+
+        documents = documents[SOCKET_FIELDS].astype(object)
+        self._socket_documents = documents.where(documents.notna(), None).to_dict('records')
+        self._socket_charging_station_ids = sockets['charging_station_id'].to_numpy()
@@ -15,10 +15,13 @@ Example:
     config = {
         'connection_url': 'mongodb://localhost:27017',
         'database_name': 'charging_stations_db',
-        'charging_stations_collection_name': 'stations'
+        'charging_stations_collection_name': 'stations',
+        'batch_size': 1000,
+        'workers': 4,
+        'max_retries': 3
     }
     exporter = MongoExporter(config, charging_stations_df, sockets_df)
-    exporter.export()
+    summary = exporter.export()
 
 License:
     This program is free software: you can redistribute it and/or modify
@@ -35,24 +38,48 @@ License:
     along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import itertools
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import pandas as pd
-from pymongo import MongoClient
+from pymongo import ASCENDING, MongoClient, ReplaceOne
+from pymongo.collection import Collection
+from pymongo.errors import (
+    AutoReconnect,
+    BulkWriteError,
+    NetworkTimeout,
+    PyMongoError,
+)
 
 from src.exporter.abstractnosqlexporter import (
     AbstractNoSqlExporter,
 )
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_RETRIES = 3
+# Delay before the first retry, doubled after each attempt
+RETRY_BACKOFF_SECONDS = 0.5
+# Field the documents are upserted on
+KEY_FIELD = "id"
+
 
 class MongoExporter(AbstractNoSqlExporter):
     """
     A class to handle the export of charging station and socket data to MongoDB.
 
+    The documents are generated lazily and written in batches of unordered bulk upserts keyed
+    on the charging station id, so exporting twice does not duplicate the charging stations.
+    The documents of the charging stations that are no longer exported are then deleted.
+
     Attributes:
         __config (dict): Configuration dictionary containing MongoDB connection details.
         __client (MongoClient): MongoDB client instance for connecting to the database.
     """
 
-    def __init__(self, config: dict, charging_stations: pd.DataFrame, sockets: pd.DataFrame):
+    def __init__(self, config: dict, charging_stations: pd.DataFrame, sockets: pd.DataFrame, client: MongoClient = None):
         """
         Initializes the MongoExporter with the given configuration and data.
 
@@ -60,22 +87,196 @@ class MongoExporter(AbstractNoSqlExporter):
             config (dict): Configuration dictionary containing MongoDB connection details.
             charging_stations (pd.DataFrame): DataFrame containing charging station data.
             sockets (pd.DataFrame): DataFrame containing socket data.
+            client (MongoClient): An existing client to use, a new one is created from the connection url if None.
         """
         super().__init__(charging_stations, sockets)
         self._config = config
-        self._client = MongoClient(config['connection_url'], timeoutMS=7200)
+        self._batch_size = config.get('batch_size', DEFAULT_BATCH_SIZE)
+        self._workers = config.get('workers', DEFAULT_WORKERS)
+        self._max_retries = config.get('max_retries', DEFAULT_MAX_RETRIES)
+        # The client holds a connection pool, shared by the parallel batches
+        self._client = client if client is not None else MongoClient(config['connection_url'], maxPoolSize=max(self._workers, 1) + 1)
 
-    def export(self):
+    def export(self) -> dict:
         """
         Exports the charging station and socket data to the specified MongoDB collection.
 
-        This method retrieves the database and collection specified in the configuration
-        and inserts the transformed data into the collection.
+        This method retrieves the database and collection specified in the configuration,
+        makes sure the charging station id is uniquely indexed, upserts the documents in batches,
+        then deletes the documents of the charging stations that were not exported, the ones removed
+        from the sources or whose id changed.
+
+        Returns:
+            dict: The number of inserted, updated, unchanged, failed and deleted documents.
 
         Raises:
-            Exception: If there is an error during the export process.
+            PyMongoError: If a batch still fails with a transient error after the last retry.
         """
         db = self._client.get_database(self._config['database_name'])
         collection = db.get_collection(self._config['charging_stations_collection_name'])
+        collection.create_index([(KEY_FIELD, ASCENDING)], unique=True)
+
+        summary = self.write_documents(collection, self.iter_documents())
+        summary["deleted"] = self.delete_stale_documents(collection)
+        print(f"MongoDB export: {summary['inserted']} inserted, {summary['updated']} updated, "
+              f"{summary['unchanged']} unchanged, {summary['failed']} failed, {summary['deleted']} deleted")
+
+        return summary
+
+    def write_documents(self, collection: Collection, documents: Iterable[dict]) -> dict:
+        """
+        Upserts documents into a collection, in batches.
+
+        With more than one worker, the batches are written concurrently, with at most twice as many
+        batches in memory as there are workers.
+
+        Args:
+            collection (Collection): The collection to write into.
+            documents (Iterable[dict]): The documents to write.
+
+        Returns:
+            dict: The number of inserted, updated, unchanged and failed documents.
+        """
+        summary = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        batches = iter_batches(documents, self._batch_size)
+
+        if self._workers <= 1:
+            for batch in batches:
+                add_to_summary(summary, self.write_batch(collection, batch))
+            return summary
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            pending = set()
+            for batch in batches:
+                if len(pending) >= 2 * self._workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        add_to_summary(summary, future.result())
+                pending.add(executor.submit(self.write_batch, collection, batch))
+
+            for future in pending:
+                add_to_summary(summary, future.result())
+
+        return summary
+
+    def delete_stale_documents(self, collection: Collection) -> int:
+        """
+        Deletes the documents whose id is not the id of an exported charging station, in batches.
+
+        Only the ids of the documents are read, and the stale ids are deleted with one
+        delete_many by batch of batch_size ids.
+
+        Args:
+            collection (Collection): The collection written by the export.
+
+        Returns:
+            int: The number of deleted documents.
+        """
+        exported = set(self._charging_stations['id'].tolist())
+        # Read before the first deletion, so the cursor does not run over the deleted documents
+        stale = [
+            document[KEY_FIELD]
+            for document in collection.find({KEY_FIELD: {"$exists": True}}, {KEY_FIELD: 1, "_id": 0})
+            if document[KEY_FIELD] not in exported
+        ]
+
+        deleted = 0
+        for batch in iter_batches(stale, self._batch_size):
+            deleted += collection.delete_many({KEY_FIELD: {"$in": batch}}).deleted_count
+
+        return deleted
+
+    def write_batch(self, collection: Collection, batch: list[dict]) -> dict:
+        """
+        Upserts a batch of documents with an unordered bulk write, retrying with an exponential backoff
+        on transient errors.
+
+        The documents rejected by the server are counted as failed; the others are still written,
+        since the bulk write is unordered.
 
-        collection.insert_many(self.transform_data_to_dict())
+        Args:
+            collection (Collection): The collection to write into.
+            batch (list[dict]): The documents to write.
+
+        Returns:
+            dict: The number of inserted, updated, unchanged and failed documents of the batch.
+
+        Raises:
+            PyMongoError: If the batch still fails with a transient error after the last retry.
+        """
+        requests = [ReplaceOne({KEY_FIELD: document[KEY_FIELD]}, document, upsert=True) for document in batch]
+
+        for attempt in itertools.count():
+            try:
+                result = collection.bulk_write(requests, ordered=False)
+                return batch_summary(result.upserted_count, result.matched_count, result.modified_count, 0)
+            except BulkWriteError as e:
+                details = e.details
+                return batch_summary(details.get('nUpserted', 0), details.get('nMatched', 0),
+                                     details.get('nModified', 0), len(details.get('writeErrors', [])))
+            except PyMongoError as e:
+                if attempt >= self._max_retries or not is_transient_error(e):
+                    raise
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+
+def iter_batches(documents: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    """
+    Splits documents into lists of at most batch_size documents.
+
+    Args:
+        documents (Iterable[dict]): The documents to split.
+        batch_size (int): The maximum number of documents of a batch.
+
+    Yields:
+        list[dict]: The batches of documents.
+    """
+    iterator = iter(documents)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def is_transient_error(error: PyMongoError) -> bool:
+    """
+    Tells whether a write error is worth retrying.
+
+    Args:
+        error (PyMongoError): The error raised by the write.
+
+    Returns:
+        bool: True for network errors and errors labelled as retryable by the server.
+    """
+    return isinstance(error, (AutoReconnect, NetworkTimeout)) or error.has_error_label("RetryableWriteError")
+
+
+def batch_summary(upserted: int, matched: int, modified: int, failed: int) -> dict:
+    """
+    Builds the summary of a bulk write.
+
+    Args:
+        upserted (int): The number of inserted documents.
+        matched (int): The number of documents already in the collection.
+        modified (int): The number of documents already in the collection that were changed.
+        failed (int): The number of documents rejected by the server.
+
+    Returns:
+        dict: The number of inserted, updated, unchanged and failed documents.
+    """
+    return {
+        "inserted": upserted,
+        "updated": modified,
+        "unchanged": matched - modified,
+        "failed": failed
+    }
+
+
+def add_to_summary(summary: dict, other: dict):
+    """
+    Adds the counts of a batch summary to a summary.
+
+    Args:
+        summary (dict): The summary to update.
+        other (dict): The batch summary to add.
+    """
+    for key, value in other.items():
+        summary[key] += value
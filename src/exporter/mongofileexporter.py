@@ -3,6 +3,8 @@ MongoFileExporter Module
 
 This module provides a class for exporting charging station and socket data to JSON files.
 It extends the AbstractNoSqlExporter class and implements the export functionality specific to file-based storage.
+By default, the charging stations are streamed as newline-delimited JSON into one or a few files,
+optionally compressed, which mongoimport can load directly.
 
 Classes:
     MongoFileExporter: A class to handle the export of charging station and socket data to JSON files.
@@ -15,6 +17,10 @@ Example:
     exporter = MongoFileExporter(charging_stations_df, sockets_df, '/path/to/export/directory')
     exporter.export()
 
+    # mongoimport --db=database --collection=stations --file=/path/to/export/directory/charging_stations.ndjson.gz --gzip
+    exporter = MongoFileExporter(charging_stations_df, sockets_df, '/path/to/export/directory', {'compression': 'gzip'})
+    exporter.export()
+
 License:
     This program is free software: you can redistribute it and/or modify
     it under the terms of the GNU Lesser General Public License as published by
@@ -37,6 +43,16 @@ import pandas as pd
 from src.exporter.abstractnosqlexporter import (
     AbstractNoSqlExporter,
 )
+from src.output import ShardedWriter
+
+NDJSON_LAYOUT = "ndjson"
+PER_FILE_LAYOUT = "per_file"
+LAYOUTS = [NDJSON_LAYOUT, PER_FILE_LAYOUT]
+
+NDJSON_FILE_NAME = "charging_stations"
+
+# Compact separators and no ASCII escaping, the C encoder is used
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
 
 
 class MongoFileExporter(AbstractNoSqlExporter):
@@ -45,9 +61,11 @@ class MongoFileExporter(AbstractNoSqlExporter):
 
     Attributes:
         __export_directory_path (str): The directory path where the JSON files will be saved.
+        __layout (str): ndjson to write one document by line, per_file to write one JSON file per charging station.
+        __output_config (dict): The compression and the maximum file size of the NDJSON files.
     """
 
-    def __init__(self, charging_stations: pd.DataFrame, sockets: pd.DataFrame, export_directory_path: str):
+    def __init__(self, charging_stations: pd.DataFrame, sockets: pd.DataFrame, export_directory_path: str, config: dict = None, output_config: dict = None):
         """
         Initializes the MongoFileExporter with the given data and export directory.
 
@@ -55,20 +73,54 @@ class MongoFileExporter(AbstractNoSqlExporter):
             charging_stations (pd.DataFrame): DataFrame containing charging station data.
             sockets (pd.DataFrame): DataFrame containing socket data.
             export_directory_path (str): The directory path where the JSON files will be saved.
+            config (dict): The mongo_files settings (layout), optional.
+            output_config (dict): The output settings (compression, max_file_size), optional.
         """
         super().__init__(charging_stations, sockets)
         self._export_directory_path = export_directory_path
+        self._layout = (config or {}).get('layout', NDJSON_LAYOUT)
+        self._output_config = output_config or {}
 
     def export(self):
         """
         Exports the charging station and socket data to JSON files.
 
-        This method creates a JSON file for each charging station in the specified export directory.
+        With the ndjson layout, the documents are streamed into charging_stations.ndjson, or into numbered
+        shards of at most max_file_size characters, with the extension of the compression. With the per_file layout,
+        this method creates a JSON file for each charging station in the specified export directory.
         The filename is based on the charging station ID.
 
         Raises:
+            NotImplementedError: If the layout or the compression is not implemented.
             Exception: If there is an error during the file writing process.
         """
-        for charging_station in self.transform_data_to_dict():
-            with open(f"{self._export_directory_path}{os.sep}charging_station_{charging_station['id']}.json", 'w') as f:
-                json.dump(charging_station, f, indent=2)
+        match self._layout:
+            case "ndjson":
+                self.export_ndjson()
+            case "per_file":
+                self.export_per_file()
+            case _:
+                raise NotImplementedError(f"{self._layout} layout is not implemented, allowed value : {', '.join(LAYOUTS)}")
+
+    def export_ndjson(self) -> list[str]:
+        """
+        Streams the charging station documents as newline-delimited JSON.
+
+        Returns:
+            list[str]: The paths of the written files.
+        """
+        with ShardedWriter(f"{self._export_directory_path}{os.sep}{NDJSON_FILE_NAME}", ".ndjson",
+                           self._output_config.get('compression'), self._output_config.get('max_file_size')) as writer:
+            for document in self.iter_documents():
+                writer.write(f"{_ENCODER.encode(document)}\n")
+
+        return writer.paths
+
+    def export_per_file(self):
+        """
+        Writes one indented JSON file for each charging station.
+        """
+        for charging_station in self.iter_documents():
+            with ShardedWriter(f"{self._export_directory_path}{os.sep}charging_station_{charging_station['id']}", ".json") as writer:
+                writer.write(json.dumps(charging_station, indent=2))
+
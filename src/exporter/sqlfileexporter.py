@@ -2,7 +2,8 @@
 SqlFileExporter Module
 
 This module provides a class for exporting charging station and socket data to SQL files.
-It uses Jinja2 templates to generate SQL scripts based on the provided DataFrames.
+It uses Jinja2 templates for the table definitions, then streams the rows into the SQL scripts
+as multi-row INSERT statements, one batch of rows at a time.
 
 Classes:
     SqlFileExporter: A class to handle the export of charging station and socket data to SQL files.
@@ -32,9 +33,36 @@ License:
 
 import os
 
+import numpy as np
 import pandas as pd
+import shapely
 from jinja2 import Environment, PackageLoader, select_autoescape
 
+from src.output import ShardedWriter
+
+DEFAULT_BATCH_SIZE = 1000
+SRID = 4326
+
+# Columns of the tables, by column of the DataFrames
+CHARGING_STATION_COLUMNS = {
+    "id": "id",
+    "geometry": "geom"
+}
+SOCKET_COLUMNS = {
+    "id": "id",
+    "geometry": "geom",
+    "power_rated": "power_rated",
+    "number_of_sockets": "number_of_sockets",
+    "socket_type_ef": "socket_type_ef",
+    "socket_type_2": "socket_type_2",
+    "socket_type_combo_ccs": "socket_type_combo_ccs",
+    "socket_type_chademo": "socket_type_chademo",
+    "socket_type_autre": "socket_type_autre",
+    "charging_station_id": "charging_station_id",
+    "id_itinerance": "id_itinerance",
+    "retrieve_from": "retrieve_from"
+}
+
 
 class SqlFileExporter:
     """
@@ -44,10 +72,12 @@ class SqlFileExporter:
         __export_directory_path (str): The directory path where the SQL files will be saved.
         __charging_stations (pd.DataFrame): DataFrame containing charging station data.
         __sockets (pd.DataFrame): DataFrame containing socket data.
+        __batch_size (int): The number of rows of each INSERT statement.
+        __output_config (dict): The compression and the maximum file size of the SQL files.
         __env (Environment): Jinja2 environment for rendering SQL templates.
     """
 
-    def __init__(self, charging_stations: pd.DataFrame, sockets: pd.DataFrame, export_directory_path: str):
+    def __init__(self, charging_stations: pd.DataFrame, sockets: pd.DataFrame, export_directory_path: str, batch_size: int = DEFAULT_BATCH_SIZE, output_config: dict = None):
         """
         Initializes the SqlFileExporter with the given data and export directory.
 
@@ -55,10 +85,14 @@ class SqlFileExporter:
             charging_stations (pd.DataFrame): DataFrame containing charging station data.
             sockets (pd.DataFrame): DataFrame containing socket data.
             export_directory_path (str): The directory path where the SQL files will be saved.
+            batch_size (int): The number of rows of each INSERT statement.
+            output_config (dict): The output settings (compression, max_file_size), optional.
         """
         self._export_directory_path = export_directory_path
         self._charging_stations = charging_stations
         self._sockets = sockets
+        self._batch_size = batch_size
+        self._output_config = output_config or {}
         self._env = Environment(
             loader=PackageLoader("src"),
             autoescape=select_autoescape()
@@ -78,22 +112,86 @@ class SqlFileExporter:
         """
         Exports the charging station data to a SQL file.
 
-        This method uses a Jinja2 template to generate the SQL script for inserting
-        charging station data and saves it to a file named 'charging_stations.sql'
-        in the specified export directory.
+        This method uses a Jinja2 template to generate the table definition, then writes
+        the charging station rows to a file named 'charging_stations.sql' (or its shards) in the specified
+        export directory.
         """
-        template = self._env.get_template(f"sql{os.sep}charging_stations.sql.j2")
-        with open(f"{self._export_directory_path}{os.sep}charging_stations.sql", 'w') as f:
-            f.write(template.render(charging_stations=self._charging_stations))
+        self._export_table("charging_stations", self._charging_stations, CHARGING_STATION_COLUMNS)
 
     def export_sockets(self):
         """
         Exports the socket data to a SQL file.
 
-        This method uses a Jinja2 template to generate the SQL script for inserting
-        socket data and saves it to a file named 'sockets.sql' in the specified
-        export directory.
+        This method uses a Jinja2 template to generate the table definition, then writes
+        the socket rows to a file named 'sockets.sql' (or its shards) in the specified export directory.
+        """
+        self._export_table("sockets", self._sockets, SOCKET_COLUMNS)
+
+    def _export_table(self, table_name: str, data: pd.DataFrame, columns: dict):
+        """
+        Writes the table definition, then the rows of a table, batch by batch.
+
+        With a maximum file size, the script is split between two INSERT statements into numbered
+        files, to be run in order; the table definition is in the first one.
+
+        Args:
+            table_name (str): The name of the table, and of the template and the SQL file.
+            data (pd.DataFrame): The rows of the table.
+            columns (dict): The columns of the table, by column of the DataFrame.
         """
-        template = self._env.get_template(f"sql{os.sep}sockets.sql.j2")
-        with open(f"{self._export_directory_path}{os.sep}sockets.sql", 'w') as f:
-            f.write(template.render(sockets=self._sockets))
+        template = self._env.get_template(f"sql{os.sep}{table_name}.sql.j2")
+        with ShardedWriter(f"{self._export_directory_path}{os.sep}{table_name}", ".sql",
+                           self._output_config.get('compression'), self._output_config.get('max_file_size')) as writer:
+            writer.write(f"{template.render()}\n")
+            for start in range(0, len(data), self._batch_size):
+                writer.write(insert_statement(table_name, data.iloc[start:start + self._batch_size], columns))
+
+
+def insert_statement(table_name: str, data: pd.DataFrame, columns: dict) -> str:
+    """
+    Builds a multi-row INSERT statement.
+
+    Args:
+        table_name (str): The name of the table.
+        data (pd.DataFrame): The rows to insert.
+        columns (dict): The columns of the table, by column of the DataFrame.
+
+    Returns:
+        str: The INSERT statement, followed by a blank line.
+    """
+    rows = None
+    for column in columns:
+        values = to_sql_literals(data[column])
+        rows = "(" + values if rows is None else rows + ", " + values
+
+    return f"INSERT INTO {table_name}({', '.join(columns.values())}) VALUES\n" + ",\n".join(rows + ")") + ";\n\n"
+
+
+def to_sql_literals(values: pd.Series) -> np.ndarray:
+    """
+    Formats values as SQL literals.
+
+    Strings are quoted with their quotes doubled, geometries are written as hexadecimal EWKB,
+    which PostGIS casts to geometry, and missing values as NULL.
+
+    Args:
+        values (pd.Series): The values to format.
+
+    Returns:
+        np.ndarray: The SQL literal of each value.
+    """
+    missing = values.isna().to_numpy()
+
+    if values.name == "geometry":
+        wkb = shapely.to_wkb(shapely.set_srid(np.asarray(values.array), SRID), hex=True, include_srid=True)
+        literals = "'" + np.where(missing, "", wkb).astype(object) + "'"
+    else:
+        match pd.api.types.infer_dtype(values, skipna=True):
+            case "boolean":
+                literals = np.where(values.astype("boolean").fillna(False).to_numpy(dtype=bool), "TRUE", "FALSE").astype(object)
+            case "integer" | "floating" | "mixed-integer-float" | "decimal" | "empty":
+                literals = values.astype(str).to_numpy(dtype=object)
+            case _:
+                literals = ("'" + values.astype(str).str.replace("'", "''") + "'").to_numpy(dtype=object)
+
+    return np.where(missing, "NULL", literals)
@@ -0,0 +1,421 @@
+"""
+Module: Grouping
+
+This module provides the functions used to group neighbouring charging points
+into charging stations. The points are projected once into a metric coordinate
+reference system and indexed in a spatial index, so each seed only looks at the
+points located within the merge distance instead of the whole dataset.
+
+The neighbour search can also be split into spatial tiles processed by several
+worker processes. The tiles are cut at quantiles of the coordinates, so they hold
+about the same number of points even when a few points are far from the others.
+Each tile is extended by a halo of the merge distance, so the neighbour pairs
+found in the tiles are exactly the pairs of the whole dataset, and the greedy
+grouping is then replayed sequentially over these pairs.
+
+The connected components grouping merges transitively every chain of points
+located within the merge distance of each other. Unlike the greedy grouping,
+the groups do not depend on the order of the points.
+
+Imports:
+    - functools
+    - math
+    - concurrent.futures.ProcessPoolExecutor
+    - geopandas as gpd
+    - numpy as np
+    - shapely
+    - pyproj.Transformer
+
+License:
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import functools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import Transformer
+
+GEOGRAPHIC_CRS = "EPSG:4326"
+PROJECTED_CRS = "EPSG:5234"
+GREEDY_MODE = "greedy"
+CONNECTED_COMPONENTS_MODE = "connected_components"
+GROUPING_MODES = [GREEDY_MODE, CONNECTED_COMPONENTS_MODE]
+
+
+def project_coordinates(geometries: gpd.GeoSeries) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Projects geometries into the metric CRS used to compute distances.
+
+    The coordinates are read from the points into arrays and projected as arrays, so no
+    projected point is built. A missing geometry gets NaN coordinates.
+
+    Parameters:
+        geometries (gpd.GeoSeries): The point geometries, in EPSG:4326.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The projected x and y coordinates.
+    """
+    points = np.asarray(geometries)
+
+    return project_xy(shapely.get_x(points), shapely.get_y(points))
+
+
+def project_xy(longitude: np.ndarray, latitude: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Projects longitude and latitude arrays into the metric CRS used to compute distances.
+
+    Parameters:
+        longitude (np.ndarray): The longitudes, in EPSG:4326.
+        latitude (np.ndarray): The latitudes, in EPSG:4326.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The projected x and y coordinates, as contiguous float64 arrays.
+    """
+    x, y = _transformer(GEOGRAPHIC_CRS, PROJECTED_CRS).transform(
+        np.asarray(longitude, dtype=np.float64),
+        np.asarray(latitude, dtype=np.float64)
+    )
+
+    return np.ascontiguousarray(x, dtype=np.float64), np.ascontiguousarray(y, dtype=np.float64)
+
+
+@functools.lru_cache(maxsize=None)
+def _transformer(source_crs: str, target_crs: str) -> Transformer:
+    """
+    Returns the transformer between two CRS, created once per process.
+
+    Parameters:
+        source_crs (str): The CRS of the coordinates.
+        target_crs (str): The CRS to project the coordinates into.
+
+    Returns:
+        Transformer: The transformer, with the coordinates in x, y (longitude, latitude) order.
+    """
+    return Transformer.from_crs(source_crs, target_crs, always_xy=True)
+
+
+def greedy_grouping(x: np.ndarray, y: np.ndarray, distance_to_merge: float) -> dict:
+    """
+    Groups points with the greedy seed-based strategy.
+
+    Points are visited in index order. Each point not yet merged becomes a seed
+    and absorbs every point not yet merged located strictly within distance_to_merge.
+
+    Parameters:
+        x (np.ndarray): The projected x coordinates.
+        y (np.ndarray): The projected y coordinates.
+        distance_to_merge (float): The distance threshold for merging, in meters.
+
+    Returns:
+        dict: A dictionary where keys are indices of seeds and values are the sorted lists of merged indices.
+    """
+    points = shapely.points(x, y)
+    tree = shapely.STRtree(points)
+    merged = np.zeros(len(points), dtype=bool)
+    merge_dict = {}
+
+    for seed in range(len(points)):
+        if merged[seed]:
+            continue
+
+        merged[seed] = True
+        candidates = tree.query(points[seed], predicate="dwithin", distance=distance_to_merge)
+        candidates = candidates[~merged[candidates]]
+        # dwithin is inclusive, the merge distance is not
+        dx = x[candidates] - x[seed]
+        dy = y[candidates] - y[seed]
+        neighbours = np.sort(candidates[np.sqrt(dx * dx + dy * dy) < distance_to_merge])
+
+        merged[neighbours] = True
+        merge_dict[seed] = neighbours.tolist()
+
+    return merge_dict
+
+
+def partitioned_greedy_grouping(x: np.ndarray, y: np.ndarray, distance_to_merge: float, workers: int, tile_size: float = None) -> dict:
+    """
+    Groups points with the greedy seed-based strategy, searching the neighbours in parallel.
+
+    The result is the same as the one of greedy_grouping: the neighbour pairs are searched
+    by spatial tiles in a process pool, then the seeds are visited in index order.
+
+    Parameters:
+        x (np.ndarray): The projected x coordinates.
+        y (np.ndarray): The projected y coordinates.
+        distance_to_merge (float): The distance threshold for merging, in meters.
+        workers (int): The number of worker processes.
+        tile_size (float): The side of square tiles, in meters. By default, the points are split into about four tiles per worker, see split_tiles.
+
+    Returns:
+        dict: A dictionary where keys are indices of seeds and values are the sorted lists of merged indices.
+    """
+    first, second = neighbour_pairs(x, y, distance_to_merge, workers, tile_size)
+
+    return greedy_grouping_from_pairs(len(x), first, second)
+
+
+def connected_components_grouping(x: np.ndarray, y: np.ndarray, distance_to_merge: float, workers: int = 1) -> dict:
+    """
+    Groups points into the connected components of the graph linking the points located
+    strictly within distance_to_merge of each other.
+
+    Parameters:
+        x (np.ndarray): The projected x coordinates.
+        y (np.ndarray): The projected y coordinates.
+        distance_to_merge (float): The distance threshold for merging, in meters.
+        workers (int): The number of worker processes used to search the neighbour pairs.
+
+    Returns:
+        dict: A dictionary where keys are the smallest indices of the components and values are the sorted lists of their other indices.
+    """
+    first, second = neighbour_pairs(x, y, distance_to_merge, workers)
+    labels = connected_components_labels(len(x), first, second)
+
+    order = np.argsort(labels, kind="stable")
+    seeds, starts = np.unique(labels[order], return_index=True)
+    members = np.split(order, starts[1:])
+
+    return {int(seed): component[1:].tolist() for seed, component in zip(seeds, members)}
+
+
+def connected_components_labels(size: int, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    Labels the connected components of an undirected graph with a vectorised union-find.
+
+    Each round hooks the root of every edge end onto the smallest of the two roots, then
+    compresses the paths by pointer jumping, until the edges link no more distinct roots.
+
+    Parameters:
+        size (int): The number of vertices.
+        first (np.ndarray): The first vertices of the edges.
+        second (np.ndarray): The second vertices of the edges.
+
+    Returns:
+        np.ndarray: The smallest vertex of the component of each vertex.
+    """
+    labels = np.arange(size)
+
+    while True:
+        first_roots = labels[first]
+        second_roots = labels[second]
+        distinct = first_roots != second_roots
+        if not distinct.any():
+            return labels
+
+        first_roots = first_roots[distinct]
+        second_roots = second_roots[distinct]
+        first, second = first[distinct], second[distinct]
+        np.minimum.at(labels, np.maximum(first_roots, second_roots), np.minimum(first_roots, second_roots))
+
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def neighbour_pairs(x: np.ndarray, y: np.ndarray, distance_to_merge: float, workers: int, tile_size: float = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds every pair of points located strictly within distance_to_merge of each other.
+
+    The points are split into tiles with split_tiles. Each tile is processed with the points of its
+    halo, the points located less than distance_to_merge outside of it, and only keeps the pairs
+    whose first point is inside the tile, so each pair is found exactly once.
+
+    Parameters:
+        x (np.ndarray): The projected x coordinates.
+        y (np.ndarray): The projected y coordinates.
+        distance_to_merge (float): The distance threshold, in meters.
+        workers (int): The number of worker processes, the tiles are processed in the current process when it is 1.
+        tile_size (float): The side of square tiles, in meters. By default, the points are split into about four tiles per worker, see split_tiles.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The indices of the first and second points of the pairs, with first < second, sorted.
+    """
+    if len(x) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    labels, bounds = split_tiles(x, y, distance_to_merge, workers, tile_size)
+    tiles = [_tile_points(x, y, labels, tile, tile_bounds, distance_to_merge) for tile, tile_bounds in enumerate(bounds)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_tile_neighbour_pairs, *zip(*tiles), [distance_to_merge] * len(tiles)))
+    else:
+        results = [_tile_neighbour_pairs(*tile, distance_to_merge) for tile in tiles]
+
+    # Sorting a single key is faster than sorting the pairs lexicographically
+    keys = np.sort(np.concatenate([result[0] * len(x) + result[1] for result in results]))
+
+    return keys // len(x), keys % len(x)
+
+
+def split_tiles(x: np.ndarray, y: np.ndarray, distance_to_merge: float, workers: int, tile_size: float = None) -> tuple[np.ndarray, list]:
+    """
+    Splits the points into rectangular tiles.
+
+    By default, the points are cut into vertical strips at quantiles of x, then each strip is cut
+    at quantiles of the y of its points, so the tiles hold about the same number of points, about
+    four tiles per worker. The tiles are at least twice the merge distance wide, so the halo does
+    not outweigh the tile. With a tile size, the extent is split into square tiles of that size
+    instead, and only the tiles holding points are kept.
+
+    Parameters:
+        x (np.ndarray): The projected x coordinates, not empty.
+        y (np.ndarray): The projected y coordinates, not empty.
+        distance_to_merge (float): The distance threshold, in meters.
+        workers (int): The number of worker processes.
+        tile_size (float): The side of square tiles, in meters, None to balance the number of points.
+
+    Returns:
+        tuple[np.ndarray, list]: The tile of each point, and the min x, min y, max x and max y of each tile.
+    """
+    if tile_size is not None:
+        tile_x = np.floor((x - x.min()) / tile_size).astype(np.int64)
+        tile_y = np.floor((y - y.min()) / tile_size).astype(np.int64)
+        tile_codes, labels = np.unique(tile_x * (tile_y.max() + 1) + tile_y, return_inverse=True)
+        bounds = [
+            (x.min() + column * tile_size, y.min() + row * tile_size, x.min() + (column + 1) * tile_size, y.min() + (row + 1) * tile_size)
+            for column, row in zip((tile_codes // (tile_y.max() + 1)).tolist(), (tile_codes % (tile_y.max() + 1)).tolist())
+        ]
+        return labels, bounds
+
+    parts = math.ceil(math.sqrt(4 * workers))
+    x_edges = _quantile_edges(x, parts, 2 * distance_to_merge)
+    strips = np.searchsorted(x_edges, x, side='right')
+    labels = np.empty(len(x), dtype=np.int64)
+    bounds = []
+
+    for strip in np.unique(strips).tolist():
+        members = np.flatnonzero(strips == strip)
+        y_edges = _quantile_edges(y[members], parts, 2 * distance_to_merge)
+        cells = np.searchsorted(y_edges, y[members], side='right')
+        for cell in np.unique(cells).tolist():
+            labels[members[cells == cell]] = len(bounds)
+            bounds.append((x_edges[strip - 1] if strip > 0 else -np.inf, y_edges[cell - 1] if cell > 0 else -np.inf,
+                           x_edges[strip] if strip < len(x_edges) else np.inf, y_edges[cell] if cell < len(y_edges) else np.inf))
+
+    return labels, bounds
+
+
+def greedy_grouping_from_pairs(size: int, first: np.ndarray, second: np.ndarray) -> dict:
+    """
+    Groups points with the greedy seed-based strategy, from their neighbour pairs.
+
+    Parameters:
+        size (int): The number of points.
+        first (np.ndarray): The indices of the first points of the pairs, sorted.
+        second (np.ndarray): The indices of the second points of the pairs, greater than the first ones and sorted for a same first point.
+
+    Returns:
+        dict: A dictionary where keys are indices of seeds and values are the sorted lists of merged indices.
+    """
+    # Only the neighbours after a seed matter, the points before it are always already merged
+    offsets = np.searchsorted(first, np.arange(size + 1))
+    merged = np.zeros(size, dtype=bool)
+    merge_dict = {}
+
+    for seed in range(size):
+        if merged[seed]:
+            continue
+
+        merged[seed] = True
+        neighbours = second[offsets[seed]:offsets[seed + 1]]
+        neighbours = neighbours[~merged[neighbours]]
+
+        merged[neighbours] = True
+        merge_dict[seed] = neighbours.tolist()
+
+    return merge_dict
+
+
+def _quantile_edges(values: np.ndarray, parts: int, min_width: float) -> list[float]:
+    """
+    Computes the cuts splitting values into parts holding about the same number of values.
+
+    Parameters:
+        values (np.ndarray): The values to split.
+        parts (int): The number of parts.
+        min_width (float): The minimum width of a part, the cuts closer to the previous cut, to the minimum or to the maximum are dropped.
+
+    Returns:
+        list[float]: The sorted cuts, a value equal to a cut belongs to the part after it.
+    """
+    minimum, maximum = values.min(), values.max()
+    edges = []
+    for edge in np.unique(np.quantile(values, np.arange(1, parts) / parts)).tolist():
+        if edge - (edges[-1] if edges else minimum) >= min_width and maximum - edge >= min_width:
+            edges.append(edge)
+
+    return edges
+
+
+def _tile_points(x: np.ndarray, y: np.ndarray, labels: np.ndarray, tile: int, bounds: tuple, distance_to_merge: float) -> tuple:
+    """
+    Selects the points of a tile and of its halo.
+
+    Parameters:
+        x (np.ndarray): The projected x coordinates.
+        y (np.ndarray): The projected y coordinates.
+        labels (np.ndarray): The tile of each point.
+        tile (int): The tile.
+        bounds (tuple): The min x, min y, max x and max y of the tile, in meters.
+        distance_to_merge (float): The width of the halo, in meters.
+
+    Returns:
+        tuple: The indices, x and y coordinates of the points of the tile and its halo, and whether each one is inside the tile.
+    """
+    min_x, min_y, max_x, max_y = bounds
+
+    indices = np.flatnonzero(
+        (x >= min_x - distance_to_merge) & (x <= max_x + distance_to_merge)
+        & (y >= min_y - distance_to_merge) & (y <= max_y + distance_to_merge)
+    )
+    inside = labels[indices] == tile
+
+    return indices, x[indices], y[indices], inside
+
+
+def _tile_neighbour_pairs(indices: np.ndarray, x: np.ndarray, y: np.ndarray, inside: np.ndarray, distance_to_merge: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the neighbour pairs whose first point is inside a tile.
+
+    Parameters:
+        indices (np.ndarray): The indices of the points of the tile and its halo.
+        x (np.ndarray): The projected x coordinates of these points.
+        y (np.ndarray): The projected y coordinates of these points.
+        inside (np.ndarray): Whether each point is inside the tile.
+        distance_to_merge (float): The distance threshold, in meters.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The indices of the first and second points of the pairs, with first < second.
+    """
+    tree = shapely.STRtree(shapely.points(x, y))
+    sources = np.flatnonzero(inside)
+    # The envelopes query is much faster than the dwithin predicate, the distance is checked below
+    envelopes = shapely.box(x[sources] - distance_to_merge, y[sources] - distance_to_merge, x[sources] + distance_to_merge, y[sources] + distance_to_merge)
+    query, candidates = tree.query(envelopes)
+    query = sources[query]
+
+    first = indices[query]
+    second = indices[candidates]
+    dx = x[candidates] - x[query]
+    dy = y[candidates] - y[query]
+    mask = (second > first) & (np.sqrt(dx * dx + dy * dy) < distance_to_merge)
+
+    return first[mask], second[mask]
@@ -0,0 +1,160 @@
+"""
+Module: Normalisation
+
+This module provides the functions used to normalise the raw values of the data sources
+(power ratings, integers and booleans) on whole pandas Series. The regular expressions are
+compiled once, and since the columns only hold a small number of distinct values, each
+distinct value is normalised once and the result is broadcast back to the column.
+
+Imports:
+    - re
+    - numpy as np
+    - pandas as pd
+
+License:
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Same units as NUMBER_WITH_UNIT_REGEX, so every value kept can be converted to kW
+POWER_RATED_REGEX = re.compile("\\d+[\\.,]?\\d*\\s?[kKmM]?[wW]")
+INT_REGEX = re.compile("^\\d+$")
+NUMBER_WITH_UNIT_REGEX = re.compile("(?P<number>\\d+[\\.,]?\\d*)\\s?(?P<unit>[kKmM]?[wW])?")
+
+# Factor to convert a power rating to kW, by lower case unit
+UNIT_FACTORS = {
+    "w": 0.001,
+    "kw": 1.0,
+    "mw": 1000.0
+}
+
+
+def extract_power_rated(values: pd.Series) -> pd.Series:
+    """
+    Extracts the power ratings, in kW, from a Series of strings.
+
+    The first number of each value is extracted. When it is followed by a unit, the value
+    is converted to kW (W, kW and MW are recognised); without unit, the value is assumed in kW.
+
+    Parameters:
+        values (pd.Series): The strings containing the power ratings.
+
+    Returns:
+        pd.Series: The power ratings as floats, NaN where no number is found.
+    """
+    def extract(uniques: pd.Series) -> np.ndarray:
+        matches = uniques.str.extract(NUMBER_WITH_UNIT_REGEX)
+        numbers = matches["number"].str.replace(',', '.').astype(float)
+        factors = matches["unit"].str.lower().map(UNIT_FACTORS).fillna(1.0)
+
+        return (numbers * factors).to_numpy(dtype=float)
+
+    return _apply_on_uniques(values, extract, np.nan, float)
+
+
+def is_power_rated_data(values: pd.Series) -> pd.Series:
+    """
+    Checks which values of a Series of strings are in the power rating format.
+
+    Parameters:
+        values (pd.Series): The values to check.
+
+    Returns:
+        pd.Series: True where the value starts with a number followed by a power unit.
+    """
+    return _apply_on_uniques(values, lambda uniques: uniques.str.match(POWER_RATED_REGEX).to_numpy(dtype=bool), False, bool)
+
+
+def is_int_data(values: pd.Series) -> pd.Series:
+    """
+    Checks which values of a Series of strings are integers.
+
+    Parameters:
+        values (pd.Series): The values to check.
+
+    Returns:
+        pd.Series: True where the value only contains digits.
+    """
+    return _apply_on_uniques(values, lambda uniques: uniques.str.match(INT_REGEX).to_numpy(dtype=bool), False, bool)
+
+
+def parse_int(values: pd.Series) -> pd.Series:
+    """
+    Parses a Series of strings into integers, with the same rules as int().
+
+    Parameters:
+        values (pd.Series): The strings to parse.
+
+    Returns:
+        pd.Series: The integers as a nullable Int64 Series, NA where the value is not an integer.
+    """
+    def parse(uniques: pd.Series) -> np.ndarray:
+        results = []
+        for value in uniques:
+            try:
+                results.append(int(value))
+            except ValueError:
+                results.append(None)
+
+        return np.array(results, dtype=object)
+
+    return _apply_on_uniques(values, parse, None, object).astype("Int64")
+
+
+def parse_bool(values: pd.Series) -> pd.Series:
+    """
+    Parses a Series of strings into booleans.
+
+    "TRUE" and "1" are parsed as True, "FALSE" and "0" as False, case insensitively.
+
+    Parameters:
+        values (pd.Series): The strings to parse.
+
+    Returns:
+        pd.Series: The booleans, None where the value is not recognised.
+    """
+    def parse(uniques: pd.Series) -> np.ndarray:
+        upper_uniques = uniques.str.upper()
+        is_true = ((upper_uniques == "TRUE") | (uniques == "1")).to_numpy(dtype=bool)
+        is_false = ((upper_uniques == "FALSE") | (uniques == "0")).to_numpy(dtype=bool)
+
+        return np.select([is_true, is_false], [True, False], default=None).astype(object)
+
+    return _apply_on_uniques(values, parse, None, object)
+
+
+def _apply_on_uniques(values: pd.Series, function, missing_value: object, dtype: type) -> pd.Series:
+    """
+    Applies a column function on the distinct values of a Series and broadcasts the result.
+
+    Parameters:
+        values (pd.Series): The values to transform.
+        function (callable): The function transforming a Series of distinct strings into an array.
+        missing_value (object): The result used for missing values.
+        dtype (type): The dtype of the result.
+
+    Returns:
+        pd.Series: The transformed values, with the index of values.
+    """
+    codes, uniques = pd.factorize(values)
+    results = np.empty(len(uniques) + 1, dtype=dtype)
+    results[:-1] = function(pd.Series(uniques, dtype=object).astype(str))
+    # The last slot is picked by the code -1 of missing values
+    results[-1] = missing_value
+
+    return pd.Series(results[codes], index=values.index, dtype=dtype)
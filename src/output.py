@@ -0,0 +1,200 @@
+"""
+Module: Output
+
+This module provides the output layer shared by the file exporters: text files optionally
+compressed with gzip or zstd, split into numbered shards of a maximum size, and Parquet files
+with a configurable compression codec and row group size.
+
+Every file is written to a temporary file first, then renamed, so an interrupted execution
+never leaves a partial output in the results directory.
+
+Imports:
+    - gzip
+    - os
+    - geopandas as gpd
+
+License:
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import os
+
+import geopandas as gpd
+
+GZIP_COMPRESSION = "gzip"
+ZSTD_COMPRESSION = "zstd"
+COMPRESSIONS = [GZIP_COMPRESSION, ZSTD_COMPRESSION]
+
+PARQUET_COMPRESSIONS = ["snappy", "gzip", "brotli", "lz4", "zstd", "none"]
+DEFAULT_PARQUET_COMPRESSION = "snappy"
+
+_COMPRESSION_EXTENSIONS = {
+    None: "",
+    GZIP_COMPRESSION: ".gz",
+    ZSTD_COMPRESSION: ".zst"
+}
+
+
+class ShardedWriter:
+    """
+    A text writer splitting its output into numbered shards of a maximum size.
+
+    The text is only split between two calls to write, so a statement or a document written
+    at once is never split across two shards. The size of a shard is counted before compression.
+    Without a maximum size, a single file is written, without number.
+
+    Attributes:
+        _path_prefix (str): The path of the files, without number and extension.
+        _extension (str): The extension of the files, without the compression extension.
+        _compression (str): The compression of the files, gzip, zstd or None.
+        _max_file_size (int): The maximum number of characters of a shard, None for a single file.
+        paths (list[str]): The paths of the files written so far.
+    """
+
+    def __init__(self, path_prefix: str, extension: str, compression: str = None, max_file_size: int = None):
+        """
+        Initializes the ShardedWriter.
+
+        Parameters:
+            path_prefix (str): The path of the files, without number and extension.
+            extension (str): The extension of the files, without the compression extension, e.g. ".sql".
+            compression (str): The compression of the files, gzip, zstd or None.
+            max_file_size (int): The maximum number of characters of a shard, None for a single file.
+
+        Raises:
+            NotImplementedError: If the compression is not implemented.
+        """
+        if compression not in _COMPRESSION_EXTENSIONS:
+            raise NotImplementedError(f"{compression} compression is not implemented, allowed value : {', '.join(COMPRESSIONS)}")
+
+        self._path_prefix = path_prefix
+        self._extension = extension
+        self._compression = compression
+        self._max_file_size = max_file_size
+        self._file = None
+        self._path_file = None
+        self._size = 0
+        self.paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write(self, text: str):
+        """
+        Writes text, in a new shard if the current one reached the maximum size.
+
+        Parameters:
+            text (str): The text to write.
+        """
+        if self._file is not None and self._max_file_size is not None and self._size >= self._max_file_size:
+            self._close_shard()
+
+        if self._file is None:
+            self._open_shard()
+
+        self._file.write(text)
+        self._size += len(text)
+
+    def close(self):
+        """
+        Closes the current shard and renames it to its final path. An empty file is written
+        if nothing was written.
+        """
+        if self._file is None and not self.paths:
+            self._open_shard()
+
+        if self._file is not None:
+            self._close_shard()
+
+    def discard(self):
+        """
+        Closes and removes the current shard, after an error.
+        """
+        if self._file is not None:
+            self._file.close()
+            os.remove(f"{self._path_file}.tmp")
+            self._file = None
+
+    def _open_shard(self):
+        """
+        Opens the temporary file of the next shard.
+        """
+        number = "" if self._max_file_size is None else f"_{len(self.paths):05d}"
+        self._path_file = f"{self._path_prefix}{number}{self._extension}{_COMPRESSION_EXTENSIONS[self._compression]}"
+        self._file = open_text_file(f"{self._path_file}.tmp", self._compression)
+        self._size = 0
+
+    def _close_shard(self):
+        """
+        Closes the current shard and renames it to its final path.
+        """
+        self._file.close()
+        os.replace(f"{self._path_file}.tmp", self._path_file)
+        self.paths.append(self._path_file)
+        self._file = None
+
+
+def open_text_file(path_file: str, compression: str = None):
+    """
+    Opens a UTF-8 text file for writing, compressed or not.
+
+    zstandard is only imported when the zstd compression is used.
+
+    Parameters:
+        path_file (str): The path of the file.
+        compression (str): The compression of the file, gzip, zstd or None.
+
+    Returns:
+        TextIO: The opened file.
+
+    Raises:
+        ImportError: If the zstd compression is used and zstandard is not installed.
+    """
+    match compression:
+        case None:
+            return open(path_file, 'w', encoding='utf-8')
+        case "gzip":
+            # The default level 9 is much slower for a few percent smaller files
+            return gzip.open(path_file, 'wt', encoding='utf-8', compresslevel=6)
+        case "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError("zstandard is required for the zstd compression, install it with pip install zstandard") from e
+            return zstandard.open(path_file, 'wt', encoding='utf-8')
+        case _:
+            raise NotImplementedError(f"{compression} compression is not implemented, allowed value : {', '.join(COMPRESSIONS)}")
+
+
+def write_parquet(data: gpd.GeoDataFrame, path_file: str, compression: str = DEFAULT_PARQUET_COMPRESSION, row_group_size: int = None):
+    """
+    Writes a GeoDataFrame to a GeoParquet file, through a temporary file.
+
+    Parameters:
+        data (gpd.GeoDataFrame): The data to write.
+        path_file (str): The path of the file.
+        compression (str): The compression codec, one of snappy, gzip, brotli, lz4, zstd or none.
+        row_group_size (int): The maximum number of rows of a row group, None for the default of pyarrow.
+    """
+    options = {} if row_group_size is None else {"row_group_size": row_group_size}
+
+    data.to_parquet(f"{path_file}.tmp", compression=None if compression == "none" else compression, **options)
+    os.replace(f"{path_file}.tmp", path_file)
@@ -39,47 +39,108 @@ License:
 import geopandas as gpd
 import pandas as pd
 
+from src.schema import apply_schema
+
 
 class AbstractParser:
     """
     A class to handle the parsing and management of geographic data.
 
+    Records are buffered column by column and materialised into a DataFrame
+    only when the data is read, by chunks of CHUNK_SIZE records. Each chunk is
+    converted to the dtypes of the schema as soon as it is materialised.
+
     Attributes:
         df (pd.DataFrame): DataFrame to store the parsed data.
     """
 
+    CHUNK_SIZE = 50000
+
     def __init__(self):
         """
-        Initializes the AbstractParser with an empty DataFrame.
+        Initializes the AbstractParser with an empty buffer.
         """
-        self.df = None
+        self._columns = {}
+        self._length = 0
+        self._chunks = []
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        Returns the parsed data as a single DataFrame, or None if no record has been added.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing the parsed data.
+        """
+        self._flush()
+
+        if len(self._chunks) == 0:
+            return None
+        elif len(self._chunks) > 1:
+            self._chunks = [pd.concat(self._chunks, ignore_index=True)]
+
+        return self._chunks[0]
+
+    @df.setter
+    def df(self, value: pd.DataFrame):
+        self._columns = {}
+        self._length = 0
+        self._chunks = [] if value is None else [value]
 
     def add_borne(self, data: dict):
         """
-        Adds a new record to the DataFrame.
+        Adds a new record to the buffer.
 
-        This method takes a dictionary representing a record and appends it to the DataFrame.
+        This method takes a dictionary representing a record and appends each of its values
+        to the corresponding column. Columns missing from the record are filled with None.
 
         Args:
             data (dict): A dictionary containing the data to be added as a new record.
         """
-        new_record = pd.DataFrame([data])
-        if self.df is None:
-            self.df = new_record
-        else:
-            self.df = pd.concat([self.df, new_record], ignore_index=True)
+        for key, value in data.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = [None] * self._length
+            column.append(value)
+
+        self._length += 1
+        for column in self._columns.values():
+            if len(column) < self._length:
+                column.append(None)
+
+        if self._length >= self.CHUNK_SIZE:
+            self._flush()
+
+    def add_bornes(self, data: pd.DataFrame):
+        """
+        Adds a batch of records, already built as a DataFrame, after the buffered records.
+
+        Args:
+            data (pd.DataFrame): A DataFrame containing the records to be added.
+        """
+        self._flush()
+        self._chunks.append(apply_schema(data))
+
+    def _flush(self):
+        """
+        Materialises the buffered records into a DataFrame chunk and empties the buffer.
+        """
+        if self._length > 0:
+            self._chunks.append(apply_schema(pd.DataFrame(self._columns)))
+            self._columns = {}
+            self._length = 0
 
     def convert_to_geoDataFrame(self) -> gpd.GeoDataFrame:
         """
         Converts the DataFrame to a GeoDataFrame.
 
         This method creates a GeoDataFrame from the stored DataFrame, using the 'geometry' column
-        and setting the coordinate reference system to EPSG:4326.
+        and setting the coordinate reference system to EPSG:4326, with the dtypes of the schema.
 
         Returns:
             gpd.GeoDataFrame: A GeoDataFrame containing the geographic data.
         """
-        return gpd.GeoDataFrame(self.df, geometry='geometry', crs="EPSG:4326")
+        return gpd.GeoDataFrame(apply_schema(self.df), geometry='geometry', crs="EPSG:4326")
 
     def export_to_geoparquet(self, filename: str):
         """
@@ -99,7 +160,7 @@ class AbstractParser:
         """
         Imports data from a GeoParquet file.
 
-        This method reads a GeoParquet file and returns a GeoDataFrame.
+        This method reads a GeoParquet file and returns a GeoDataFrame, with the dtypes of the schema.
 
         Args:
             filename (str): The name of the file from which to import the data.
@@ -107,4 +168,4 @@ class AbstractParser:
         Returns:
             gpd.GeoDataFrame: A GeoDataFrame containing the imported geographic data.
         """
-        return gpd.read_parquet(filename)
+        return apply_schema(gpd.read_parquet(filename))
@@ -45,8 +45,11 @@ License:
 import csv
 import os
 
+import geopandas as gpd
+import pandas as pd
 from shapely.geometry import Point
 
+from src import normalisation
 from src.parser.abstractparser import AbstractParser
 from src.utils import extract_power_rated
 
@@ -64,30 +67,71 @@ class CsvParser(AbstractParser):
         """
         super().__init__()
 
-    def parse_csv_file(self, path_file: str, mapping_dictionnary: dict):
+    def parse_csv_file(self, path_file: str, mapping_dictionnary: dict, chunk_size: int = None):
         """
         Parses a CSV file and adds the records to the DataFrame.
 
-        This method reads the specified CSV file, transforms each line into a record,
-        and adds it to the internal DataFrame.
+        Without chunk size, this method reads the specified CSV file line by line and transforms
+        each line into a record. With a chunk size, the file is read by chunks of chunk_size lines
+        and each chunk is transformed with column operations, so the memory used while parsing
+        stays bounded to one chunk plus the parsed records.
 
         Args:
             path_file (str): The path to the CSV file to be parsed.
             mapping_dictionnary (dict): A dictionary mapping column names to their indices.
+            chunk_size (int): The number of lines read at once, or None to read the file line by line.
 
         Raises:
             FileNotFoundError: If the specified CSV file does not exist.
         """
         if os.path.exists(path_file):
-            with open(path_file, 'r') as f:
-                lines = csv.DictReader(f)
-
-                for line in lines:
-                    borne = self.transform_line_to_borne(line, mapping_dictionnary)
-                    self.add_borne(borne)
+            if chunk_size is None:
+                with open(path_file, 'r') as f:
+                    lines = csv.DictReader(f)
+
+                    for line in lines:
+                        borne = self.transform_line_to_borne(line, mapping_dictionnary)
+                        self.add_borne(borne)
+            else:
+                columns = [column for key, column in mapping_dictionnary.items() if key != 'retrieve_from']
+                chunks = pd.read_csv(path_file, dtype=str, keep_default_na=False, usecols=columns, chunksize=chunk_size)
+
+                for chunk in chunks:
+                    self.add_bornes(self.transform_chunk_to_bornes(chunk, mapping_dictionnary))
         else:
             raise FileNotFoundError("CSV file not found")
-        
+
+    def transform_chunk_to_bornes(self, chunk: pd.DataFrame, mapping_with_index: dict) -> gpd.GeoDataFrame:
+        """
+        Transforms a chunk of the CSV file into records, with column operations.
+
+        This method produces the same records as transform_line_to_borne applied to each line of the chunk,
+        using the column functions of the normalisation module.
+
+        Args:
+            chunk (pd.DataFrame): The lines of the CSV file, with every value read as a string.
+            mapping_with_index (dict): A dictionary mapping field names to their column names.
+
+        Returns:
+            gpd.GeoDataFrame: A GeoDataFrame containing the charging station records.
+        """
+        longitude = chunk[mapping_with_index['longitude']].astype(float).to_numpy()
+        latitude = chunk[mapping_with_index['latitude']].astype(float).to_numpy()
+
+        bornes = gpd.GeoDataFrame({
+            'geometry': gpd.points_from_xy(longitude, latitude),
+            'power_rated': normalisation.extract_power_rated(chunk[mapping_with_index['power_rated']]).to_numpy(),
+            'number_of_sockets': chunk[mapping_with_index['number_of_sockets']].astype(int).to_numpy(),
+            'socket_type_ef': normalisation.parse_bool(chunk[mapping_with_index['socket_type_ef']]).to_numpy(),
+            'socket_type_2': normalisation.parse_bool(chunk[mapping_with_index['socket_type_2']]).to_numpy(),
+            'socket_type_combo_ccs': normalisation.parse_bool(chunk[mapping_with_index['socket_type_combo_ccs']]).to_numpy(),
+            'socket_type_chademo': normalisation.parse_bool(chunk[mapping_with_index['socket_type_chademo']]).to_numpy(),
+            'socket_type_autre': normalisation.parse_bool(chunk[mapping_with_index['socket_type_autre']]).to_numpy(),
+            'id_itinerance': chunk[mapping_with_index['id_pdc_itinerance']].to_numpy(),
+            'retrieve_from': mapping_with_index['retrieve_from']
+        }, geometry='geometry', crs="EPSG:4326")
+
+        return bornes
 
     def transform_line_to_borne(self, line: list[str], mapping_with_index: dict) -> dict:
         """
@@ -140,4 +184,4 @@ class CsvParser(AbstractParser):
         elif value.upper() == "FALSE" or value == '0':
             return False
         else:
-            return None
\ No newline at end of file
+            return None
@@ -85,7 +85,7 @@ class DataGouvParser(CsvParser):
         else:
             raise DownloadException(f"Error when retrieving URL = {base_url}")
 
-    def parse_file(self, path_file: str):
+    def parse_file(self, path_file: str, chunk_size: int = None):
         """
         Parses the downloaded CSV file and adds the records to the DataFrame.
 
@@ -94,6 +94,7 @@ class DataGouvParser(CsvParser):
 
         Args:
             path_file (str): The path to the CSV file to be parsed.
+            chunk_size (int): The number of lines read at once, or None to read the file line by line.
         """
         mapping_dictionnary = {
             'longitude': 'consolidated_longitude',
@@ -109,4 +110,4 @@ class DataGouvParser(CsvParser):
             'retrieve_from': 'data_gouv'
         }
 
-        self.parse_csv_file(path_file, mapping_dictionnary)
+        self.parse_csv_file(path_file, mapping_dictionnary, chunk_size)
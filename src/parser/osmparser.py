@@ -8,9 +8,13 @@ Imports:
     - os
     - subprocess
     - urllib.request
+    - geopandas as gpd
+    - numpy as np
     - pandas as pd
+    - pyarrow.parquet as pq
     - quackosm as qosm
     - shapely.geometry.Point
+    - chargingstationmergedtool.normalisation
     - chargingstationmergedtool.parser.AbstractParser
     - chargingstationmergedtool.Config
     - chargingstationmergedtool.utils
@@ -33,10 +37,14 @@ import os
 import subprocess
 import urllib.request
 
+import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import quackosm as qosm
 from shapely.geometry import Point
 
+from src import normalisation
 from src.config import Config
 from src.exception import DownloadException
 from src.parser.abstractparser import AbstractParser
@@ -46,6 +54,23 @@ from src.utils import (
     is_power_rated_data,
 )
 
+TYPE_SOCKETS = [
+    'socket:type2_combo',
+    'socket:type2',
+    'socket:type2_cable',
+    'socket:chademo',
+    'socket:typee',
+    'socket:type3c'
+]
+OSM_TAGS_FILTER = {"amenity": "charging_station", "way": False}
+OSM_TAG_KEYS = [
+    'charging_station:output',
+    'capacity',
+    'ref:EU:EVSE',
+    *TYPE_SOCKETS,
+    *[f"{type_socket}:output" for type_socket in TYPE_SOCKETS]
+]
+
 
 class OsmParser(AbstractParser):
     """
@@ -103,26 +128,121 @@ class OsmParser(AbstractParser):
         else:
             raise FileNotFoundError("PBF file not found")
 
-    def load_pbf(self, path_pbf):
+    def load_pbf(self, path_pbf, path_cache_file: str = None):
         """
         Loads the PBF file and extracts charging station data.
 
+        The charging station nodes are filtered in process by quackosm. When a cache file is given,
+        the filtered nodes are read from it if it exists, otherwise they are written to it as
+        GeoParquet so the next executions on the same input do not read the PBF file again.
+
         Parameters:
             path_pbf (str): The path to the PBF file.
+            path_cache_file (str): The path to the GeoParquet file caching the filtered nodes, or None.
 
         Raises:
-            FileNotFoundError: If the PBF file does not exist.
+            FileNotFoundError: If the PBF file does not exist and no cache file is available.
         """
-        if os.path.exists(path_pbf):
-            data = qosm.convert_pbf_to_geodataframe(path_pbf, tags_filter={"amenity": "charging_station", "way": False}, keep_all_tags=True)
-
-            for index in range(len(data)):
-                row = data.iloc[index]
-                for borne in self.extract_bornes(row):
-                    self.add_borne(borne)
+        if path_cache_file is not None and os.path.exists(path_cache_file):
+            data = self.read_nodes_cache(path_cache_file)
+        elif os.path.exists(path_pbf):
+            if path_cache_file is None:
+                data = qosm.convert_pbf_to_geodataframe(path_pbf, tags_filter=OSM_TAGS_FILTER, keep_all_tags=True)
+            else:
+                qosm.convert_pbf_to_parquet(path_pbf, tags_filter=OSM_TAGS_FILTER, keep_all_tags=True, result_file_path=path_cache_file)
+                data = self.read_nodes_cache(path_cache_file)
         else:
             raise FileNotFoundError("PBF file not found")
 
+        self.add_bornes(self.expand_bornes(data))
+
+    def read_nodes_cache(self, path_cache_file: str) -> gpd.GeoDataFrame:
+        """
+        Reads the charging station nodes cached by load_pbf.
+
+        Parameters:
+            path_cache_file (str): The path to the GeoParquet file written by quackosm.
+
+        Returns:
+            gpd.GeoDataFrame: The charging station nodes, with their geometry and tags.
+        """
+        table = pq.read_table(path_cache_file, columns=['tags', 'geometry'])
+
+        return gpd.GeoDataFrame({
+            'tags': table.column('tags').to_pandas(maps_as_pydicts="strict"),
+            'geometry': gpd.GeoSeries.from_wkb(table.column('geometry').to_numpy(zero_copy_only=False))
+        }, geometry='geometry', crs="EPSG:4326")
+
+    def expand_bornes(self, data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Expands the socket tags of every charging station node into bornes, with column operations.
+
+        The tags used by the parser are extracted as columns, the socket:* tags are stacked into
+        one row per node and socket type, then the rules of extract_socket_as_borne are applied
+        on whole columns. The result holds the same bornes, in the same order, as extract_bornes
+        applied to each node.
+
+        Parameters:
+            data (gpd.GeoDataFrame): The charging station nodes, with their geometry and tags.
+
+        Returns:
+            gpd.GeoDataFrame: A GeoDataFrame containing one borne per socket type of each node.
+        """
+        tags_list = data['tags'].to_list()
+        tags = pd.DataFrame({key: [node_tags.get(key) for node_tags in tags_list] for key in OSM_TAG_KEYS}, dtype=object)
+
+        default_power_rated = normalisation.extract_power_rated(tags['charging_station:output']).to_numpy()
+        default_capacity = normalisation.parse_int(tags['capacity']).to_numpy(dtype=float, na_value=np.nan)
+
+        # One row per node and socket type, ordered as the socket types of extract_bornes
+        sockets = pd.concat([
+            pd.DataFrame({
+                'node': np.arange(len(tags)),
+                'type_socket': type_socket,
+                'value': tags[type_socket],
+                'output': tags[f"{type_socket}:output"]
+            })[tags[type_socket].notna().to_numpy()]
+            for type_socket in TYPE_SOCKETS
+        ], ignore_index=True)
+        sockets = sockets.sort_values('node', kind='stable', ignore_index=True)
+
+        value = sockets['value']
+        node = sockets['node'].to_numpy()
+        is_yes = (value == "yes").to_numpy()
+        is_power_rated = normalisation.is_power_rated_data(value).to_numpy()
+        is_int = normalisation.is_int_data(value).to_numpy()
+        # "no" and values in any other format are dropped
+        sockets = sockets[is_yes | is_power_rated | is_int]
+        node, is_yes, is_power_rated, is_int = node[sockets.index], is_yes[sockets.index], is_power_rated[sockets.index], is_int[sockets.index]
+
+        # A power rating given instead of the number of sockets falls back on the capacity, or on 1 socket
+        capacity = np.nan_to_num(default_capacity[node], nan=1.0)
+        number_of_sockets = np.where(is_yes, 1.0, np.where(is_power_rated, capacity, normalisation.parse_int(sockets['value'].where(is_int)).to_numpy(dtype=float, na_value=np.nan)))
+
+        power_rated = np.where(is_power_rated, normalisation.extract_power_rated(sockets['value']).to_numpy(), default_power_rated[node])
+        output = sockets['output']
+        has_output = output.notna().to_numpy() & normalisation.is_power_rated_data(output).to_numpy()
+        power_rated = np.where(has_output, normalisation.extract_power_rated(output).to_numpy(), power_rated)
+
+        type_socket = sockets['type_socket']
+        socket_type_ef = (type_socket == 'socket:typee').to_numpy()
+        socket_type_2 = type_socket.isin(['socket:type2', 'socket:type2_cable']).to_numpy()
+        socket_type_combo_ccs = (type_socket == 'socket:type2_combo').to_numpy()
+        socket_type_chademo = (type_socket == 'socket:chademo').to_numpy()
+
+        return gpd.GeoDataFrame({
+            'geometry': data.geometry.to_numpy()[node],
+            'power_rated': power_rated,
+            'number_of_sockets': number_of_sockets.astype(int),
+            'retrieve_from': "OSM",
+            'id_itinerance': tags['ref:EU:EVSE'].str.replace('*', '', regex=False).to_numpy()[node],
+            'socket_type_ef': socket_type_ef,
+            'socket_type_2': socket_type_2,
+            'socket_type_combo_ccs': socket_type_combo_ccs,
+            'socket_type_chademo': socket_type_chademo,
+            'socket_type_autre': ~(socket_type_ef | socket_type_2 | socket_type_combo_ccs | socket_type_chademo)
+        }, geometry='geometry', crs="EPSG:4326")
+
     def extract_bornes(self, data_borne: pd.DataFrame) -> list[dict]:
         """
         Extracts charging station information from the given data.
@@ -151,16 +271,7 @@ class OsmParser(AbstractParser):
                 default_capacity = None
             
 
-        type_sockets = [
-            'socket:type2_combo',
-            'socket:type2',
-            'socket:type2_cable',
-            'socket:chademo',
-            'socket:typee',
-            'socket:type3c'
-        ]
-
-        for type_socket in type_sockets:
+        for type_socket in TYPE_SOCKETS:
             if type_socket in tags.keys():
                 borne = self.extract_socket_as_borne(type_socket, tags, default_rated_power, default_capacity, geometry)
                 if borne is not None:
@@ -190,7 +301,8 @@ class OsmParser(AbstractParser):
             number_of_sockets = 1
         elif is_power_rated_data(number_of_sockets):
             default_power_rated = extract_power_rated(number_of_sockets)
-            number_of_sockets = default_capacity
+            # Without capacity, at least one socket of this type exists
+            number_of_sockets = default_capacity if default_capacity is not None else 1
         elif not is_int_data(number_of_sockets):
             return None
 
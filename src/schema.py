@@ -0,0 +1,75 @@
+"""
+Module: Schema
+
+This module provides the dtypes of the columns of the parsed datasources and of the sockets,
+and a function enforcing them. The charging stations keep their integer identifiers.
+
+The source is categorical, the socket types are nullable booleans, the power rating and the
+number of sockets are nullable numbers, and the identifiers are Arrow-backed strings, instead of
+Python objects. Missing values are stored as masks, so every column keeps its dtype.
+
+Imports:
+    - pandas as pd
+
+License:
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pandas as pd
+
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+# The power rating keeps 64 bits: it takes part in the socket identifiers and is exported as is
+DATASOURCE_SCHEMA = {
+    "power_rated": "Float64",
+    "number_of_sockets": "Int32",
+    "socket_type_ef": "boolean",
+    "socket_type_2": "boolean",
+    "socket_type_combo_ccs": "boolean",
+    "socket_type_chademo": "boolean",
+    "socket_type_autre": "boolean",
+    "id_itinerance": STRING_DTYPE,
+    "retrieve_from": "category"
+}
+SOCKET_SCHEMA = {
+    **DATASOURCE_SCHEMA,
+    "id": STRING_DTYPE
+}
+
+
+def apply_schema(data: pd.DataFrame, schema: dict = DATASOURCE_SCHEMA) -> pd.DataFrame:
+    """
+    Converts the columns of a DataFrame to the dtypes of a schema.
+
+    Only the columns of the schema found in the DataFrame are converted, the other columns are kept
+    as they are. A column already of the right dtype is not copied. The categories of the source are
+    recomputed, so the concatenation of two datasources with different sources is categorical again.
+
+    Parameters:
+        data (pd.DataFrame): The DataFrame to convert.
+        schema (dict): The dtypes, by column, DATASOURCE_SCHEMA or SOCKET_SCHEMA.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the dtypes of the schema.
+    """
+    dtypes = {
+        column: dtype
+        for column, dtype in schema.items()
+        if column in data.columns and data[column].dtype != dtype
+    }
+
+    if len(dtypes) == 0:
+        return data
+
+    return data.astype(dtypes)
@@ -5,11 +5,18 @@ This module provides the Transform class, which is responsible for transforming
 and merging charging station and socket data.
 
 Imports:
+    - itertools
+    - json
+    - os
     - uuid
     - geopandas as gpd
-    - pandas as pd
     - numpy as np
-    - chargingstationmergedtool.utils.to_geo_dataframe
+    - pandas as pd
+    - shapely
+    - chargingstationmergedtool.grouping
+    - chargingstationmergedtool.output
+    - chargingstationmergedtool.schema
+    - chargingstationmergedtool.utils
 
 License:
     This program is free software: you can redistribute it and/or modify
@@ -26,13 +33,40 @@ License:
     along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import itertools
+import json
+import os
 import uuid
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-
-from src.utils import to_geo_dataframe
+import shapely
+
+from src.grouping import (
+    CONNECTED_COMPONENTS_MODE,
+    GREEDY_MODE,
+    GROUPING_MODES,
+    connected_components_grouping,
+    greedy_grouping,
+    partitioned_greedy_grouping,
+    project_coordinates,
+)
+from src.output import DEFAULT_PARQUET_COMPRESSION, write_parquet
+from src.schema import SOCKET_SCHEMA, apply_schema
+from src.utils import generate_name_based_uuids, to_geo_dataframe
+
+SOCKET_TYPE_COLUMNS = [
+    "socket_type_ef",
+    "socket_type_2",
+    "socket_type_combo_ccs",
+    "socket_type_chademo",
+    "socket_type_autre"
+]
+SOCKET_KEY_COLUMNS = ["charging_station_id", "power_rated", *SOCKET_TYPE_COLUMNS]
+# Name of the charging station column of the sockets and groups written by older versions
+LEGACY_CHARGING_STATION_COLUMN = "charging_station_index"
+SOCKET_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "chargingstationmergedtool/sockets")
 
 
 class Transform:
@@ -50,6 +84,13 @@ class Transform:
         """
         self._charging_stations = None
         self._sockets = None
+        self._socket_keys = None
+        self._groups = None
+        self._deduplication_report = {
+            "sockets": 0,
+            "duplicates": 0,
+            "duplicates_without_power_rated": 0
+        }
 
     def get_charging_stations(self) -> pd.DataFrame:
         """
@@ -71,7 +112,7 @@ class Transform:
 
     def merge_datasources(self, datasource1: gpd.GeoDataFrame, datasource2: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """
-        Merges two GeoDataFrames into one.
+        Merges two GeoDataFrames into one, with the dtypes of the schema.
 
         Parameters:
             datasource1 (gpd.GeoDataFrame): The first GeoDataFrame to merge.
@@ -80,59 +121,310 @@ class Transform:
         Returns:
             gpd.GeoDataFrame: The merged GeoDataFrame.
         """
-        return gpd.GeoDataFrame(pd.concat([datasource1, datasource2]), geometry='geometry', crs="EPSG:4326")
+        return gpd.GeoDataFrame(apply_schema(pd.concat([datasource1, datasource2])), geometry='geometry', crs="EPSG:4326")
     
-    def group_neighbouring(self, datasource: gpd.GeoDataFrame, distance_to_merge: int) -> dict:
+    def group_neighbouring(self, datasource: gpd.GeoDataFrame, distance_to_merge: int, workers: int = 1, mode: str = GREEDY_MODE,
+                           coordinates: tuple[np.ndarray, np.ndarray] = None) -> dict:
         """
         Groups neighboring geometries within a specified distance.
 
+        The geometries are projected to EPSG:5234 and indexed in a spatial index,
+        so each seed only compares itself with the points located around it.
+        With several workers, the neighbours are searched by spatial tiles in a process pool;
+        the result is the same as with a single process.
+
+        In greedy mode, each point not yet merged absorbs the points not yet merged around it, in row order.
+        In connected_components mode, the chains of neighbouring points are merged transitively,
+        whatever the row order.
+
         Parameters:
             datasource (gpd.GeoDataFrame): The GeoDataFrame containing geometries to group.
             distance_to_merge (int): The distance threshold for merging.
+            workers (int): The number of worker processes.
+            mode (str): The grouping mode, greedy or connected_components.
+            coordinates (tuple[np.ndarray, np.ndarray]): The projected x and y coordinates of the rows, if already computed.
 
         Returns:
             dict: A dictionary where keys are indices of charging stations and values are lists of indices of neighboring stations.
+
+        Raises:
+            NotImplementedError: If the grouping mode is not implemented.
         """
-        geometries = datasource['geometry'].to_list()
-        gdf = gpd.GeoDataFrame({'geometry': geometries}, crs='EPSG:4326')
-        gdf = gdf.to_crs('EPSG:5234')
-
-        index = gdf.index.to_numpy()
-        length = len(index)
-        index_already_merged = set()
-        merge_dict = {}
-
-        for index1 in range(length):
-            if index1 not in index_already_merged:
-                index_already_merged.add(index1)
-                merge_dict[index1] = list()
-                point1 = gdf.geometry[index1]
-                distances = gdf.distance(point1)
-                mask = (distances < distance_to_merge) & (index != index1) & (~np.isin(index, list(index_already_merged)))
-                merge_dict[index1].extend(index[mask].tolist())
-                index_already_merged.update(index[mask])
-
-        return merge_dict
+        if mode not in GROUPING_MODES:
+            raise NotImplementedError(f"{mode} grouping mode is not implemented, allowed value : {', '.join(GROUPING_MODES)}")
+
+        x, y = coordinates if coordinates is not None else project_coordinates(datasource['geometry'])
+
+        if mode == CONNECTED_COMPONENTS_MODE:
+            return connected_components_grouping(x, y, distance_to_merge, workers)
+        if workers > 1:
+            return partitioned_greedy_grouping(x, y, distance_to_merge, workers)
+
+        return greedy_grouping(x, y, distance_to_merge)
     
-    def transform_data(self, datasource: gpd.GeoDataFrame, merge_dict: dict):
+    def transform_data(self, datasource: gpd.GeoDataFrame, merge_dict: dict, row_keys: np.ndarray = None):
         """
         Transforms the data from the GeoDataFrame based on the merge dictionary.
 
+        The merge dictionary is flattened into a row order and a label array in one pass,
+        then the charging stations and sockets DataFrames are built with a single selection.
+        For each charging station, the seed socket comes first, followed by its neighbours.
+        The identifiers are derived from the content of the rows, so they do not change between
+        executions as long as the rows do not change. The charging station of each row is kept
+        in the groups, by row key.
+
         Parameters:
             datasource (gpd.GeoDataFrame): The GeoDataFrame containing the original data.
             merge_dict (dict): A dictionary mapping charging station indices to their neighboring indices.
+            row_keys (np.ndarray): The keys of the rows, computed with compute_row_keys if not given.
         """
-        for charging_station_index in merge_dict.keys():
-            raw_data_charging_station = datasource.iloc[charging_station_index]
-            charging_station = self.transform_to_charging_station(charging_station_index, raw_data_charging_station)
-            self.append_charging_station_to_charging_station_dataframe(charging_station)
+        seeds = np.fromiter(merge_dict.keys(), dtype=np.int64, count=len(merge_dict))
+        sizes = np.fromiter((len(neighbours) + 1 for neighbours in merge_dict.values()), dtype=np.int64, count=len(merge_dict))
+        order = np.fromiter(
+            itertools.chain.from_iterable([seed, *neighbours] for seed, neighbours in merge_dict.items()),
+            dtype=np.int64,
+            count=int(sizes.sum())
+        )
+
+        if row_keys is None:
+            row_keys = self.compute_row_keys(datasource)
+        ordered_keys = row_keys[order]
+        station_ids = self.compute_charging_station_ids(ordered_keys, sizes)
+
+        # The geometries are taken from the geometry array, without rebuilding the points
+        self._charging_stations = to_geo_dataframe(pd.DataFrame({
+            "id": station_ids,
+            "geometry": datasource['geometry'].array.take(seeds)
+        }))
+
+        sockets = to_geo_dataframe(datasource.iloc[order].reset_index(drop=True))
+        sockets["charging_station_id"] = np.repeat(station_ids, sizes)
+        sockets = self.deduplicate_sockets(sockets)
+        sockets.insert(len(sockets.columns) - 1, "id", self.compute_socket_ids(sockets))
+        self._sockets = apply_schema(sockets, SOCKET_SCHEMA)
+        self._socket_keys = None
+
+        self._groups = pd.DataFrame({
+            "key": ordered_keys,
+            "charging_station_id": np.repeat(station_ids, sizes)
+        })
+
+    def transform_data_incrementally(self, datasource: gpd.GeoDataFrame, previous: "Transform", distance_to_merge: int, workers: int = 1, mode: str = GREEDY_MODE) -> int:
+        """
+        Transforms the data by only regrouping the charging stations changed since a previous transformation.
+
+        The rows are matched with the previous ones by key. A previous charging station is regrouped
+        when one of its rows was removed, or when one of its rows is located within distance_to_merge
+        of an added row; the other charging stations and their sockets are kept as they were. Since the
+        identifiers are derived from the rows, a regrouped charging station with the same rows keeps its id.
+
+        In connected_components mode the result is the same as a full transformation. In greedy mode,
+        the result depends on the order of the rows, so the regrouped stations can differ from the
+        ones of a full transformation.
+
+        Parameters:
+            datasource (gpd.GeoDataFrame): The GeoDataFrame containing the original data.
+            previous (Transform): The previous transformation, with its charging stations, sockets and groups.
+            distance_to_merge (int): The distance threshold for merging.
+            workers (int): The number of worker processes.
+            mode (str): The grouping mode, greedy or connected_components.
+
+        Returns:
+            int: The number of regrouped rows.
+        """
+        row_keys = self.compute_row_keys(datasource)
+        # Projected once, the regrouped rows are a selection of these arrays
+        x, y = project_coordinates(datasource['geometry'])
+        previous_keys = previous.get_groups()["key"].to_numpy()
+        previous_stations = previous.get_groups()["charging_station_id"].to_numpy()
+
+        is_added = ~np.isin(row_keys, previous_keys)
+        added = np.flatnonzero(is_added)
+        kept = np.flatnonzero(~is_added)
+        kept_stations = pd.Series(previous_stations, index=previous_keys).reindex(row_keys[kept]).to_numpy()
+
+        # Previous charging stations losing a row, or close to an added row
+        affected_stations = [previous_stations[~np.isin(previous_keys, row_keys)]]
+        if len(added) > 0 and len(kept) > 0:
+            tree = shapely.STRtree(shapely.points(x[kept], y[kept]))
+            query, candidates = tree.query(shapely.points(x[added], y[added]), predicate="dwithin", distance=distance_to_merge)
+            dx = x[kept[candidates]] - x[added[query]]
+            dy = y[kept[candidates]] - y[added[query]]
+            affected_stations.append(kept_stations[candidates[np.sqrt(dx * dx + dy * dy) < distance_to_merge]])
+        affected_stations = np.unique(np.concatenate(affected_stations))
+        is_affected = np.isin(kept_stations, affected_stations)
+        regrouped = np.sort(np.concatenate([added, kept[is_affected]]))
+
+        subset = datasource.iloc[regrouped]
+        regrouped_keys = row_keys[regrouped]
+        merge_dict = self.group_neighbouring(subset, distance_to_merge, workers, mode, (x[regrouped], y[regrouped]))
+        self.transform_data(subset, merge_dict, regrouped_keys)
+
+        previous_charging_stations = pd.DataFrame(previous.get_charging_stations())
+        previous_sockets = pd.DataFrame(previous.get_sockets())
+
+        # Without changes, or on a full refresh, one side of each concatenation is empty
+        self._charging_stations = to_geo_dataframe(concat_non_empty([
+            previous_charging_stations[~previous_charging_stations["id"].isin(affected_stations)],
+            self._charging_stations
+        ]))
+        self._sockets = apply_schema(to_geo_dataframe(concat_non_empty([
+            previous_sockets[~previous_sockets["charging_station_id"].isin(affected_stations)],
+            self._sockets
+        ])), SOCKET_SCHEMA)
+        self._groups = concat_non_empty([
+            pd.DataFrame({"key": row_keys[kept[~is_affected]], "charging_station_id": kept_stations[~is_affected]}),
+            self._groups
+        ])
+
+        # The removed sockets are the rows of the datasource which are not in the sockets
+        duplicates = len(datasource) - len(self._sockets)
+        self._deduplication_report = {
+            "sockets": len(datasource),
+            "duplicates": duplicates,
+            "duplicates_without_power_rated": int(datasource["power_rated"].isna().sum() - self._sockets["power_rated"].isna().sum())
+        }
+
+        return len(regrouped)
+
+    def compute_charging_station_ids(self, ordered_keys: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """
+        Computes the identifiers of the charging stations from the keys of their rows.
+
+        The identifier of a charging station is the smallest key of its rows, reduced to 63 bits
+        so it fits in a signed 64 bits integer. It only changes when this row leaves the station.
+
+        Parameters:
+            ordered_keys (np.ndarray): The row keys, grouped by charging station.
+            sizes (np.ndarray): The number of rows of each charging station.
+
+        Returns:
+            np.ndarray: The identifier of each charging station.
+        """
+        if len(sizes) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        starts = np.cumsum(sizes) - sizes
+
+        return (np.minimum.reduceat(ordered_keys, starts) >> np.uint64(1)).astype(np.int64)
+
+    def compute_socket_ids(self, sockets: pd.DataFrame) -> list[str]:
+        """
+        Computes the identifiers of the sockets from their content.
+
+        The identifier is a name-based UUID of the source, the itinerary identifier, the coordinates
+        rounded to 6 decimals, the power rating and the socket types of the socket.
+
+        Parameters:
+            sockets (pd.DataFrame): The sockets.
+
+        Returns:
+            list[str]: The identifier of each socket.
+        """
+        coordinates = shapely.get_coordinates(np.asarray(sockets['geometry']))
+        names = sockets['retrieve_from'].astype(object).where(sockets['retrieve_from'].notna(), "").astype(str)
+        names = names + "|" + sockets['id_itinerance'].astype(object).where(sockets['id_itinerance'].notna(), "").astype(str)
+        names = names + "|" + pd.Series(np.round(coordinates[:, 0], 6), index=sockets.index).astype(str)
+        names = names + "|" + pd.Series(np.round(coordinates[:, 1], 6), index=sockets.index).astype(str)
+        names = names + "|" + sockets['power_rated'].astype("float64").astype(str)
+        for column in SOCKET_TYPE_COLUMNS:
+            names = names + "|" + sockets[column].astype("boolean").astype(str)
+
+        return generate_name_based_uuids(names, SOCKET_NAMESPACE)
+
+    def compute_row_keys(self, datasource: gpd.GeoDataFrame) -> np.ndarray:
+        """
+        Computes a key identifying each row of a datasource by its content.
+
+        The key hashes the coordinates and the attributes of the row, and its rank among the
+        identical rows, so the rows of two datasources can be matched between executions.
+
+        Parameters:
+            datasource (gpd.GeoDataFrame): The GeoDataFrame containing the original data.
+
+        Returns:
+            np.ndarray: The unsigned 64 bits key of each row.
+        """
+        coordinates = shapely.get_coordinates(datasource['geometry'].to_numpy())
+        attributes = pd.DataFrame(datasource.drop(columns='geometry')).reset_index(drop=True)
+        attributes = attributes[sorted(attributes.columns)].assign(x=coordinates[:, 0], y=coordinates[:, 1])
+        hashes = pd.util.hash_pandas_object(attributes, index=False).to_numpy()
+        ranks = pd.Series(hashes).groupby(hashes).cumcount().to_numpy()
+
+        return pd.util.hash_pandas_object(pd.DataFrame({"hash": hashes, "rank": ranks}), index=False).to_numpy()
+
+    def get_groups(self) -> pd.DataFrame:
+        """
+        Returns the charging station of each row of the last transformation.
+
+        Returns:
+            pd.DataFrame: The row keys and the ids of their charging stations.
+        """
+        return self._groups
+
+    def export_groups(self, path_file: str):
+        """
+        Exports the groups to a Parquet file.
+
+        Parameters:
+            path_file (str): The path of the Parquet file.
+        """
+        self._groups.to_parquet(path_file)
+
+    def import_groups(self, path_file: str):
+        """
+        Imports the groups exported by a previous transformation.
+
+        Parameters:
+            path_file (str): The path of the Parquet file.
+        """
+        self._groups = rename_legacy_columns(pd.read_parquet(path_file))
+
+    def deduplicate_sockets(self, sockets: pd.DataFrame) -> pd.DataFrame:
+        """
+        Removes the sockets already present in the same charging station.
+
+        A socket is a duplicate when an earlier socket of the same charging station has the same
+        power rating and socket types. Missing values are considered equal to each other, so two
+        sockets without power rating and with the same types are duplicates. The number of removed
+        sockets is kept in the deduplication report.
+
+        Parameters:
+            sockets (pd.DataFrame): The sockets DataFrame, in insertion order.
+
+        Returns:
+            pd.DataFrame: The sockets DataFrame without duplicates.
+        """
+        keys = sockets[SOCKET_KEY_COLUMNS].astype({"power_rated": "float64", **{column: "boolean" for column in SOCKET_TYPE_COLUMNS}})
+        duplicated = keys.duplicated(keep="first")
+
+        self._deduplication_report = {
+            "sockets": len(sockets),
+            "duplicates": int(duplicated.sum()),
+            "duplicates_without_power_rated": int((duplicated & keys["power_rated"].isna()).sum())
+        }
+
+        return sockets[~duplicated.to_numpy()].reset_index(drop=True)
+
+    def get_deduplication_report(self) -> dict:
+        """
+        Returns the counts of the last socket deduplication.
+
+        Returns:
+            dict: The number of candidate sockets, of removed duplicates and of removed duplicates without power rating.
+        """
+        return self._deduplication_report
+
+    def export_deduplication_report(self, export_directory: str):
+        """
+        Exports the deduplication report to a JSON file, to follow the data quality between executions.
+
+        Parameters:
+            export_directory (str): The directory where the report will be saved.
+        """
+        with open(f"{export_directory}deduplication_report.json", "w") as f:
+            json.dump(self._deduplication_report, f, indent=2)
 
-            socket = self.transform_to_socket(charging_station_index, raw_data_charging_station)
-            self.append_socket_to_sockets_dataframe(socket)
-            for socket_index in merge_dict[charging_station_index]:
-                socket = self.transform_to_socket(charging_station_index, datasource.iloc[socket_index])
-                self.append_socket_to_sockets_dataframe(socket)
-    
     def append_charging_station_to_charging_station_dataframe(self, charging_station: dict):
         """
         Appends a charging station record to the charging stations DataFrame.
@@ -146,19 +438,36 @@ class Transform:
         else:
             self._charging_stations = pd.concat([self._charging_stations, charging_station_record], ignore_index=True)
     
-    def export_to_parquet_files(self, export_directory: str):
+    def export_to_parquet_files(self, export_directory: str, compression: str = DEFAULT_PARQUET_COMPRESSION, row_group_size: int = None):
         """
         Exports the charging stations and sockets DataFrames to Parquet files.
 
         Parameters:
             export_directory (str): The directory where the Parquet files will be saved.
+            compression (str): The compression codec of the Parquet files.
+            row_group_size (int): The maximum number of rows of a row group, None for the default of pyarrow.
         """
-        # Convert to GeoDataFrame to be exported into geoparquet
+        # Convert to GeoDataFrame to be exported into geoparquet, without copy if already one
         charging_stations = to_geo_dataframe(self._charging_stations)
         sockets = to_geo_dataframe(self._sockets)
 
-        charging_stations.to_parquet(f"{export_directory}charging_stations.parquet")
-        sockets.to_parquet(f"{export_directory}sockets.parquet")
+        write_parquet(charging_stations, f"{export_directory}charging_stations.parquet", compression, row_group_size)
+        write_parquet(sockets, f"{export_directory}sockets.parquet", compression, row_group_size)
+
+    def import_from_parquet_files(self, import_directory: str):
+        """
+        Imports the charging stations and sockets, and their deduplication report, exported by a previous transformation.
+
+        Parameters:
+            import_directory (str): The directory where the Parquet files were saved.
+        """
+        self._charging_stations = gpd.read_parquet(f"{import_directory}charging_stations.parquet")
+        self._sockets = apply_schema(rename_legacy_columns(gpd.read_parquet(f"{import_directory}sockets.parquet")), SOCKET_SCHEMA)
+        self._socket_keys = None
+
+        if os.path.exists(f"{import_directory}deduplication_report.json"):
+            with open(f"{import_directory}deduplication_report.json", "r") as f:
+                self._deduplication_report = json.load(f)
 
     def transform_to_charging_station(self, index: int, raw_data: dict) -> dict:
         """
@@ -188,8 +497,8 @@ class Transform:
             pd.Series: A dictionary representing the socket.
         """
         result = raw_data.copy()
-        result["id"] = str(uuid.uuid4())
-        result["charging_station_index"] = charging_station_index
+        result["id"] = self.compute_socket_ids(pd.DataFrame([raw_data]))[0]
+        result["charging_station_id"] = charging_station_index
         
         return result
 
@@ -197,23 +506,70 @@ class Transform:
         """
         Appends a socket record to the sockets DataFrame if it does not already exist.
 
+        Existing sockets are looked up in a set of deduplication keys instead of being scanned.
+
         Parameters:
             socket (dict): A dictionary containing socket data.
         """
         socket_record = socket.to_frame().T
+        key = tuple(None if pd.isna(value) else value for value in socket[SOCKET_KEY_COLUMNS])
 
         if self._sockets is None:
             self._sockets = socket_record
+            self._socket_keys = {key}
         else:
-            sockets_already_added_into_this_charging_station = self._sockets[
-                (self._sockets["charging_station_index"] == socket["charging_station_index"]) & 
-                (self._sockets["power_rated"] == socket["power_rated"]) & 
-                (self._sockets["socket_type_ef"] == socket["socket_type_ef"]) & 
-                (self._sockets["socket_type_2"] == socket["socket_type_2"]) & 
-                (self._sockets["socket_type_combo_ccs"] == socket["socket_type_combo_ccs"]) & 
-                (self._sockets["socket_type_chademo"] == socket["socket_type_chademo"]) & 
-                (self._sockets["socket_type_autre"] == socket["socket_type_autre"])
-            ]
-
-            if len(sockets_already_added_into_this_charging_station) == 0:
-                self._sockets = pd.concat([self._sockets, socket_record], ignore_index=True)
\ No newline at end of file
+            if self._socket_keys is None:
+                self._socket_keys = {
+                    tuple(None if pd.isna(value) else value for value in values)
+                    for values in self._sockets[SOCKET_KEY_COLUMNS].itertuples(index=False)
+                }
+
+            if key not in self._socket_keys:
+                self._socket_keys.add(key)
+                self._sockets = pd.concat([self._sockets, socket_record], ignore_index=True)
+            else:
+                self._deduplication_report["duplicates"] += 1
+                if key[1] is None:
+                    self._deduplication_report["duplicates_without_power_rated"] += 1
+
+        self._deduplication_report["sockets"] += 1
+
+
+def rename_legacy_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Renames the charging station column of sockets or groups written by older versions,
+    so they can be compared with the current ones.
+
+    Parameters:
+        data (pd.DataFrame): The sockets or groups read from a Parquet file.
+
+    Returns:
+        pd.DataFrame: The data, with a charging_station_id column.
+    """
+    if LEGACY_CHARGING_STATION_COLUMN not in data.columns:
+        return data
+
+    return data.rename(columns={LEGACY_CHARGING_STATION_COLUMN: "charging_station_id"})
+
+
+def concat_non_empty(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates DataFrames with a new index, leaving out the empty ones.
+
+    pandas warns that the empty DataFrames will take part in the dtypes of a concatenation in a
+    future version, so they are left out to keep the dtypes of the non-empty ones.
+
+    Parameters:
+        frames (list[pd.DataFrame]): The DataFrames to concatenate, with the same columns.
+
+    Returns:
+        pd.DataFrame: The concatenated DataFrames, the last one if they are all empty.
+    """
+    non_empty = [frame for frame in frames if len(frame) > 0]
+
+    if len(non_empty) == 0:
+        return frames[-1].reset_index(drop=True)
+    if len(non_empty) == 1:
+        return non_empty[0].reset_index(drop=True)
+
+    return pd.concat(non_empty, ignore_index=True)
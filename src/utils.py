@@ -6,13 +6,16 @@ hashing files, and exporting graphs.
 
 Imports:
     - hashlib
+    - json
     - os
-    - re
+    - uuid
     - geopandas as gpd
     - pandas as pd
+    - chargingstationmergedtool.normalisation
 
 Constants:
     - PATH_LAST_EXECUTION: Path to the last execution record.
+    - PATH_CACHE_DIRECTORY: Path to the directory of the files cached between executions.
 
 License:
     This program is free software: you can redistribute it and/or modify
@@ -30,41 +33,56 @@ License:
 """
 
 import hashlib
+import json
 import os
-import re
+import uuid
 
 import geopandas as gpd
 import pandas as pd
 
+from src.normalisation import (
+    INT_REGEX,
+    NUMBER_WITH_UNIT_REGEX,
+    POWER_RATED_REGEX,
+    UNIT_FACTORS,
+)
+
 PATH_LAST_EXECUTION = f"results{os.sep}last_execution"
+PATH_CACHE_DIRECTORY = f"results{os.sep}cache{os.sep}"
 
 def is_power_rated_data(value: str) -> bool:
     """
     Checks if the given value is a valid power rated data format.
 
+    Scalar version of normalisation.is_power_rated_data.
+
     Parameters:
         value (str): The value to check.
 
     Returns:
         bool: True if the value matches the power rated format, False otherwise.
     """
-    return re.match("\\d+[\\.,]?\\d*\\s?[kKwW]+", value) is not None
+    return POWER_RATED_REGEX.match(value) is not None
 
 def is_int_data(value: str) -> bool:
     """
     Checks if the given value is a valid integer format.
 
+    Scalar version of normalisation.is_int_data.
+
     Parameters:
         value (str): The value to check.
 
     Returns:
         bool: True if the value is an integer, False otherwise.
     """
-    return re.match("^\\d+$", value) is not None
+    return INT_REGEX.match(value) is not None
 
 def extract_power_rated(value: str) -> float:
     """
-    Extracts the numeric power rating from a given string.
+    Extracts the numeric power rating, in kW, from a given string.
+
+    Scalar version of normalisation.extract_power_rated.
 
     Parameters:
         value (str): The string containing the power rating.
@@ -72,11 +90,12 @@ def extract_power_rated(value: str) -> float:
     Returns:
         float: The extracted power rating as a float, or None if not found.
     """
-    regex_numbers = "\\d+[\\.,]?\\d*"
-    match = re.findall(regex_numbers, value)
+    match = NUMBER_WITH_UNIT_REGEX.search(value)
 
-    if match is not None and len(match) > 0:
-        return float(match[0].replace(',', '.'))
+    if match is not None:
+        unit = match.group("unit")
+        factor = 1.0 if unit is None else UNIT_FACTORS[unit.lower()]
+        return float(match.group("number").replace(',', '.')) * factor
     else:
         return None
     
@@ -115,58 +134,48 @@ def to_geo_dataframe(data: pd.DataFrame) -> gpd.GeoDataFrame:
     """
     Converts a DataFrame to a GeoDataFrame.
 
+    A GeoDataFrame already in EPSG:4326 with a 'geometry' column is returned as is, so the stages
+    can pass their frames to each other without rebuilding them.
+
     Parameters:
         data (pd.DataFrame): The DataFrame to convert.
 
     Returns:
         gpd.GeoDataFrame: The converted GeoDataFrame.
     """
+    if isinstance(data, gpd.GeoDataFrame) and data.active_geometry_name == 'geometry' and data.crs == "EPSG:4326":
+        return data
+
     return gpd.GeoDataFrame(data, geometry='geometry', crs="EPSG:4326")
 
-def compare_hash(path_hash_file: str, path_file: str) -> bool:
+def generate_name_based_uuids(names: list[str], namespace: uuid.UUID) -> list[str]:
     """
-    Compares the hash of a file with a previously stored hash.
+    Generates name-based (version 5) UUIDs, so a same name always gets the same UUID.
 
     Parameters:
-        path_hash_file (str): The path to the hash file.
-        path_file (str): The path to the file to compare.
+        names (list[str]): The names to generate the UUIDs from.
+        namespace (uuid.UUID): The namespace of the names.
 
     Returns:
-        bool: True if the hashes match, False otherwise.
+        list[str]: The generated UUIDs, in their canonical string form.
     """
-    if not os.path.exists(path_hash_file):
-        return False
-    else:
-        with open(path_hash_file, 'r') as f:
-            old_hash = f.read()
-
-        sha256 = hashlib.sha512()
-        BUF_SIZE = 65536  # lets read stuff in 64kb chunks!
-
-        if os.path.exists(path_file):
-            with open(path_file, 'rb') as f:
-                while True:
-                    data = f.read(BUF_SIZE)
-                    if not data:
-                        break
-                    sha256.update(data)
+    return [str(uuid.uuid5(namespace, name)) for name in names]
 
-            return old_hash == sha256.hexdigest()
-        return False
-
-def write_hash_file(path_hash_file: str, path_file: str):
+def hash_file(path_file: str) -> str:
     """
-    Writes the SHA-512 hash of a file to a specified hash file.
+    Computes the BLAKE2b hash of a file.
 
     Parameters:
-        path_hash_file (str): The path to the hash file where the hash will be written.
-        path_file (str): The path to the file for which the hash will be calculated.
+        path_file (str): The path to the file to hash.
+
+    Returns:
+        str: The hexadecimal digest of the file.
 
     Raises:
         FileNotFoundError: If the specified file does not exist.
     """
-    sha256 = hashlib.sha512()
-    BUF_SIZE = 65536  # Read in 64kb chunks
+    blake2b = hashlib.blake2b()
+    BUF_SIZE = 1024 * 1024  # Read in 1MB chunks
 
     if not os.path.exists(path_file):
         raise FileNotFoundError(path_file)
@@ -176,14 +185,82 @@ def write_hash_file(path_hash_file: str, path_file: str):
             data = f.read(BUF_SIZE)
             if not data:
                 break
-            sha256.update(data)
+            blake2b.update(data)
+
+    return blake2b.hexdigest()
+
+def create_file_record(path_file: str, digest: str = None) -> dict:
+    """
+    Creates the record of a file: its size, modification time, inode and digest.
+
+    Parameters:
+        path_file (str): The path to the file.
+        digest (str): The digest of the file, computed with hash_file if not given.
+
+    Returns:
+        dict: The record of the file.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+    """
+    if not os.path.exists(path_file):
+        raise FileNotFoundError(path_file)
+
+    stat = os.stat(path_file)
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "digest": digest if digest is not None else hash_file(path_file)
+    }
+
+def is_file_record_up_to_date(record: dict, path_file: str) -> bool:
+    """
+    Checks, without reading the file, whether a record still describes a file.
+
+    The size, modification time and inode of the file are compared with the record.
+
+    Parameters:
+        record (dict): The record of the file.
+        path_file (str): The path to the file.
+
+    Returns:
+        bool: True if the file has the same size, modification time and inode as in the record.
+    """
+    if record is None or not os.path.exists(path_file):
+        return False
+
+    stat = os.stat(path_file)
 
-    # Clean old hash file
-    if os.path.exists(path_hash_file):
-        os.remove(path_hash_file)
+    return record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns and record.get("inode") == stat.st_ino
 
-    with open(path_hash_file, 'w') as f:
-        f.write(sha256.hexdigest())
+def read_file_record(path_record_file: str) -> dict:
+    """
+    Reads a record written by write_file_record.
+
+    Parameters:
+        path_record_file (str): The path to the record file.
+
+    Returns:
+        dict: The record, or None if the file does not exist.
+    """
+    if not os.path.exists(path_record_file):
+        return None
+
+    with open(path_record_file, 'r') as f:
+        return json.load(f)
+
+def write_file_record(path_record_file: str, record: dict):
+    """
+    Writes the record of a file, created by create_file_record, to a specified record file.
+
+    Parameters:
+        path_record_file (str): The path to the record file.
+        record (dict): The record of the file.
+    """
+    with open(path_record_file, 'w') as f:
+        json.dump(record, f)
 
 def extract_path_last_execution() -> str:
     """
@@ -0,0 +1,32 @@
+import geopandas as gpd
+from shapely.geometry import Point
+from src.transform import Transform
+
+
+def transform_output() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+    """
+    Returns the charging stations and sockets produced by Transform, as given to the exporters.
+    """
+    points = [
+        Point(2.3522, 48.8566),  # Notre-Dame de Paris
+        Point(2.3524, 48.8567),  # Notre-Dame de Paris
+        Point(2.2945, 48.8584),  # Tour Eiffel
+        Point(2.3431, 48.8867)   # Montmartre
+    ]
+    datasource = gpd.GeoDataFrame({
+        'geometry': points,
+        'power_rated': [22.0, 50.0, 3.7, 7.4],
+        'number_of_sockets': [1, 2, None, 1],
+        'socket_type_ef': [True, False, False, None],
+        'socket_type_2': [True, False, True, False],
+        'socket_type_combo_ccs': [False, True, False, False],
+        'socket_type_chademo': [False, False, False, False],
+        'socket_type_autre': [False, False, False, False],
+        'id_itinerance': ["iti1", "iti2", "iti'3", None],
+        'retrieve_from': ["DATA_GOUV", "OSM", "DATA_GOUV", "OSM"]
+    }, crs="EPSG:4326")
+
+    transform = Transform()
+    transform.transform_data(datasource, transform.group_neighbouring(datasource, 100))
+
+    return transform.get_charging_stations(), transform.get_sockets()
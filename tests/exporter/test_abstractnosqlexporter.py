@@ -1,4 +1,5 @@
 from src.exporter import AbstractNoSqlExporter
+from tests.exporter import transform_output
 import pandas as pd
 from shapely.geometry import Point
 
@@ -95,4 +96,49 @@ def test_transform_data_to_dict():
     assert(result[0]["id"]) == 0
     assert(result[0]["longitude"]) == -61.72048
     assert(result[0]["latitude"]) == 15.999102
-    assert(len(result[0]["sockets"])) == 5
\ No newline at end of file
+    assert(len(result[0]["sockets"])) == 5
+
+
+def test_iter_documents_unsorted_sockets():
+    charging_stations = pd.DataFrame({
+        'id': [5, 3, 7],
+        'geometry': [Point(1, 1), Point(2, 2), Point(3, 3)]
+    })
+    sockets = pd.DataFrame({
+        'id': ["a", "b", "c", "d"],
+        'geometry': [Point(1, 1), Point(2, 2), Point(1.5, 1.5), Point(2.5, 2.5)],
+        'power_rated': [22.0, 50.0, 3.7, 7.4],
+        'number_of_sockets': [1, 2, 1, 1],
+        'socket_type_ef': [True, False, False, True],
+        'socket_type_2': [False, True, False, False],
+        'socket_type_combo_ccs': [False, False, True, False],
+        'socket_type_chademo': [False, False, False, False],
+        'socket_type_autre': [False, False, False, False],
+        'id_itinerance': ["iti1", "iti2", "iti3", "iti4"],
+        'charging_station_id': [5, 3, 5, 3],
+        'retrieve_from': ["OSM", "DATA_GOUV", "OSM", "OSM"]
+    })
+
+    exporter = AbstractNoSqlExporter(charging_stations, sockets)
+    result = list(exporter.iter_documents())
+
+    assert [document["id"] for document in result] == [5, 3, 7]
+    assert [socket["id"] for socket in result[0]["sockets"]] == ["a", "c"]
+    assert [socket["id"] for socket in result[1]["sockets"]] == ["b", "d"]
+    assert result[2]["sockets"] == []
+    assert type(result[0]["id"]) is int
+    assert type(result[0]["sockets"][0]["number_of_sockets"]) is int
+    assert type(result[0]["sockets"][0]["socket_type_ef"]) is bool
+    assert exporter.extract_sockets(4) == []
+
+
+def test_iter_documents_transform_output():
+    charging_stations, sockets = transform_output()
+
+    result = list(AbstractNoSqlExporter(charging_stations, sockets).iter_documents())
+
+    assert [document["id"] for document in result] == list(charging_stations["id"])
+    assert [len(document["sockets"]) for document in result] == [2, 1, 1]
+    assert sorted(socket["id"] for document in result for socket in document["sockets"]) == sorted(sockets["id"])
+    assert [socket["id"] for socket in result[0]["sockets"]] == list(sockets["id"][sockets["charging_station_id"] == result[0]["id"]])
+    assert result[2]["sockets"][0]["id_itinerance"] is None
@@ -2,7 +2,12 @@ from src.exporter import MongoExporter
 from testcontainers.mongodb import MongoDbContainer
 import pandas as pd
 from shapely.geometry import Point
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+from unittest.mock import MagicMock
+import pytest
+from src.exporter import mongoexporter
+from tests.exporter import transform_output
 
 def test_export():
     with MongoDbContainer("mongo:8", dbname="database_name") as mongodb:
@@ -47,9 +52,138 @@ def test_export():
         })
 
         exporter = MongoExporter(config, charging_stations, sockets)
-        exporter.export()
+        summary = exporter.export()
+        assert summary["inserted"] == 2
 
         with MongoClient(config['connection_url'].replace('localhost', mongodb.get_container_host_ip())) as client:
             db = client.get_database(config['database_name'])
             collection = db.get_collection(config['charging_stations_collection_name'])
-            assert(collection.estimated_document_count()) == 2
\ No newline at end of file
+            assert(collection.estimated_document_count()) == 2
+
+            # The charging station 1 is no longer exported, its document is deleted
+            summary = MongoExporter(config, charging_stations.iloc[:1], sockets[sockets['charging_station_id'] == 0]).export()
+            assert summary["deleted"] == 1
+            assert(collection.count_documents({})) == 1
+
+def build_exporter(config: dict, client) -> MongoExporter:
+    charging_stations = pd.DataFrame({
+        'id': [0, 1, 2],
+        'geometry': [Point(-61.72048, 15.999102), Point(-61.605293, 16.20394), Point(2.3522, 48.8566)]
+    })
+    sockets = pd.DataFrame({
+        'id': ["test1", "test2", "test3"],
+        'geometry': [Point(-61.72048, 15.999102), Point(-61.605293, 16.20394), Point(2.3522, 48.8566)],
+        'power_rated': [22.0, 50.0, 150.0],
+        'number_of_sockets': [1, 2, 1],
+        'socket_type_ef': [True, False, False],
+        'socket_type_2': [False, True, False],
+        'socket_type_combo_ccs': [False, False, True],
+        'socket_type_chademo': [False, False, False],
+        'socket_type_autre': [False, False, False],
+        'id_itinerance': ["iti1", "iti2", "iti3"],
+        'charging_station_id': [0, 1, 2],
+        'retrieve_from': ["OSM", "DATA_GOUV", "OSM"]
+    })
+
+    return MongoExporter(config, charging_stations, sockets, client=client)
+
+
+def bulk_write_result(upserted: int, matched: int, modified: int) -> MagicMock:
+    result = MagicMock()
+    result.upserted_count = upserted
+    result.matched_count = matched
+    result.modified_count = modified
+    return result
+
+
+def test_export_batches_upserts():
+    client = MagicMock()
+    collection = client.get_database.return_value.get_collection.return_value
+    collection.bulk_write.side_effect = [bulk_write_result(1, 1, 1), bulk_write_result(0, 1, 0)]
+    exporter = build_exporter({"database_name": "db", "charging_stations_collection_name": "cs", "batch_size": 2}, client)
+
+    summary = exporter.export()
+
+    assert summary == {"inserted": 1, "updated": 1, "unchanged": 1, "failed": 0, "deleted": 0}
+    collection.create_index.assert_called_once_with([("id", 1)], unique=True)
+    assert collection.bulk_write.call_count == 2
+    requests, = collection.bulk_write.call_args_list[0].args
+    assert collection.bulk_write.call_args_list[0].kwargs == {"ordered": False}
+    assert [request._filter for request in requests] == [{"id": 0}, {"id": 1}]
+    assert all(isinstance(request, ReplaceOne) and request._upsert for request in requests)
+
+
+def test_export_deletes_stale_documents():
+    client = MagicMock()
+    collection = client.get_database.return_value.get_collection.return_value
+    collection.bulk_write.side_effect = lambda requests, ordered: bulk_write_result(0, len(requests), 0)
+    # 7 was removed from the sources, 8 is the former id of a charging station whose group changed
+    collection.find.return_value = [{"id": 0}, {"id": 7}, {"id": 1}, {"id": 8}, {"id": 2}]
+    collection.delete_many.return_value.deleted_count = 1
+    exporter = build_exporter({"database_name": "db", "charging_stations_collection_name": "cs", "batch_size": 1}, client)
+
+    summary = exporter.export()
+
+    assert summary["deleted"] == 2
+    assert [call.args[0] for call in collection.delete_many.call_args_list] == [{"id": {"$in": [7]}}, {"id": {"$in": [8]}}]
+    collection.find.assert_called_once_with({"id": {"$exists": True}}, {"id": 1, "_id": 0})
+
+
+def test_export_parallel_batches():
+    client = MagicMock()
+    collection = client.get_database.return_value.get_collection.return_value
+    collection.bulk_write.side_effect = lambda requests, ordered: bulk_write_result(len(requests), 0, 0)
+    exporter = build_exporter({"database_name": "db", "charging_stations_collection_name": "cs", "batch_size": 1, "workers": 2}, client)
+
+    summary = exporter.export()
+
+    assert summary == {"inserted": 3, "updated": 0, "unchanged": 0, "failed": 0, "deleted": 0}
+    assert collection.bulk_write.call_count == 3
+
+
+def test_write_batch_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr(mongoexporter.time, "sleep", lambda seconds: None)
+    collection = MagicMock()
+    collection.bulk_write.side_effect = [AutoReconnect("connection reset"), bulk_write_result(1, 0, 0)]
+    exporter = build_exporter({"database_name": "db", "charging_stations_collection_name": "cs"}, MagicMock())
+
+    assert exporter.write_batch(collection, [{"id": 0}]) == {"inserted": 1, "updated": 0, "unchanged": 0, "failed": 0}
+    assert collection.bulk_write.call_count == 2
+
+
+def test_write_batch_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(mongoexporter.time, "sleep", lambda seconds: None)
+    collection = MagicMock()
+    collection.bulk_write.side_effect = AutoReconnect("connection reset")
+    exporter = build_exporter({"database_name": "db", "charging_stations_collection_name": "cs", "max_retries": 2}, MagicMock())
+
+    with pytest.raises(AutoReconnect):
+        exporter.write_batch(collection, [{"id": 0}])
+    assert collection.bulk_write.call_count == 3
+
+
+def test_write_batch_counts_failed_documents():
+    collection = MagicMock()
+    collection.bulk_write.side_effect = BulkWriteError({
+        "nUpserted": 1,
+        "nMatched": 0,
+        "nModified": 0,
+        "writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]
+    })
+    exporter = build_exporter({"database_name": "db", "charging_stations_collection_name": "cs"}, MagicMock())
+
+    assert exporter.write_batch(collection, [{"id": 0}, {"id": 1}]) == {"inserted": 1, "updated": 0, "unchanged": 0, "failed": 1}
+
+
+def test_export_transform_output():
+    client = MagicMock()
+    collection = client.get_database.return_value.get_collection.return_value
+    collection.bulk_write.side_effect = lambda requests, ordered: bulk_write_result(len(requests), 0, 0)
+    charging_stations, sockets = transform_output()
+    exporter = MongoExporter({"database_name": "db", "charging_stations_collection_name": "cs"}, charging_stations, sockets, client=client)
+
+    summary = exporter.export()
+
+    assert summary == {"inserted": 3, "updated": 0, "unchanged": 0, "failed": 0, "deleted": 0}
+    requests, = collection.bulk_write.call_args.args
+    assert sum(len(request._doc["sockets"]) for request in requests) == len(sockets)
@@ -1,46 +1,101 @@
 from src.exporter import MongoFileExporter
+from tests.exporter import transform_output
+import gzip
+import json
 import pandas as pd
+import pytest
 from shapely.geometry import Point
 import tempfile
 import os
 
+def build_data() -> tuple[pd.DataFrame, pd.DataFrame]:
+    charging_stations = pd.DataFrame({
+        'id': [0, 1],
+        'geometry': [Point(-61.72048, 15.999102), Point(-61.605293, 16.20394)]
+    })
+
+    points = [
+        Point(2.3522, 48.8566),  # Notre-Dame de Paris
+        Point(2.3444, 48.8554),  # Sainte-Chapelle
+        Point(2.3442, 48.8550),  # Conciergerie
+        Point(2.3500, 48.8555),  # Pont Saint-Louis
+        Point(2.3600, 48.8420),  # Jardin des Plantes
+        Point(2.2945, 48.8584),  # Tour Eiffel
+        Point(2.3376, 48.8606),  # Louvre
+        Point(2.3614, 48.8660),  # Opéra Garnier
+        Point(2.2699, 48.8848),  # Montmartre
+        Point(2.3300, 48.8738)   # Place de la Concorde
+    ]
+
+    # Création du GeoDataFrame
+    sockets = pd.DataFrame({
+        'id': [f"test{i+1}" for i in range(10)],
+        'geometry': points,
+        'power_rated': [22.0, 305.0, 3.8, 50.0, 105.0, 200.0, 150.0, 75.0, 120.0, 60.0],
+        'number_of_sockets': [1, 2, 3, 4, 5, 2, 3, 1, 4, 2],
+        'socket_type_ef': [True, False, False, False, False, True, False, False, True, False],
+        'socket_type_2': [False, True, False, False, False, False, True, False, False, True],
+        'socket_type_combo_ccs': [False, False, True, False, False, False, False, True, False, False],
+        'socket_type_chademo': [False, False, False, True, False, False, False, False, True, False],
+        'socket_type_autre': [False, False, False, False, True, False, False, False, False, True],
+        'id_itinerance': [f"iti{i+1}" for i in range(10)],
+        'charging_station_id': [0, 0, 0, 1, 1, 1, 1, 0, 0, 2],
+        'retrieve_from': ["OSM", "OSM", "DATA_GOUV", "DATA_GOUV", "DATA_GOUV", "OSM", "DATA_GOUV", "OSM", "DATA_GOUV", "OSM"]
+    })
+
+    return charging_stations, sockets
+
+
 def test_export():
     with tempfile.TemporaryDirectory() as tmp_dir_name:
-        charging_stations = pd.DataFrame({
-            'id': [0, 1],
-            'geometry': [Point(-61.72048, 15.999102), Point(-61.605293, 16.20394)]
-        })
-
-        points = [
-            Point(2.3522, 48.8566),  # Notre-Dame de Paris
-            Point(2.3444, 48.8554),  # Sainte-Chapelle
-            Point(2.3442, 48.8550),  # Conciergerie
-            Point(2.3500, 48.8555),  # Pont Saint-Louis
-            Point(2.3600, 48.8420),  # Jardin des Plantes
-            Point(2.2945, 48.8584),  # Tour Eiffel
-            Point(2.3376, 48.8606),  # Louvre
-            Point(2.3614, 48.8660),  # Opéra Garnier
-            Point(2.2699, 48.8848),  # Montmartre
-            Point(2.3300, 48.8738)   # Place de la Concorde
-        ]
-
-        # Création du GeoDataFrame
-        sockets = pd.DataFrame({
-            'id': [f"test{i+1}" for i in range(10)],
-            'geometry': points,
-            'power_rated': [22.0, 305.0, 3.8, 50.0, 105.0, 200.0, 150.0, 75.0, 120.0, 60.0],
-            'number_of_sockets': [1, 2, 3, 4, 5, 2, 3, 1, 4, 2],
-            'socket_type_ef': [True, False, False, False, False, True, False, False, True, False],
-            'socket_type_2': [False, True, False, False, False, False, True, False, False, True],
-            'socket_type_combo_ccs': [False, False, True, False, False, False, False, True, False, False],
-            'socket_type_chademo': [False, False, False, True, False, False, False, False, True, False],
-            'socket_type_autre': [False, False, False, False, True, False, False, False, False, True],
-            'id_itinerance': [f"iti{i+1}" for i in range(10)],
-            'charging_station_id': [0, 0, 0, 1, 1, 1, 1, 0, 0, 2],
-            'retrieve_from': ["OSM", "OSM", "DATA_GOUV", "DATA_GOUV", "DATA_GOUV", "OSM", "DATA_GOUV", "OSM", "DATA_GOUV", "OSM"]
-        })
-
-        exporter = MongoFileExporter(charging_stations, sockets, tmp_dir_name)
+        charging_stations, sockets = build_data()
+
+        exporter = MongoFileExporter(charging_stations, sockets, tmp_dir_name, {"layout": "per_file"})
         exporter.export()
 
-        assert(len(os.listdir(tmp_dir_name))) == 2
\ No newline at end of file
+        assert(len(os.listdir(tmp_dir_name))) == 2
+
+def test_export_ndjson(tmp_path):
+    charging_stations, sockets = build_data()
+
+    MongoFileExporter(charging_stations, sockets, str(tmp_path)).export()
+
+    assert(os.listdir(tmp_path)) == ["charging_stations.ndjson"]
+    with open(tmp_path / "charging_stations.ndjson", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert(len(lines)) == 2
+    assert(" " not in lines[0])
+    documents = [json.loads(line) for line in lines]
+    assert([document["id"] for document in documents]) == [0, 1]
+    assert(len(documents[0]["sockets"])) == 5
+
+
+def test_export_ndjson_gzip_shards(tmp_path):
+    charging_stations, sockets = build_data()
+
+    exporter = MongoFileExporter(charging_stations, sockets, str(tmp_path), output_config={"compression": "gzip", "max_file_size": 1})
+    paths = exporter.export_ndjson()
+
+    assert([os.path.basename(path) for path in paths]) == ["charging_stations_00000.ndjson.gz", "charging_stations_00001.ndjson.gz"]
+    assert(sorted(os.listdir(tmp_path))) == ["charging_stations_00000.ndjson.gz", "charging_stations_00001.ndjson.gz"]
+    for expected_id, path in enumerate(paths):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            assert([json.loads(line)["id"] for line in f]) == [expected_id]
+
+
+def test_export_compression_not_implemented(tmp_path):
+    charging_stations, sockets = build_data()
+
+    with pytest.raises(NotImplementedError):
+        MongoFileExporter(charging_stations, sockets, str(tmp_path), output_config={"compression": "lz4"}).export()
+
+
+def test_export_transform_output(tmp_path):
+    charging_stations, sockets = transform_output()
+
+    MongoFileExporter(charging_stations, sockets, str(tmp_path)).export()
+
+    with open(tmp_path / "charging_stations.ndjson", encoding="utf-8") as f:
+        documents = [json.loads(line) for line in f]
+    assert([document["id"] for document in documents]) == list(charging_stations["id"])
+    assert(sum(len(document["sockets"]) for document in documents)) == len(sockets)
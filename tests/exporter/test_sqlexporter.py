@@ -1,8 +1,17 @@
 from testcontainers.postgres import PostgresContainer
+import csv
+import io
 from src.exporter import SqlExporter
+from src.exporter import sqlexporter
+from src.exporter.sqlexporter import COPY_NULL, compute_delta, create_table_statement, delete_rows, to_copy_csv, upsert_rows
+import numpy as np
 import pandas as pd
+import shapely
 from shapely.geometry import Point
 import sqlalchemy
+import pytest
+from unittest.mock import MagicMock
+from tests.exporter import transform_output
 
 def test_export():
     with PostgresContainer("postgis/postgis:latest", dbname="sql_database_name") as postgis:
@@ -56,4 +65,300 @@ def test_export():
             result = conn.execute(sqlalchemy.text(f"select count(*) from {config['charging_stations_table_name']};"))
             assert(result.scalar()) == 2
             result = conn.execute(sqlalchemy.text(f"select count(*) from {config['sockets_table_name']};"))
-            assert(result.scalar()) == 10
\ No newline at end of file
+            assert(result.scalar()) == 10
+
+def test_compute_delta():
+    previous = pd.DataFrame({
+        'id': [0, 1, 2],
+        'geometry': [Point(1, 1), Point(2, 2), Point(3, 3)],
+        'power_rated': [22.0, None, 3.7]
+    })
+    data = pd.DataFrame({
+        'id': [1, 2, 3],
+        'geometry': [Point(2, 2), Point(3, 4), Point(5, 5)],
+        'power_rated': [None, 3.7, 50.0]
+    })
+
+    upserts, deletes = compute_delta(data, previous)
+
+    assert(list(upserts['id'])) == [2, 3]
+    assert(deletes) == [0]
+
+    upserts, deletes = compute_delta(data, data.copy())
+    assert(len(upserts)) == 0
+    assert(deletes) == []
+
+
+def test_export_delta_sqlite(tmp_path):
+    config = {
+        "connection_url": f"sqlite:///{tmp_path / 'database.sqlite'}",
+        "charging_stations_table_name": "charging_stations",
+        "sockets_table_name": "sockets",
+        "mode": "delta",
+        "batch_size": 2
+    }
+    previous_charging_stations = pd.DataFrame({'id': [0, 1], 'geometry': [Point(1, 1), Point(2, 2)]})
+    previous_sockets = pd.DataFrame({
+        'id': ["test1", "test2", "test3"],
+        'geometry': [Point(1, 1), Point(2, 2), Point(2, 2)],
+        'power_rated': [22.0, 3.7, 50.0],
+        'charging_station_id': [0, 1, 1]
+    })
+    charging_stations = pd.DataFrame({'id': [1, 2], 'geometry': [Point(2, 2), Point(3, 3)]})
+    sockets = pd.DataFrame({
+        'id': ["test2", "test3", "test4"],
+        'geometry': [Point(2, 2), Point(2, 2), Point(3, 3)],
+        'power_rated': [3.7, 150.0, 11.0],
+        'charging_station_id': [1, 1, 2]
+    })
+
+    engine = sqlalchemy.create_engine(config["connection_url"])
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("create table charging_stations (id integer primary key, geometry blob)"))
+        conn.execute(sqlalchemy.text("create table sockets (id varchar primary key, geometry blob, power_rated float, charging_station_id integer)"))
+        upsert_rows(conn, "charging_stations", previous_charging_stations)
+        upsert_rows(conn, "sockets", previous_sockets)
+
+    exporter = SqlExporter(config, charging_stations, sockets, previous_charging_stations, previous_sockets)
+    summary = exporter.export_delta()
+
+    assert(summary) == {
+        "charging_stations": {"upserts": 1, "deletes": 1},
+        "sockets": {"upserts": 2, "deletes": 1}
+    }
+    with engine.begin() as conn:
+        assert(conn.execute(sqlalchemy.text("select id from charging_stations order by id")).scalars().all()) == [1, 2]
+        rows = conn.execute(sqlalchemy.text("select id, power_rated, charging_station_id, geometry from sockets order by id")).all()
+    assert([tuple(row[:3]) for row in rows]) == [("test2", 3.7, 1), ("test3", 150.0, 1), ("test4", 11.0, 2)]
+    assert(shapely.from_wkb(rows[2][3])) == Point(3, 3)
+
+
+def test_export_delta_sqlite_foreign_key(tmp_path):
+    config = {
+        "connection_url": f"sqlite:///{tmp_path / 'database.sqlite'}",
+        "charging_stations_table_name": "charging_stations",
+        "sockets_table_name": "sockets",
+        "mode": "delta"
+    }
+    engine = sqlalchemy.create_engine(config["connection_url"])
+    sqlalchemy.event.listen(engine, "connect", lambda dbapi_connection, _: dbapi_connection.execute("PRAGMA foreign_keys=ON"))
+
+    # The charging station 0 is replaced by the charging station 5, its sockets move to it
+    previous_charging_stations = pd.DataFrame({'id': [0, 1], 'geometry': [Point(1, 1), Point(2, 2)]})
+    previous_sockets = pd.DataFrame({
+        'id': ["test1", "test2", "test3"],
+        'geometry': [Point(1, 1), Point(1, 1), Point(2, 2)],
+        'charging_station_id': [0, 0, 1]
+    })
+    charging_stations = pd.DataFrame({'id': [1, 5], 'geometry': [Point(2, 2), Point(1, 1)]})
+    sockets = pd.DataFrame({
+        'id': ["test1", "test3"],
+        'geometry': [Point(1, 1), Point(2, 2)],
+        'charging_station_id': [5, 1]
+    })
+
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("create table charging_stations (id integer primary key, geometry blob)"))
+        conn.execute(sqlalchemy.text(
+            "create table sockets (id varchar primary key, geometry blob, "
+            "charging_station_id integer references charging_stations(id))"
+        ))
+        upsert_rows(conn, "charging_stations", previous_charging_stations)
+        upsert_rows(conn, "sockets", previous_sockets)
+
+    exporter = SqlExporter(config, charging_stations, sockets, previous_charging_stations, previous_sockets)
+    exporter._engine = engine
+    exporter.export_delta()
+
+    with engine.begin() as conn:
+        assert(conn.execute(sqlalchemy.text("select id from charging_stations order by id")).scalars().all()) == [1, 5]
+        assert(conn.execute(sqlalchemy.text("select id, charging_station_id from sockets order by id")).all()) == [("test1", 5), ("test3", 1)]
+        assert(conn.execute(sqlalchemy.text("pragma foreign_key_check")).all()) == []
+
+
+def test_export_delta_sqlite_without_previous_export(tmp_path):
+    config = {
+        "connection_url": f"sqlite:///{tmp_path / 'database.sqlite'}",
+        "charging_stations_table_name": "charging_stations",
+        "sockets_table_name": "sockets",
+        "mode": "delta",
+        "batch_size": 2
+    }
+    charging_stations, sockets = transform_output()
+
+    # Twice, the second export replaces the tables of the first one
+    SqlExporter(config, charging_stations, sockets).export()
+    SqlExporter(config, charging_stations, sockets).export()
+
+    engine = sqlalchemy.create_engine(config["connection_url"])
+    with engine.begin() as conn:
+        assert(conn.execute(sqlalchemy.text("select id from charging_stations order by id")).scalars().all()) == sorted(charging_stations["id"])
+        rows = conn.execute(sqlalchemy.text("select id, charging_station_id, geometry from sockets order by id")).all()
+    assert([tuple(row[:2]) for row in rows]) == sorted(zip(sockets["id"], sockets["charging_station_id"]))
+    assert(shapely.from_wkb(rows[0][2])) in list(sockets["geometry"])
+    primary_keys = {
+        table_name: sqlalchemy.inspect(engine).get_pk_constraint(table_name)["constrained_columns"]
+        for table_name in ["charging_stations", "sockets"]
+    }
+    assert(primary_keys) == {"charging_stations": ["id"], "sockets": ["id"]}
+
+    # The next delta export upserts on the primary keys
+    moved = sockets.assign(power_rated=1.0)
+    summary = SqlExporter(config, charging_stations, moved, charging_stations, sockets).export_delta()
+    assert(summary["sockets"]) == {"upserts": len(sockets), "deletes": 0}
+
+
+def test_upsert_and_delete_rows_multi_row_statements(tmp_path, monkeypatch):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'database.sqlite'}")
+    statements = []
+    sqlalchemy.event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, parameters, context, executemany: statements.append((statement, executemany)))
+    sockets = pd.DataFrame({
+        'id': [f"test{i}" for i in range(5)],
+        'geometry': [Point(i, i) for i in range(5)],
+        'power_rated': [22.0, None, 3.7, 50.0, 11.0]
+    })
+
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("create table sockets (id varchar primary key, geometry blob, power_rated float)"))
+        statements.clear()
+        upsert_rows(conn, "sockets", sockets, batch_size=2)
+        upsert_rows(conn, "sockets", sockets.assign(power_rated=1.0), batch_size=10)
+        delete_rows(conn, "sockets", ["test0", "test1", "test2"], batch_size=2)
+
+        assert([statement.count("(?, ?, ?)") for statement, _ in statements[:4]]) == [2, 2, 1, 5]
+        assert([statement.count("?") for statement, _ in statements[4:]]) == [2, 1]
+        assert(not any(executemany for _, executemany in statements))
+        assert(conn.execute(sqlalchemy.text("select id, power_rated from sockets order by id")).all()) == [("test3", 1.0), ("test4", 1.0)]
+
+    # The rows of a statement are limited by the number of bound parameters
+    monkeypatch.setattr(sqlexporter, "MAX_PARAMETERS", 7)
+    with engine.begin() as conn:
+        statements.clear()
+        upsert_rows(conn, "sockets", sockets, batch_size=10)
+        assert([statement.count("(?, ?, ?)") for statement, _ in statements]) == [2, 2, 1]
+
+
+def test_to_copy_csv():
+    sockets = pd.DataFrame({
+        'id': ["test1", "test2"],
+        'geometry': [Point(1, 2), Point(3, 4)],
+        'power_rated': [22.0, np.nan],
+        'socket_type_2': [True, False],
+        'id_itinerance': ['iti,"1"', None]
+    })
+
+    lines = to_copy_csv(sockets).splitlines()
+
+    assert(lines[0]) == 'test1,0101000020E6100000000000000000F03F0000000000000040,22.0,True,"iti,""1"""'
+    assert(lines[1]) == "test2,0101000020E610000000000000000008400000000000001040,\\N,False,\\N"
+
+
+def read_copy_csv(content: str) -> list[list]:
+    # Reads the CSV as COPY does with the NULL option of copy_rows: the unquoted marker is NULL, any other field is kept as is
+    return [[None if value == COPY_NULL else value for value in row] for row in csv.reader(io.StringIO(content))]
+
+
+def test_to_copy_csv_empty_strings_parity():
+    sockets = pd.DataFrame({
+        'id': ["test1", "test2", "test3"],
+        'geometry': [Point(1, 2), Point(3, 4), None],
+        'id_itinerance': ["", None, "iti3"],
+        'retrieve_from': ["OSM", "", None]
+    })
+
+    rows = read_copy_csv(to_copy_csv(sockets))
+
+    # The full mode writes the values of the DataFrame, with None for the missing ones
+    expected = sockets[['id', 'id_itinerance', 'retrieve_from']].astype(object)
+    expected = expected.where(expected.notna(), None).values.tolist()
+    assert([[row[0], *row[2:]] for row in rows]) == expected
+    assert(rows[2][1]) is None
+
+
+def test_create_table_statement():
+    sockets = pd.DataFrame({
+        'id': ["test1"],
+        'geometry': [Point(1, 2)],
+        'power_rated': [22.0],
+        'socket_type_2': [True],
+        'charging_station_id': [0]
+    })
+
+    assert(create_table_statement("sockets_staging", sockets)) == (
+        'CREATE TABLE "sockets_staging" ("id" text, "geometry" geometry(Geometry, 4326), '
+        '"power_rated" double precision, "socket_type_2" boolean, "charging_station_id" bigint)'
+    )
+    assert(create_table_statement("sockets", sockets, "sqlite", primary_key="id")) == (
+        'CREATE TABLE "sockets" ("id" text, "geometry" blob, '
+        '"power_rated" double precision, "socket_type_2" boolean, "charging_station_id" bigint, PRIMARY KEY ("id"))'
+    )
+
+
+def test_export_copy():
+    with PostgresContainer("postgis/postgis:latest", dbname="sql_database_name") as postgis:
+        config = {
+            "connection_url": postgis.get_connection_url(),
+            "charging_stations_table_name": "charging_stations",
+            "sockets_table_name": "sockets",
+            "mode": "copy",
+            "batch_size": 1
+        }
+        charging_stations, sockets = transform_output()
+
+        # Exported twice, the second export replaces the first one
+        SqlExporter(config, charging_stations, sockets).export()
+        SqlExporter(config, charging_stations, sockets).export()
+
+        engine = sqlalchemy.create_engine(postgis.get_connection_url())
+        with engine.begin() as conn:
+            assert(conn.execute(sqlalchemy.text("select count(*) from charging_stations;")).scalar()) == 3
+            assert(conn.execute(sqlalchemy.text("select count(*) from sockets where number_of_sockets is null;")).scalar()) == 1
+            assert(conn.execute(sqlalchemy.text("select count(*) from pg_constraint where conname = 'fk_sockets_charging_stations';")).scalar()) == 1
+
+        # Empty strings are kept as in the full mode, missing values are NULL
+        sockets["id_itinerance"] = ["", None, *sockets["id_itinerance"][2:]]
+        SqlExporter(config, charging_stations, sockets).export()
+        SqlExporter({**config, "mode": "full", "sockets_table_name": "sockets_full", "charging_stations_table_name": "charging_stations_full"}, charging_stations, sockets).export()
+        with engine.begin() as conn:
+            for table_name in ["sockets", "sockets_full"]:
+                values = conn.execute(sqlalchemy.text(f"select id_itinerance from {table_name} order by id")).scalars().all()
+                assert(values) == [value if pd.notna(value) else None for value in sockets.sort_values("id")["id_itinerance"]]
+
+
+def build_copy_exporter(charging_stations: pd.DataFrame, sockets: pd.DataFrame) -> tuple[SqlExporter, MagicMock]:
+    config = {
+        "connection_url": "sqlite://",
+        "charging_stations_table_name": "charging_stations",
+        "sockets_table_name": "sockets",
+        "mode": "copy"
+    }
+    exporter = SqlExporter(config, charging_stations, sockets)
+    exporter._engine = MagicMock()
+    cursor = exporter._engine.raw_connection.return_value.cursor.return_value.__enter__.return_value
+
+    return exporter, cursor
+
+
+def test_export_copy_transform_output():
+    charging_stations, sockets = transform_output()
+    exporter, cursor = build_copy_exporter(charging_stations, sockets)
+
+    exporter.export()
+
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert('CREATE INDEX "sockets_charging_station_id_idx" ON "sockets" ("charging_station_id")' in statements)
+    assert(statements[-1]) == 'ALTER TABLE "sockets" ADD CONSTRAINT fk_sockets_charging_stations FOREIGN KEY ("charging_station_id") REFERENCES "charging_stations"(id)'
+    assert('"charging_station_id" bigint' in statements[statements.index('DROP TABLE IF EXISTS "sockets_staging"') + 1])
+    copied = cursor.copy_expert.call_args_list[1].args[1].getvalue().splitlines()
+    assert([line.split(",")[-1] for line in copied]) == [str(value) for value in sockets["charging_station_id"]]
+    exporter._engine.raw_connection.return_value.rollback.assert_not_called()
+
+
+def test_export_copy_without_charging_station_id():
+    charging_stations, sockets = transform_output()
+    exporter, cursor = build_copy_exporter(charging_stations, sockets.drop(columns="charging_station_id"))
+
+    with pytest.raises(KeyError):
+        exporter.export()
+
+    exporter._engine.raw_connection.assert_not_called()
@@ -1,4 +1,5 @@
 from src.exporter import SqlFileExporter
+from tests.exporter import transform_output
 import pandas as pd
 from shapely.geometry import Point
 import tempfile
@@ -57,4 +58,45 @@ def test_render_sockets():
         exporter = SqlFileExporter(None, datasource, tmp_dir_name)
         exporter.export_sockets()
         with open(f"{tmp_dir_name}{os.sep}sockets.sql", 'r') as f:
-            assert(f.read()) == expected
\ No newline at end of file
+            assert(f.read()) == expected
+
+def test_render_sockets_escaping_and_batches():
+    datasource = pd.DataFrame({
+        'id': ["l'aire", "test2", "test3"],
+        'geometry': [Point(2.3522, 48.8566), None, Point(2.3442, 48.8550)],
+        'power_rated': [22.0, None, 3.8],
+        'number_of_sockets': [1, 2, 3],
+        'socket_type_ef': [True, None, False],
+        'socket_type_2': [False, True, False],
+        'socket_type_combo_ccs': [False, False, True],
+        'socket_type_chademo': [False, False, False],
+        'socket_type_autre': [False, False, False],
+        'id_itinerance': ["iti'1", None, "iti3"],
+        'charging_station_id': [0, 0, 1],
+        'retrieve_from': ["OSM", "OSM", "DATA_GOUV"]
+    })
+
+    with tempfile.TemporaryDirectory() as tmp_dir_name:
+        exporter = SqlFileExporter(None, datasource, tmp_dir_name, batch_size=2)
+        exporter.export_sockets()
+        with open(f"{tmp_dir_name}{os.sep}sockets.sql", 'r') as f:
+            content = f.read()
+
+    assert(content.count("INSERT INTO sockets")) == 2
+    assert("('l''aire', '0101000020E6100000A835CD3B4ED1024076E09C11A56D4840', 22.0, 1, TRUE, FALSE, FALSE, FALSE, FALSE, 0, 'iti''1', 'OSM')," in content)
+    assert("('test2', NULL, NULL, 2, NULL, TRUE, FALSE, FALSE, FALSE, 0, NULL, 'OSM');" in content)
+
+
+def test_render_transform_output():
+    charging_stations, sockets = transform_output()
+
+    with tempfile.TemporaryDirectory() as tmp_dir_name:
+        SqlFileExporter(charging_stations, sockets, tmp_dir_name).export()
+        with open(f"{tmp_dir_name}{os.sep}sockets.sql", 'r') as f:
+            content = f.read()
+
+    assert(content.count("INSERT INTO sockets")) == 1
+    for socket_id, charging_station_id in zip(sockets["id"], sockets["charging_station_id"]):
+        assert(f"('{socket_id}', " in content)
+        assert(f", {charging_station_id}, " in content)
+    assert("'iti''3'" in content)
@@ -0,0 +1,69 @@
+import geopandas as gpd
+from shapely.geometry import Point
+
+from src.parser.abstractparser import AbstractParser
+
+
+def test_add_borne():
+    parser = AbstractParser()
+    assert(parser.df) is None
+
+    parser.add_borne({"geometry": Point(1, 1), "power_rated": 22.0, "retrieve_from": "OSM"})
+    parser.add_borne({"geometry": Point(2, 2), "power_rated": 3.8, "retrieve_from": "OSM", "id_itinerance": "iti2"})
+    parser.add_borne({"geometry": Point(3, 3), "retrieve_from": "OSM"})
+
+    assert(len(parser.df)) == 3
+    assert(list(parser.df.columns)) == ["geometry", "power_rated", "retrieve_from", "id_itinerance"]
+    assert(parser.df["id_itinerance"].isna().tolist()) == [True, False, True]
+    assert(parser.df["id_itinerance"][1]) == "iti2"
+    assert(parser.df["power_rated"].isna().tolist()) == [False, False, True]
+
+
+def test_add_borne_by_chunks():
+    parser = AbstractParser()
+    parser.CHUNK_SIZE = 4
+
+    for i in range(10):
+        parser.add_borne({"geometry": Point(i, i), "number_of_sockets": i})
+
+    assert(len(parser._chunks)) == 2
+    assert(list(parser.df["number_of_sockets"])) == list(range(10))
+
+    parser.add_borne({"geometry": Point(10, 10), "number_of_sockets": 10})
+    assert(list(parser.df["number_of_sockets"])) == list(range(11))
+
+
+def test_convert_to_geoDataFrame():
+    parser = AbstractParser()
+    parser.add_borne({"geometry": Point(1, 1), "power_rated": 22.0})
+
+    gdf = parser.convert_to_geoDataFrame()
+    assert(isinstance(gdf, gpd.GeoDataFrame))
+    assert(gdf.crs) == "EPSG:4326"
+    assert(gdf.geometry[0]) == Point(1, 1)
+
+
+def test_convert_to_geoDataFrame_schema():
+    parser = AbstractParser()
+    parser.add_borne({"geometry": Point(1, 1), "power_rated": 22.0, "number_of_sockets": 2, "socket_type_ef": True,
+                      "id_itinerance": "iti1", "retrieve_from": "OSM"})
+    parser.add_borne({"geometry": Point(2, 2), "power_rated": None, "number_of_sockets": 1, "socket_type_ef": None,
+                      "id_itinerance": None, "retrieve_from": "OSM"})
+
+    gdf = parser.convert_to_geoDataFrame()
+    assert(str(gdf["power_rated"].dtype)) == "Float64"
+    assert(str(gdf["number_of_sockets"].dtype)) == "Int32"
+    assert(str(gdf["socket_type_ef"].dtype)) == "boolean"
+    assert(str(gdf["id_itinerance"].dtype)) == "string"
+    assert(str(gdf["retrieve_from"].dtype)) == "category"
+    assert(gdf["socket_type_ef"].isna().tolist()) == [False, True]
+
+
+def test_add_bornes():
+    parser = AbstractParser()
+    parser.add_borne({"geometry": Point(1, 1), "number_of_sockets": 1})
+    parser.add_bornes(gpd.GeoDataFrame({"geometry": [Point(2, 2), Point(3, 3)], "number_of_sockets": [2, 3]}, crs="EPSG:4326"))
+    parser.add_borne({"geometry": Point(4, 4), "number_of_sockets": 4})
+
+    assert(list(parser.df["number_of_sockets"])) == [1, 2, 3, 4]
+    assert(list(parser.convert_to_geoDataFrame().geometry)) == [Point(1, 1), Point(2, 2), Point(3, 3), Point(4, 4)]
@@ -1,4 +1,7 @@
+import csv
 import json
+import os
+import tempfile
 
 from shapely.geometry import Point
 
@@ -35,4 +38,56 @@ def test_transform_line_to_borne():
             'socket_type_autre': False,
             'id_itinerance': 'ESZUNE1111ER1',
             'retrieve_from': 'data_gouv',
-        }
\ No newline at end of file
+        }
+
+def test_parse_csv_file_by_chunks():
+    mapping_dictionnary = {
+            'longitude': 'consolidated_longitude',
+            'latitude': 'consolidated_latitude',
+            'power_rated': 'puissance_nominale',
+            'number_of_sockets': 'nbre_pdc',
+            'socket_type_ef': 'prise_type_ef',
+            'socket_type_2': 'prise_type_2',
+            'socket_type_combo_ccs': 'prise_type_combo_ccs',
+            'socket_type_chademo': 'prise_type_chademo',
+            'socket_type_autre': 'prise_type_autre',
+            'id_pdc_itinerance': 'id_pdc_itinerance',
+            'retrieve_from': 'data_gouv',
+        }
+
+    with open('tests/resources/line_data_gouv.json', 'r') as f:
+        line = json.load(f)
+
+    variations = [
+        {'puissance_nominale': '22,5 kW', 'prise_type_ef': 'TRUE', 'prise_type_2': '1'},
+        {'puissance_nominale': '', 'prise_type_ef': 'false', 'prise_type_2': '0'},
+        {'puissance_nominale': '7.4', 'prise_type_ef': '', 'prise_type_2': 'unknown', 'id_pdc_itinerance': ''},
+        {'consolidated_longitude': '2.35', 'consolidated_latitude': '48.85', 'nbre_pdc': '1'},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir_name:
+        path_file = f"{tmp_dir_name}{os.sep}data_gouv.csv"
+        with open(path_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=line.keys())
+            writer.writeheader()
+            writer.writerow(line)
+            for variation in variations:
+                writer.writerow({**line, **variation})
+
+        line_parser = CsvParser()
+        line_parser.parse_csv_file(path_file, mapping_dictionnary)
+
+        chunk_parser = CsvParser()
+        chunk_parser.parse_csv_file(path_file, mapping_dictionnary, chunk_size=2)
+
+    expected = line_parser.convert_to_geoDataFrame()
+    result = chunk_parser.convert_to_geoDataFrame()
+
+    assert(len(result)) == 5
+    assert(list(result.columns)) == list(expected.columns)
+    assert(list(result.geometry)) == list(expected.geometry)
+    assert(result['power_rated'].tolist()[:2]) == [300.0, 22.5]
+    assert(result['power_rated'].isna().tolist()) == expected['power_rated'].isna().tolist()
+    assert(result['power_rated'].dropna().tolist()) == expected['power_rated'].dropna().tolist()
+    for column in ['number_of_sockets', 'socket_type_ef', 'socket_type_2', 'socket_type_combo_ccs', 'socket_type_chademo', 'socket_type_autre', 'id_itinerance', 'retrieve_from']:
+        assert(result[column].tolist()) == expected[column].tolist()
@@ -1,5 +1,11 @@
+import os
+import tempfile
 from unittest.mock import patch
 
+import geopandas as gpd
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from shapely.geometry import Point
 
@@ -98,4 +104,62 @@ def test_download_datasource_error():
 
         with pytest.raises(DownloadException, match="Error when retrieving URL = https://download.geofabrik.de/europe/france-latest.osm.pbf"):
             osm_parser.download_datasource(config)
-    
\ No newline at end of file
+    
+def test_expand_bornes():
+    osm_parser = OsmParser()
+
+    nodes = [
+        {'amenity': 'charging_station', 'capacity': '3', 'ref:EU:EVSE': 'FR*CN1*PFXETRZ', 'socket:chademo': '2', 'socket:type2': '2', 'socket:type2_combo': '2', 'charging_station:output': '50 kW'},
+        {'amenity': 'charging_station', 'socket:type2_combo': '2', 'socket:type2_combo:output': '22 kW'},
+        {'amenity': 'charging_station', 'socket:type2_combo': 'yes', 'socket:type2_combo:output': 'unknown', 'socket:typee': 'no'},
+        {'amenity': 'charging_station', 'capacity': '2', 'socket:type2': '7400 W', 'socket:type3c': 'many'},
+        {'amenity': 'charging_station', 'capacity': 'two', 'socket:type2_cable': '11 kW', 'socket:typee': '1', 'charging_station:output': 'fast'},
+        {'amenity': 'charging_station'},
+    ]
+    points = [Point(4.29184, 44.53852 + i) for i in range(len(nodes))]
+    data = gpd.GeoDataFrame({'geometry': points, 'tags': nodes}, crs="EPSG:4326")
+
+    expected = [borne for i in range(len(nodes)) for borne in osm_parser.extract_bornes({'geometry': points[i], 'tags': nodes[i]})]
+    result = osm_parser.expand_bornes(data)
+
+    assert(len(result)) == len(expected) == 8
+    for borne, (_, row) in zip(expected, result.iterrows()):
+        for key in ['geometry', 'number_of_sockets', 'retrieve_from', 'socket_type_ef', 'socket_type_2', 'socket_type_combo_ccs', 'socket_type_chademo', 'socket_type_autre']:
+            assert(row[key]) == borne[key]
+        if borne['power_rated'] is None:
+            assert(pd.isna(row['power_rated']))
+        else:
+            assert(row['power_rated']) == borne['power_rated']
+        if 'id_itinerance' in borne:
+            assert(row['id_itinerance']) == borne['id_itinerance']
+        else:
+            assert(pd.isna(row['id_itinerance']))
+
+def test_load_pbf_from_cache():
+    osm_parser = OsmParser()
+
+    table = pa.table({
+        'feature_id': ['node/1', 'node/2'],
+        'tags': pa.array([
+            [('amenity', 'charging_station'), ('capacity', '2'), ('socket:type2', '2'), ('socket:chademo', 'yes')],
+            [('amenity', 'charging_station'), ('socket:type2_combo', '1'), ('socket:type2_combo:output', '150 kW')]
+        ], type=pa.map_(pa.string(), pa.string())),
+        'geometry': [Point(4.29184, 44.53852).wkb, Point(2.3522, 48.8566).wkb]
+    })
+
+    with tempfile.TemporaryDirectory() as tmp_dir_name:
+        path_cache_file = f"{tmp_dir_name}{os.sep}osm_charging_stations.parquet"
+        pq.write_table(table, path_cache_file)
+
+        osm_parser.load_pbf(f"{tmp_dir_name}{os.sep}missing.osm.pbf", path_cache_file)
+
+    assert(len(osm_parser.df)) == 3
+    assert(list(osm_parser.df['number_of_sockets'])) == [2, 1, 1]
+    assert(list(osm_parser.df['geometry'])) == [Point(4.29184, 44.53852), Point(4.29184, 44.53852), Point(2.3522, 48.8566)]
+    assert(osm_parser.df['power_rated'].iloc[2]) == 150.0
+
+def test_load_pbf_not_found():
+    osm_parser = OsmParser()
+
+    with pytest.raises(FileNotFoundError, match="PBF file not found"):
+        osm_parser.load_pbf("missing.osm.pbf", "missing.parquet")
@@ -3,7 +3,7 @@ CREATE TABLE charging_stations (
 	geom public.geometry(point, 4326) NULL
 );
 
+INSERT INTO charging_stations(id, geom) VALUES
+(0, '0101000020E610000007B64AB038DC4EC084BC1E4C8AFF2F40'),
+(1, '0101000020E6100000B6BFB33D7ACD4EC0A3586E6935343040');
 
-INSERT INTO charging_stations(id, geom) VALUES(0, 'POINT (-61.72048 15.999102)');
-
-INSERT INTO charging_stations(id, geom) VALUES(1, 'POINT (-61.605293 16.20394)');
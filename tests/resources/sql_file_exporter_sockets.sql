@@ -8,30 +8,22 @@ CREATE TABLE sockets (
 	socket_type_combo_ccs bool,
 	socket_type_chademo bool,
 	socket_type_autre bool,
-	charging_station_id id NOT NULL,
+	charging_station_id int8 NOT NULL,
 	id_itinerance varchar NULL,
 	retrieve_from varchar NOT NULL
 );
 
 ALTER TABLE sockets ADD CONSTRAINT fk_sockets_charging_stations FOREIGN KEY (charging_station_id) REFERENCES charging_stations(id);
 
+INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES
+('test1', '0101000020E6100000A835CD3B4ED1024076E09C11A56D4840', 22.0, 1, TRUE, FALSE, FALSE, FALSE, FALSE, 0, 'iti1', 'OSM'),
+('test2', '0101000020E61000006FF085C954C10240CC7F48BF7D6D4840', 305.0, 2, FALSE, TRUE, FALSE, FALSE, FALSE, 0, 'iti2', 'OSM'),
+('test3', '0101000020E6100000FE43FAEDEBC002403D0AD7A3706D4840', 3.8, 3, FALSE, FALSE, TRUE, FALSE, FALSE, 0, 'iti3', 'DATA_GOUV'),
+('test4', '0101000020E6100000CDCCCCCCCCCC02402FDD2406816D4840', 50.0, 4, FALSE, FALSE, FALSE, TRUE, FALSE, 1, 'iti4', 'DATA_GOUV'),
+('test5', '0101000020E6100000E17A14AE47E10240B29DEFA7C66B4840', 105.0, 5, FALSE, FALSE, FALSE, FALSE, TRUE, 1, 'iti5', 'DATA_GOUV'),
+('test6', '0101000020E61000004260E5D0225B024076711B0DE06D4840', 200.0, 2, TRUE, FALSE, FALSE, FALSE, FALSE, 1, 'iti6', 'OSM'),
+('test7', '0101000020E61000006C09F9A067B3024003780B24286E4840', 150.0, 3, FALSE, TRUE, FALSE, FALSE, FALSE, 1, 'iti7', 'DATA_GOUV'),
+('test8', '0101000020E6100000F931E6AE25E40240022B8716D96E4840', 75.0, 1, FALSE, FALSE, TRUE, FALSE, FALSE, 0, 'iti8', 'OSM'),
+('test9', '0101000020E6100000F085C954C12802401AC05B2041714840', 120.0, 4, TRUE, FALSE, FALSE, TRUE, FALSE, 0, 'iti9', 'DATA_GOUV'),
+('test10', '0101000020E6100000A4703D0AD7A30240569FABADD86F4840', 60.0, 2, FALSE, TRUE, FALSE, FALSE, TRUE, 1, 'iti10', 'OSM');
 
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test1', 'POINT (2.3522 48.8566)', 22.0, 1, True, False, False, False, False, 0, 'iti1', 'OSM');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test2', 'POINT (2.3444 48.8554)', 305.0, 2, False, True, False, False, False, 0, 'iti2', 'OSM');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test3', 'POINT (2.3442 48.855)', 3.8, 3, False, False, True, False, False, 0, 'iti3', 'DATA_GOUV');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test4', 'POINT (2.35 48.8555)', 50.0, 4, False, False, False, True, False, 1, 'iti4', 'DATA_GOUV');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test5', 'POINT (2.36 48.842)', 105.0, 5, False, False, False, False, True, 1, 'iti5', 'DATA_GOUV');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test6', 'POINT (2.2945 48.8584)', 200.0, 2, True, False, False, False, False, 1, 'iti6', 'OSM');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test7', 'POINT (2.3376 48.8606)', 150.0, 3, False, True, False, False, False, 1, 'iti7', 'DATA_GOUV');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test8', 'POINT (2.3614 48.866)', 75.0, 1, False, False, True, False, False, 0, 'iti8', 'OSM');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test9', 'POINT (2.2699 48.8848)', 120.0, 4, True, False, False, True, False, 0, 'iti9', 'DATA_GOUV');
-
-INSERT INTO sockets(id, geom, power_rated, number_of_sockets, socket_type_ef, socket_type_2, socket_type_combo_ccs, socket_type_chademo, socket_type_autre, charging_station_id, id_itinerance, retrieve_from) VALUES('test10', 'POINT (2.33 48.8738)', 60.0, 2, False, True, False, False, True, 1, 'iti10', 'OSM');
@@ -0,0 +1,141 @@
+import os
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point
+
+from src import cache as cache_module
+from src import utils
+from src.cache import StageCache
+
+
+def test_digest(tmp_path, monkeypatch):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}")
+    path_file = tmp_path / "input.txt"
+    path_file.write_text("charging stations")
+
+    digest = cache.digest(str(path_file))
+    assert(len(digest)) == 128
+
+    # An unchanged file is not read again
+    def fail(path_file):
+        raise AssertionError(path_file)
+    monkeypatch.setattr(utils, "hash_file", fail)
+    assert(cache.digest(str(path_file))) == digest
+
+    # The records are reloaded by a new instance
+    assert(StageCache(f"{tmp_path}{os.sep}cache{os.sep}").digest(str(path_file))) == digest
+
+    # Unless the verification is forced
+    with pytest.raises(AssertionError):
+        StageCache(f"{tmp_path}{os.sep}cache{os.sep}", verify=True).digest(str(path_file))
+
+
+def test_digest_changed_file(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}")
+    path_file = tmp_path / "input.txt"
+    path_file.write_text("charging stations")
+    digest = cache.digest(str(path_file))
+
+    path_file.write_text("charging stations and sockets")
+    assert(cache.digest(str(path_file))) != digest
+
+
+def test_digest_file_not_found(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}")
+
+    with pytest.raises(FileNotFoundError):
+        cache.digest(str(tmp_path / "missing.txt"))
+
+
+def test_key(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}", "fingerprint")
+
+    assert(cache.key("merged", "a", "b")) == cache.key("merged", "a", "b")
+    assert(cache.key("merged", "a", "b")) != cache.key("merged", "a", "c")
+    assert(cache.key("merged", "a", "b")) != cache.key("combined", "a", "b")
+    assert(cache.key("merged", "a", "b")) != StageCache(f"{tmp_path}{os.sep}cache{os.sep}", "other").key("merged", "a", "b")
+
+
+def test_store_and_load(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}")
+    data = gpd.GeoDataFrame({"power_rated": [22.0, 3.7], "geometry": [Point(1, 1), Point(2, 2)]}, crs="EPSG:4326")
+
+    assert(cache.load("osm", "key")) is None
+    cache.store("osm", "key", data)
+
+    loaded = cache.load("osm", "key")
+    assert(list(loaded["power_rated"])) == [22.0, 3.7]
+    assert(list(loaded.geometry)) == [Point(1, 1), Point(2, 2)]
+
+
+def test_store_directory(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}")
+
+    def writer(path_directory: str):
+        with open(f"{path_directory}output.txt", "w") as f:
+            f.write("merged")
+
+    assert(cache.load_directory("merged", "key")) is None
+    cache.store_directory("merged", "key", writer)
+
+    path_directory = cache.load_directory("merged", "key")
+    with open(f"{path_directory}output.txt", "r") as f:
+        assert(f.read()) == "merged"
+    assert(not os.path.exists(f"{cache.path('merged', 'key')}.tmp"))
+
+
+def test_store_retention(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}", retention=2)
+    data = gpd.GeoDataFrame({"power_rated": [22.0], "geometry": [Point(1, 1)]}, crs="EPSG:4326")
+    keys = [cache.key("osm", str(i)) for i in range(3)]
+    # An output of another stage whose name starts with the name of the stage
+    path_nodes = f"{cache.path('osm_nodes', 'a' * 128)}.parquet"
+    data.to_parquet(path_nodes)
+
+    for age, key in zip([300, 200], keys[:2]):
+        cache.store("osm", key, data)
+        os.utime(f"{cache.path('osm', key)}.parquet", times=(os.path.getmtime(path_nodes) - age,) * 2)
+
+    # The oldest output is used again, so the second one is removed by the third one
+    assert(cache.load("osm", keys[0])) is not None
+    cache.store("osm", keys[2], data)
+
+    assert(cache.load("osm", keys[0])) is not None
+    assert(cache.load("osm", keys[1])) is None
+    assert(cache.load("osm", keys[2])) is not None
+    assert(os.path.exists(path_nodes))
+
+
+def test_store_directory_retention(tmp_path):
+    cache = StageCache(f"{tmp_path}{os.sep}cache{os.sep}", retention=1)
+    keys = [cache.key("merged", str(i)) for i in range(2)]
+
+    cache.store_directory("merged", keys[0], lambda path_directory: None)
+    os.utime(cache.path("merged", keys[0]), times=(0, 0))
+    cache.store_directory("merged", keys[1], lambda path_directory: None)
+
+    assert(cache.load_directory("merged", keys[0])) is None
+    assert(cache.load_directory("merged", keys[1])) is not None
+
+
+def test_records_retention(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "MAX_RECORDS", 2)
+    path_cache = f"{tmp_path}{os.sep}cache{os.sep}"
+    cache = StageCache(path_cache)
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"input{i}.txt")
+        paths[-1].write_text(f"charging stations {i}")
+
+    cache.digest(str(paths[0]))
+    cache.digest(str(paths[1]))
+    # Used again, the first record is more recent than the second one
+    cache.digest(str(paths[0]))
+    cache.digest(str(paths[2]))
+
+    assert(list(StageCache(path_cache)._records)) == [str(paths[0]), str(paths[2])]
+
+    # The records of the removed files are dropped
+    os.remove(paths[2])
+    assert(list(StageCache(path_cache)._records)) == [str(paths[0])]
@@ -0,0 +1,68 @@
+import os
+import threading
+
+import pytest
+
+from src import chargingstationmergetool
+from src.chargingstationmergetool import ChargingStationMergeTools
+
+PATH_CONFIG_FILE = os.path.abspath("tests/resources/correct_config_datasource_already_exists.json")
+
+
+def build_tool(tmp_path, monkeypatch, parallel: bool) -> ChargingStationMergeTools:
+    # The results and the cache are written in the temporary directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(chargingstationmergetool, "extract_path_last_execution", lambda: None)
+    monkeypatch.setattr(chargingstationmergetool, "write_path_last_execution", lambda path: None)
+
+    tool = ChargingStationMergeTools(PATH_CONFIG_FILE)
+    tool._config.parallel = parallel
+    tool._export_timings = lambda: None
+
+    return tool
+
+
+def run_sources(tool: ChargingStationMergeTools, osm_done: threading.Event = None) -> list:
+    joined = []
+
+    def process_osm():
+        # In parallel, the OSM source finishes after the Data Gouv source
+        if osm_done is not None:
+            osm_done.wait(5)
+        tool.osm_parser_geo_data_frame = "osm"
+
+    def process_data_gouv():
+        tool.data_gouv_geo_data_frame = "data_gouv"
+        if osm_done is not None:
+            osm_done.set()
+
+    tool.process_osm = process_osm
+    tool.process_data_gouv = process_data_gouv
+    tool.process_transform = lambda: joined.append((tool.osm_parser_geo_data_frame, tool.data_gouv_geo_data_frame))
+    tool.process()
+
+    return joined
+
+
+def test_process_sources_in_parallel(tmp_path, monkeypatch):
+    sequential = run_sources(build_tool(tmp_path, monkeypatch, False))
+    parallel = run_sources(build_tool(tmp_path, monkeypatch, True), threading.Event())
+
+    assert(sequential) == [("osm", "data_gouv")]
+    assert(parallel) == sequential
+
+
+def test_process_sources_in_parallel_error(tmp_path, monkeypatch):
+    tool = build_tool(tmp_path, monkeypatch, True)
+    transformed = []
+
+    def process_osm():
+        raise ValueError("PBF file not parsed")
+
+    tool.process_osm = process_osm
+    tool.process_data_gouv = lambda: None
+    tool.process_transform = lambda: transformed.append(True)
+
+    with pytest.raises(ValueError, match="PBF file not parsed"):
+        tool.process()
+    assert(transformed) == []
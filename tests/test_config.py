@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from src.config import Config
@@ -20,6 +22,10 @@ def test_correct_config_file():
     }
 
     assert(config.distance) == 1500
+    assert(config.parallel)
+    assert(config.workers) == 1
+    assert(config.grouping_mode) == "greedy"
+    assert(not config.incremental)
     assert(config.export_directory_name) is not None
     assert(config.osm_config["need_to_download"])
     assert(config.data_gouv_config["need_to_download"])
@@ -30,6 +36,10 @@ def test_correct_config_file_files_already_exists():
     config = Config("tests/resources/correct_config_datasource_already_exists.json")
 
     assert(config.distance) == 1500
+    assert(not config.parallel)
+    assert(config.workers) == 4
+    assert(config.grouping_mode) == "connected_components"
+    assert(config.incremental)
     assert(config.export_directory_name) is not None
     assert(not config.osm_config["need_to_download"])
     assert(config.osm_config["path_file"]) == "test.pbf"
@@ -46,4 +56,55 @@ def test_file_not_found():
 
 def test_key_missing():
     with pytest.raises(ConfigParsingException, match="distance key not in common block"):
-        Config("tests/resources/incorrect_config2.json")
\ No newline at end of file
+        Config("tests/resources/incorrect_config2.json")
+def test_data_gouv_chunk_size():
+    config = Config("tests/resources/correct_config_need_to_download.json")
+    assert(config.data_gouv_config["chunk_size"]) == 50000
+
+    config = Config("tests/resources/correct_config_datasource_already_exists.json")
+    assert(config.data_gouv_config["chunk_size"]) == 10000
+
+def test_osm_use_osmosis():
+    config = Config("tests/resources/correct_config_need_to_download.json")
+    assert(not config.osm_config["use_osmosis"])
+
+def test_grouping_mode_not_implemented(tmp_path):
+    with open("tests/resources/correct_config_datasource_already_exists.json", "r") as f:
+        config_data = json.load(f)
+    config_data["common"]["grouping_mode"] = "dbscan"
+    with open(tmp_path / "config.json", "w") as f:
+        json.dump(config_data, f)
+
+    with pytest.raises(ConfigParsingException, match="grouping_mode must be one of greedy, connected_components"):
+        Config(str(tmp_path / "config.json"))
+
+def test_fingerprint():
+    config = Config("tests/resources/correct_config_datasource_already_exists.json")
+    other_config = Config("tests/resources/correct_config_need_to_download.json")
+
+    assert(config.fingerprint()) == Config("tests/resources/correct_config_datasource_already_exists.json").fingerprint()
+    assert(config.fingerprint()) != other_config.fingerprint()
+
+def test_mongo_files_block():
+    config = Config("tests/resources/correct_config_need_to_download.json")
+    assert(config.mongo_files_config) == {"layout": "ndjson"}
+
+def test_output_block(tmp_path):
+    config = Config("tests/resources/correct_config_need_to_download.json")
+    assert(config.output_config) == {"compression": None, "max_file_size": None, "parquet_compression": "snappy", "parquet_row_group_size": None}
+
+    with open("tests/resources/correct_config_datasource_already_exists.json", "r") as f:
+        config_data = json.load(f)
+    config_data["output"] = {"compression": "zstd", "max_file_size_mb": 2, "parquet_compression": "zstd", "parquet_row_group_size": 10000}
+    with open(tmp_path / "config.json", "w") as f:
+        json.dump(config_data, f)
+
+    config = Config(str(tmp_path / "config.json"))
+    assert(config.output_config) == {"compression": "zstd", "max_file_size": 2 * 1024 * 1024, "parquet_compression": "zstd", "parquet_row_group_size": 10000}
+
+    config_data["output"] = {"compression": "bzip2"}
+    with open(tmp_path / "config.json", "w") as f:
+        json.dump(config_data, f)
+
+    with pytest.raises(ConfigParsingException, match="compression must be one of gzip, zstd"):
+        Config(str(tmp_path / "config.json"))
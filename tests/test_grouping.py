@@ -0,0 +1,190 @@
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point
+
+from src.grouping import (
+    connected_components_grouping,
+    connected_components_labels,
+    greedy_grouping,
+    neighbour_pairs,
+    partitioned_greedy_grouping,
+    project_coordinates,
+    project_xy,
+    split_tiles,
+)
+
+
+def reference_group_neighbouring(datasource: gpd.GeoDataFrame, distance_to_merge: int) -> dict:
+    # Brute force implementation used before the spatial index
+    gdf = gpd.GeoDataFrame({'geometry': datasource['geometry'].to_list()}, crs='EPSG:4326').to_crs('EPSG:5234')
+
+    index = gdf.index.to_numpy()
+    index_already_merged = set()
+    merge_dict = {}
+
+    for index1 in range(len(index)):
+        if index1 not in index_already_merged:
+            index_already_merged.add(index1)
+            merge_dict[index1] = list()
+            distances = gdf.distance(gdf.geometry[index1])
+            mask = (distances < distance_to_merge) & (index != index1) & (~np.isin(index, list(index_already_merged)))
+            merge_dict[index1].extend(index[mask].tolist())
+            index_already_merged.update(index[mask])
+
+    return merge_dict
+
+
+def random_datasource(size: int, seed: int) -> gpd.GeoDataFrame:
+    rng = np.random.default_rng(seed)
+    longitudes = rng.uniform(2.20, 2.45, size)
+    latitudes = rng.uniform(48.80, 48.90, size)
+
+    return gpd.GeoDataFrame({'geometry': gpd.points_from_xy(longitudes, latitudes)}, crs="EPSG:4326")
+
+
+def test_project_coordinates():
+    x, y = project_coordinates(gpd.GeoSeries([Point(2.3522, 48.8566), Point(2.2945, 48.8584)], crs="EPSG:4326"))
+
+    expected = gpd.GeoSeries([Point(2.3522, 48.8566), Point(2.2945, 48.8584)], crs="EPSG:4326").to_crs("EPSG:5234")
+    assert(list(x)) == list(expected.x)
+    assert(list(y)) == list(expected.y)
+
+
+def test_greedy_grouping_parity():
+    for seed, size, distance in [(0, 300, 1500), (1, 500, 800), (2, 200, 3000)]:
+        datasource = random_datasource(size, seed)
+        x, y = project_coordinates(datasource['geometry'])
+
+        assert(greedy_grouping(x, y, distance)) == reference_group_neighbouring(datasource, distance)
+
+
+def test_greedy_grouping_duplicated_points():
+    datasource = gpd.GeoDataFrame({'geometry': [Point(2.35, 48.85)] * 3 + [Point(2.45, 48.85)]}, crs="EPSG:4326")
+    x, y = project_coordinates(datasource['geometry'])
+
+    assert(greedy_grouping(x, y, 1500)) == {0: [1, 2], 3: []}
+
+
+def test_greedy_grouping_distance_is_exclusive():
+    x = np.array([0.0, 1500.0, 1499.0])
+    y = np.array([0.0, 0.0, 0.0])
+
+    assert(greedy_grouping(x, y, 1500)) == {0: [2], 1: []}
+
+
+def test_partitioned_greedy_grouping_parity():
+    for seed, size, distance in [(3, 400, 1500), (4, 600, 500)]:
+        datasource = random_datasource(size, seed)
+        x, y = project_coordinates(datasource['geometry'])
+        expected = greedy_grouping(x, y, distance)
+
+        # Small tiles, so many groups cross the tile borders
+        assert(partitioned_greedy_grouping(x, y, distance, 1, tile_size=2 * distance)) == expected
+        assert(partitioned_greedy_grouping(x, y, distance, 2, tile_size=2 * distance)) == expected
+        assert(partitioned_greedy_grouping(x, y, distance, 2)) == expected
+
+
+def test_neighbour_pairs():
+    x = np.array([0.0, 1500.0, 1499.0, 5000.0, 0.0])
+    y = np.array([0.0, 0.0, 0.0, 0.0, 0.0])
+
+    first, second = neighbour_pairs(x, y, 1500, 1, tile_size=1000)
+    assert(list(zip(first.tolist(), second.tolist()))) == [(0, 2), (0, 4), (1, 2), (2, 4)]
+
+    first, second = neighbour_pairs(np.empty(0), np.empty(0), 1500, 1)
+    assert(len(first)) == 0
+
+
+def clustered_points(size: int, outliers: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    # A dense cluster, like metropolitan France, and a few points thousands of kilometres away, like the overseas departments
+    rng = np.random.default_rng(seed)
+    x = np.concatenate([rng.normal(0, 200000, size), rng.uniform(7000000, 7100000, outliers)])
+    y = np.concatenate([rng.normal(0, 200000, size), rng.uniform(-3000000, -2900000, outliers)])
+
+    return x, y
+
+
+def test_split_tiles_balanced():
+    x, y = clustered_points(100000, 200, 5)
+
+    labels, bounds = split_tiles(x, y, 1500, 4)
+    counts = np.bincount(labels)
+
+    assert(len(bounds)) == 16
+    assert(counts.max()) < 1.2 * len(x) / len(bounds)
+    for tile, (min_x, min_y, max_x, max_y) in enumerate(bounds):
+        inside = labels == tile
+        assert(np.all((x[inside] >= min_x) & (x[inside] < max_x) & (y[inside] >= min_y) & (y[inside] < max_y)))
+
+
+def test_split_tiles_close_cuts_dropped():
+    x = np.array([0.0, 1.0, 2.0, 3.0, 100000.0])
+    y = np.zeros(5)
+
+    labels, bounds = split_tiles(x, y, 1500, 4)
+
+    assert(len(bounds)) == 1
+    assert(labels.tolist()) == [0, 0, 0, 0, 0]
+
+
+def test_neighbour_pairs_balanced_tiles_parity():
+    x, y = clustered_points(20000, 50, 6)
+
+    # A single tile holding every point
+    expected = neighbour_pairs(x, y, 1500, 1, tile_size=1e9)
+    first, second = neighbour_pairs(x, y, 1500, 1)
+
+    assert(len(expected[0])) > 0
+    assert(first.tolist()) == expected[0].tolist()
+    assert(second.tolist()) == expected[1].tolist()
+
+
+def test_connected_components_grouping_chain():
+    x = np.array([0.0, 1000.0, 2000.0, 5000.0, 3000.0])
+    y = np.array([0.0, 0.0, 0.0, 0.0, 0.0])
+
+    # The greedy grouping splits the chain, the connected components do not
+    assert(greedy_grouping(x, y, 1500)) == {0: [1], 2: [4], 3: []}
+    assert(connected_components_grouping(x, y, 1500)) == {0: [1, 2, 4], 3: []}
+
+
+def test_connected_components_grouping_order_independent():
+    datasource = random_datasource(500, 5)
+    x, y = project_coordinates(datasource['geometry'])
+    permutation = np.random.default_rng(5).permutation(len(x))
+
+    components = {frozenset([seed, *merged]) for seed, merged in connected_components_grouping(x, y, 1000).items()}
+    permuted_components = {
+        frozenset(permutation[[seed, *merged]].tolist())
+        for seed, merged in connected_components_grouping(x[permutation], y[permutation], 1000, 2).items()
+    }
+
+    assert(permuted_components) == components
+
+
+def test_connected_components_labels():
+    first = np.array([5, 3, 1, 6])
+    second = np.array([4, 4, 2, 3])
+
+    assert(connected_components_labels(8, first, second).tolist()) == [0, 1, 1, 3, 3, 3, 3, 7]
+
+
+def test_project_coordinates_transformer():
+    geometries = gpd.GeoSeries([Point(2.3522, 48.8566), Point(-61.72048, 15.999102), None], crs="EPSG:4326")
+
+    x, y = project_coordinates(geometries)
+    expected = geometries[:2].to_crs("EPSG:5234")
+
+    assert(x.dtype) == np.float64
+    assert(x.flags.c_contiguous and y.flags.c_contiguous)
+    np.testing.assert_allclose(x[:2], expected.x.to_numpy())
+    np.testing.assert_allclose(y[:2], expected.y.to_numpy())
+    assert(np.isnan(x[2]) and np.isnan(y[2]))
+
+
+def test_project_xy():
+    x, y = project_xy(np.array([2.3522, -61.72048]), np.array([48.8566, 15.999102]))
+    expected_x, expected_y = project_coordinates(gpd.GeoSeries([Point(2.3522, 48.8566), Point(-61.72048, 15.999102)]))
+
+    np.testing.assert_array_equal(x, expected_x)
+    np.testing.assert_array_equal(y, expected_y)
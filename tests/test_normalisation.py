@@ -0,0 +1,62 @@
+import math
+
+import pandas as pd
+
+from src import normalisation
+from src.utils import extract_power_rated, is_int_data, is_power_rated_data
+
+
+def test_extract_power_rated():
+    values = pd.Series(["22 KW", "22KW", "3.6 kw", "3,6 kw", "kw", "", "7400 W", "7400W", "1.5 MW", "50", None, "22 kW;50 kW"], index=range(10, 22))
+
+    result = normalisation.extract_power_rated(values)
+
+    assert(list(result.index)) == list(range(10, 22))
+    assert(result.tolist()[:4]) == [22.0, 22.0, 3.6, 3.6]
+    assert(result.isna().tolist()) == [False, False, False, False, True, True, False, False, False, False, True, False]
+    assert(result.tolist()[6:10]) == [7.4, 7.4, 1500.0, 50.0]
+    assert(result.tolist()[11]) == 22.0
+
+
+def test_extract_power_rated_same_as_scalar():
+    values = ["22 KW", "3,6 kw", "kw", "", "7400 W", "1.5 MW", "50", "2x22kW", "11 kVA"]
+
+    result = normalisation.extract_power_rated(pd.Series(values))
+
+    for value, extracted in zip(values, result):
+        expected = extract_power_rated(value)
+        if expected is None:
+            assert(math.isnan(extracted))
+        else:
+            assert(extracted) == expected
+
+
+def test_is_power_rated_data():
+    values = ["22 KW", "22KW", "3.6 kw", "3,6 kw", "kw", "", "yes", "2", "1.5 MW", "1,5mw", "7400 W", "MW"]
+
+    result = normalisation.is_power_rated_data(pd.Series(values))
+
+    assert(result.tolist()) == [True, True, True, True, False, False, False, False, True, True, True, False]
+    assert(result.tolist()) == [is_power_rated_data(value) for value in values]
+
+
+def test_is_int_data():
+    values = ["22", "test", "2 kW", "", "yes"]
+
+    result = normalisation.is_int_data(pd.Series(values + [None]))
+
+    assert(result.tolist()) == [True, False, False, False, False, False]
+    assert(result.tolist()[:-1]) == [is_int_data(value) for value in values]
+
+
+def test_parse_bool():
+    result = normalisation.parse_bool(pd.Series(["TRUE", "true", "1", "FALSE", "False", "0", "", "yes", None]))
+
+    assert(result.tolist()) == [True, True, True, False, False, False, None, None, None]
+
+
+def test_parse_int():
+    result = normalisation.parse_int(pd.Series(["3", " 12 ", "3.5", "", "yes", None]))
+
+    assert(str(result.dtype)) == "Int64"
+    assert(result.tolist()) == [3, 12, pd.NA, pd.NA, pd.NA, pd.NA]
@@ -0,0 +1,59 @@
+import gzip
+import os
+
+import geopandas as gpd
+import pyarrow.parquet as pq
+import pytest
+from shapely.geometry import Point
+
+from src.output import ShardedWriter, write_parquet
+
+
+def test_sharded_writer_single_file(tmp_path):
+    with ShardedWriter(str(tmp_path / "sockets"), ".sql") as writer:
+        writer.write("a;\n")
+        writer.write("b;\n")
+
+    assert(writer.paths) == [str(tmp_path / "sockets.sql")]
+    assert(os.listdir(tmp_path)) == ["sockets.sql"]
+    with open(tmp_path / "sockets.sql") as f:
+        assert(f.read()) == "a;\nb;\n"
+
+
+def test_sharded_writer_shards(tmp_path):
+    with ShardedWriter(str(tmp_path / "sockets"), ".sql", "gzip", max_file_size=4) as writer:
+        writer.write("ab;\n")
+        writer.write("c;\n")
+        writer.write("d;\n")
+
+    assert([os.path.basename(path) for path in writer.paths]) == ["sockets_00000.sql.gz", "sockets_00001.sql.gz"]
+    with gzip.open(writer.paths[0], "rt") as f:
+        assert(f.read()) == "ab;\n"
+    with gzip.open(writer.paths[1], "rt") as f:
+        assert(f.read()) == "c;\nd;\n"
+
+
+def test_sharded_writer_discards_on_error(tmp_path):
+    with pytest.raises(ValueError):
+        with ShardedWriter(str(tmp_path / "sockets"), ".sql") as writer:
+            writer.write("a;\n")
+            raise ValueError()
+
+    assert(os.listdir(tmp_path)) == []
+
+
+def test_sharded_writer_compression_not_implemented(tmp_path):
+    with pytest.raises(NotImplementedError):
+        ShardedWriter(str(tmp_path / "sockets"), ".sql", "lz4")
+
+
+def test_write_parquet(tmp_path):
+    data = gpd.GeoDataFrame({"id": list(range(10))}, geometry=[Point(i, i) for i in range(10)], crs="EPSG:4326")
+
+    write_parquet(data, str(tmp_path / "data.parquet"), "zstd", row_group_size=4)
+
+    metadata = pq.ParquetFile(tmp_path / "data.parquet").metadata
+    assert(metadata.num_row_groups) == 3
+    assert(metadata.row_group(0).column(0).compression) == "ZSTD"
+    assert(os.listdir(tmp_path)) == ["data.parquet"]
+    assert(gpd.read_parquet(tmp_path / "data.parquet").equals(data))
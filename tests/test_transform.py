@@ -1,9 +1,12 @@
 import uuid
+import warnings
 
 import geopandas as gpd
 import pandas as pd
+import pytest
 from shapely.geometry import Point
 
+from src.grouping import project_coordinates
 from src.transform import Transform
 
 
@@ -38,7 +41,7 @@ def test_append_socket_to_sockets_dataframe():
             "socket_type_combo_ccs": False,
             "socket_type_chademo": False,
             "socket_type_autre": False,
-            "charging_station_index": 1
+            "charging_station_id": 1
         }
 
     socket2 = {
@@ -50,7 +53,7 @@ def test_append_socket_to_sockets_dataframe():
             "socket_type_combo_ccs": False,
             "socket_type_chademo": False,
             "socket_type_autre": False,
-            "charging_station_index": 1
+            "charging_station_id": 1
         }
 
     socket_duplicate = {
@@ -62,7 +65,7 @@ def test_append_socket_to_sockets_dataframe():
             "socket_type_combo_ccs": False,
             "socket_type_chademo": False,
             "socket_type_autre": False,
-            "charging_station_index": 1
+            "charging_station_id": 1
         }
 
     assert(transform.get_sockets()) is None
@@ -139,7 +142,7 @@ def test_transform_to_socket():
     assert(not socket_formatted["socket_type_autre"])
     assert(socket_formatted["id_itinerance"]) == 125
     assert(socket_formatted["retrieve_from"]) == "OSM"
-    assert(socket_formatted["charging_station_index"]) == 1
+    assert(socket_formatted["charging_station_id"]) == 1
 
 def test_transform_data():
     transform = Transform()
@@ -168,8 +171,16 @@ def test_transform_data():
     assert(len(transform.get_charging_stations())) == 3
     assert(len(transform.get_sockets())) == 5
 
-    assert(list(transform.get_charging_stations()['id'])) ==  [0, 3, 4]
-    assert(list(transform.get_sockets()['charging_station_index'])) ==  [0, 0, 0, 3, 4]
+    station_ids = list(transform.get_charging_stations()['id'])
+    assert(len(set(station_ids))) == 3
+    assert(list(transform.get_sockets()['charging_station_id'])) == [station_ids[0]] * 3 + station_ids[1:]
+
+    # The identifiers only depend on the content of the rows
+    other_transform = Transform()
+    other_transform.transform_data(datasource.iloc[[3, 4, 0, 1, 2]], {0: [], 1: [], 2: [3, 4]})
+    assert(list(other_transform.get_charging_stations()['id'])) == [station_ids[1], station_ids[2], station_ids[0]]
+    assert(set(other_transform.get_sockets()['id'])) == set(transform.get_sockets()['id'])
+    assert(all(uuid.UUID(socket_id).version == 5 for socket_id in transform.get_sockets()['id']))
 
 def test_group_neighbouring():
     transform = Transform()
@@ -212,4 +223,143 @@ def test_group_neighbouring():
         9: [],
     }
 
-    assert(merge_dict) == merge_dict_expected
\ No newline at end of file
+    assert(merge_dict) == merge_dict_expected
+
+def test_group_neighbouring_modes():
+    transform = Transform()
+    gdf = gpd.GeoDataFrame({
+        'geometry': [
+            Point(2.3522, 48.8566),  # Notre-Dame de Paris
+            Point(2.3444, 48.8554),  # Sainte-Chapelle
+            Point(2.3442, 48.8550),  # Conciergerie
+            Point(2.3500, 48.8555),  # Pont Saint-Louis
+            Point(2.3600, 48.8420),  # Jardin des Plantes
+            Point(2.3376, 48.8606)   # Louvre, close to the Conciergerie only
+        ]
+    }, crs="EPSG:4326")
+
+    assert(transform.group_neighbouring(gdf, 1500)) == {0: [1, 2, 3], 4: [], 5: []}
+    assert(transform.group_neighbouring(gdf, 1500, workers=2)) == {0: [1, 2, 3], 4: [], 5: []}
+    assert(transform.group_neighbouring(gdf, 1500, mode="connected_components")) == {0: [1, 2, 3, 5], 4: []}
+
+    with pytest.raises(NotImplementedError):
+        transform.group_neighbouring(gdf, 1500, mode="dbscan")
+
+def test_group_neighbouring_projected_coordinates():
+    transform = Transform()
+    gdf = gpd.GeoDataFrame({
+        'geometry': [Point(2.3522, 48.8566), Point(2.3444, 48.8554), Point(2.3600, 48.8420)]
+    }, crs="EPSG:4326")
+    x, y = project_coordinates(gdf['geometry'])
+
+    # The coordinates given are used instead of the geometries
+    assert(transform.group_neighbouring(gdf, 1500, coordinates=(x, y))) == {0: [1], 2: []}
+    assert(transform.group_neighbouring(gdf, 1500, coordinates=(x[[2, 1, 0]], y[[2, 1, 0]]))) == {0: [], 1: [2]}
+
+def test_transform_data_deduplicate_sockets():
+    transform = Transform()
+
+    datasource = gpd.GeoDataFrame({
+        'geometry': [Point(1, 1), Point(2, 2), Point(3, 3), Point(4, 4), Point(5, 5)],
+        'power_rated': [22.0, 22.0, None, None, 22.0],
+        'number_of_sockets': [1, 2, 3, 4, 5],
+        'socket_type_ef': [False, False, False, False, False],
+        'socket_type_2': [True, True, True, True, True],
+        'socket_type_combo_ccs': [False, False, False, False, False],
+        'socket_type_chademo': [False, False, False, False, False],
+        'socket_type_autre': [False, False, False, False, False],
+        'id_itinerance': ["iti1", "iti2", "iti3", "iti4", "iti5"],
+        'retrieve_from': ["OSM", "DATA_GOUV", "OSM", "DATA_GOUV", "OSM"]
+    }, crs="EPSG:4326")
+
+    transform.transform_data(datasource, {0: [1, 2, 3], 4: []})
+
+    # Row-by-row reference
+    reference = Transform()
+    for charging_station_index, neighbours in {0: [1, 2, 3], 4: []}.items():
+        for socket_index in [charging_station_index, *neighbours]:
+            reference.append_socket_to_sockets_dataframe(reference.transform_to_socket(charging_station_index, datasource.iloc[socket_index]))
+
+    assert(list(transform.get_sockets()['id_itinerance'])) == list(reference.get_sockets()['id_itinerance'])
+    assert(list(transform.get_sockets()['id_itinerance'])) == ["iti1", "iti3", "iti5"]
+    assert(transform.get_sockets()['id'].is_unique)
+    assert(transform.get_deduplication_report()) == {"sockets": 5, "duplicates": 2, "duplicates_without_power_rated": 1}
+    assert(reference.get_deduplication_report()) == transform.get_deduplication_report()
+
+def station_datasource(points: list, itineraries: list) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame({
+        'geometry': points,
+        'power_rated': [float(itinerary[3:]) for itinerary in itineraries],
+        'socket_type_ef': [False] * len(points),
+        'socket_type_2': [True] * len(points),
+        'socket_type_combo_ccs': [False] * len(points),
+        'socket_type_chademo': [False] * len(points),
+        'socket_type_autre': [False] * len(points),
+        'id_itinerance': itineraries,
+        'retrieve_from': ["DATA_GOUV"] * len(points)
+    }, crs="EPSG:4326")
+
+
+def test_compute_row_keys():
+    transform = Transform()
+    datasource = station_datasource([Point(2.35, 48.85), Point(2.35, 48.85), Point(2.36, 48.85)], ["iti1", "iti1", "iti2"])
+
+    keys = transform.compute_row_keys(datasource)
+    assert(len(set(keys))) == 3
+
+    reordered = transform.compute_row_keys(datasource.iloc[[2, 0, 1]])
+    assert(list(reordered)) == [keys[2], keys[0], keys[1]]
+
+
+def test_transform_data_incrementally():
+    # Three stations far from each other: Notre-Dame, Tour Eiffel and Montmartre
+    points = [Point(2.3522, 48.8566), Point(2.3500, 48.8555), Point(2.2945, 48.8584), Point(2.2950, 48.8580), Point(2.3431, 48.8867)]
+    datasource = station_datasource(points, ["iti1", "iti2", "iti3", "iti4", "iti5"])
+
+    previous = Transform()
+    previous.transform_data(datasource, previous.group_neighbouring(datasource, 1500, mode="connected_components"))
+    previous_stations = previous.get_charging_stations()
+
+    # iti2 is removed and iti6 is added next to the Tour Eiffel, Montmartre does not change
+    new_datasource = station_datasource(
+        [points[0], points[2], points[3], points[4], Point(2.2940, 48.8590)],
+        ["iti1", "iti3", "iti4", "iti5", "iti6"]
+    )
+    transform = Transform()
+    regrouped = transform.transform_data_incrementally(new_datasource, previous, 1500, mode="connected_components")
+
+    assert(regrouped) == 4
+    stations = transform.get_charging_stations()
+    sockets = transform.get_sockets()
+    assert(stations["id"].is_unique)
+
+    montmartre_id = previous_stations["id"][previous_stations["geometry"] == points[4]].iloc[0]
+    previous_montmartre_socket = previous.get_sockets()[previous.get_sockets()["charging_station_id"] == montmartre_id]
+    montmartre_socket = sockets[sockets["charging_station_id"] == montmartre_id]
+    assert(list(montmartre_socket["id"])) == list(previous_montmartre_socket["id"])
+
+    by_station = sockets.groupby("charging_station_id")["id_itinerance"].apply(sorted).tolist()
+    assert(sorted(by_station)) == [["iti1"], ["iti3", "iti4", "iti6"], ["iti5"]]
+
+    full = Transform()
+    full.transform_data(new_datasource, full.group_neighbouring(new_datasource, 1500, mode="connected_components"))
+    assert(sorted(stations["id"])) == sorted(full.get_charging_stations()["id"])
+    assert(sorted(sockets["id"])) == sorted(full.get_sockets()["id"])
+    assert(transform.get_deduplication_report()) == full.get_deduplication_report()
+    assert(set(transform.get_groups()["key"])) == set(full.get_groups()["key"])
+
+
+    # Without changes, and on a full refresh, one side of the concatenations is empty
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        unchanged = Transform()
+        assert(unchanged.transform_data_incrementally(new_datasource, transform, 1500, mode="connected_components")) == 0
+        refreshed = Transform()
+        moved = station_datasource([Point(5.0, 45.0), Point(5.001, 45.0)], ["iti7", "iti8"])
+        assert(refreshed.transform_data_incrementally(moved, transform, 1500, mode="connected_components")) == 2
+
+    assert(sorted(unchanged.get_sockets()["id"])) == sorted(sockets["id"])
+    assert(list(unchanged.get_sockets().dtypes)) == list(sockets.dtypes)
+    assert(list(unchanged.get_groups().dtypes)) == list(transform.get_groups().dtypes)
+    assert(len(refreshed.get_charging_stations())) == 1
+    assert(len(refreshed.get_sockets())) == 2
@@ -1,4 +1,7 @@
-from src.utils import extract_power_rated, is_power_rated_data, is_int_data, compare_hash, write_hash_file
+from src.utils import extract_power_rated, is_power_rated_data, is_int_data, hash_file, create_file_record, is_file_record_up_to_date, read_file_record, write_file_record, to_geo_dataframe
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import Point
 import os
 import pytest
 
@@ -16,6 +19,8 @@ def test_is_power_rated_data():
     assert(is_power_rated_data("22KW"))
     assert(is_power_rated_data("3.6 kw"))
     assert(is_power_rated_data("3,6 kw"))
+    assert(is_power_rated_data("1.5 MW"))
+    assert(is_power_rated_data("7400 W"))
 
     assert(not is_power_rated_data("kw"))
     assert(not is_power_rated_data(""))
@@ -24,23 +29,43 @@ def test_is_int_data():
     assert(is_int_data("22"))
     assert(not is_int_data("test"))
 
-def test_compare_hash():
-    assert(compare_hash("tests/resources/test.hash", "tests/resources/data_gouv_page.html"))
-    assert(not compare_hash("tests/resources/test_compare_hash.hash", "tests/resources/data_gouv_page.html"))
-    assert(not compare_hash("tests/resources/test.hash", "tests/resources/gouv_page.html"))
-    assert(not compare_hash("tests/resources/test_wrong.hash", "tests/resources/data_gouv_page.html"))
+def test_create_file_record():
+    record = create_file_record("tests/resources/data_gouv_page.html")
+    stat = os.stat("tests/resources/data_gouv_page.html")
 
-def test_write_hash_file():
-    
-    write_hash_file("tests/resources/test2.hash", "tests/resources/data_gouv_page.html")
+    assert(record) == {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino, "digest": hash_file("tests/resources/data_gouv_page.html")}
+    assert(create_file_record("tests/resources/data_gouv_page.html", "digest")["digest"]) == "digest"
 
-    assert(os.path.exists("tests/resources/test2.hash"))
-    
-    with open("tests/resources/test2.hash", 'r') as f_to_test:
-        with open("tests/resources/test.hash", 'r') as f_expected:
-            assert(f_to_test.read() == f_expected.read())
+    with pytest.raises(FileNotFoundError):
+        create_file_record("tests/resources/data_gouv_pag.html")
 
-    os.remove("tests/resources/test2.hash")
+def test_write_and_read_file_record(tmp_path):
+    path_file = str(tmp_path / "input.txt")
+    path_record_file = str(tmp_path / "input.record")
+    with open(path_file, 'w') as f:
+        f.write("charging stations")
 
-    with pytest.raises(FileNotFoundError):
-        write_hash_file("tests/resources/test2.hash", "tests/resources/data_gouv_pag.html")
\ No newline at end of file
+    assert(read_file_record(path_record_file)) is None
+    write_file_record(path_record_file, create_file_record(path_file))
+    record = read_file_record(path_record_file)
+    assert(record["digest"]) == hash_file(path_file)
+    assert(is_file_record_up_to_date(record, path_file))
+
+    with open(path_file, 'w') as f:
+        f.write("charging stations and sockets")
+    assert(not is_file_record_up_to_date(record, path_file))
+
+def test_extract_power_rated_units():
+    assert(extract_power_rated("7400 W")) == 7.4
+    assert(extract_power_rated("22 kW")) == 22.0
+    assert(extract_power_rated("1,5 MW")) == 1500.0
+    assert(extract_power_rated("50")) == 50.0
+
+
+def test_to_geo_dataframe():
+    data = pd.DataFrame({"id": [0, 1], "geometry": [Point(1, 1), Point(2, 2)]})
+
+    gdf = to_geo_dataframe(data)
+    assert(isinstance(gdf, gpd.GeoDataFrame))
+    assert(gdf.crs) == "EPSG:4326"
+    assert(to_geo_dataframe(gdf)) is gdf